@@ -1,8 +1,23 @@
 import streamlit as st
-from src.agents.supervisor import TravelBuddySupervisor
+from src.agents.supervisor import TravelBuddySupervisor, get_supervisor
 
 st.set_page_config(page_title="AI Travel Buddy", page_icon="🧭", layout="wide")
 
+
+# Compile the agent graph once per server process; every session reuses it
+@st.cache_resource(show_spinner=False)
+def load_supervisor() -> TravelBuddySupervisor:
+    return get_supervisor()
+
+
+def freshness_label(options) -> str:
+    """'live' or 'cached N min ago' from the results' freshness_age_s."""
+    age = max((o.get("freshness_age_s") or 0 for o in options), default=0)
+    if age < 60:
+        return "live prices"
+    return f"cached prices from {age / 60:.0f} min ago (refreshing in background)"
+
+
 # ---- Hero ----
 st.markdown(
     """
@@ -36,8 +51,28 @@ run = st.button("🚀 Plan my trip", type="primary", use_container_width=True)
 
 # ---- Execute graph ----
 if run:
+    # Live previews: itinerary days as the LLM writes them, and the cheapest
+    # hotels so far while offer chunks arrive
+    live_days = st.empty()
+    live = st.empty()
+    days = []
+
+    def on_event(event):
+        if event.get("event") == "itinerary_day":
+            # index-keyed: a re-sent day replaces it and anything after it
+            del days[event["index"]:]
+            days.append(event["day"])
+            with live_days.container():
+                st.caption(f"🗓️ Itinerary so far ({len(days)} days)")
+                for day in days:
+                    st.markdown(f"- {day}")
+        elif event.get("event") == "hotels":
+            with live.container():
+                st.caption(f"🏨 Cheapest hotels so far ({event['received']} received)")
+                st.json(event["top"], expanded=False)
+
     with st.spinner("Running agents..."):
-        supervisor = TravelBuddySupervisor()
+        supervisor = load_supervisor()
 
         # Build structured trip_request (what the parser validates/passes through)
         trip_request = {
@@ -57,8 +92,10 @@ if run:
             "trip_request": trip_request,
         }
 
-        output = supervisor.run(input_state)
+        output = supervisor.run(input_state, on_event=on_event)
 
+    live_days.empty()
+    live.empty()
     st.success("Done!")
 
     tab1, tab2, tab3, tab4, tab5 = st.tabs(
@@ -73,10 +110,16 @@ if run:
         c1, c2 = st.columns(2)
         with c1:
             st.subheader("✈️ Flights")
-            st.json(output.get("flight_options", []))
+            flights = output.get("flight_options", [])
+            if flights:
+                st.caption(freshness_label(flights))
+            st.json(flights)
         with c2:
             st.subheader("🏨 Hotels")
-            st.json(output.get("hotel_options", []))
+            hotels = output.get("hotel_options", [])
+            if hotels:
+                st.caption(freshness_label(hotels))
+            st.json(hotels)
 
     with tab3:
         st.subheader("🗓️ Itinerary")
@@ -1,5 +1,8 @@
+import contextvars
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Callable, Dict
+
+from langgraph.config import get_stream_writer
 
 
 class BaseAgent(ABC):
@@ -15,3 +18,18 @@ class BaseAgent(ABC):
         This method must be implemented by all child agents.
         """
         pass
+
+
+def stream_writer() -> Callable[[Dict[str, Any]], None]:
+    """
+    LangGraph "custom" stream writer inside a graph run, else a no-op.
+
+    The writer looks up the run's config in contextvars, which worker threads
+    don't inherit, so every call runs in a copy of the caller's context.
+    """
+    try:
+        writer = get_stream_writer()
+    except RuntimeError:  # called directly, outside a runnable context
+        return lambda _chunk: None
+    ctx = contextvars.copy_context()
+    return lambda chunk: ctx.copy().run(writer, chunk)
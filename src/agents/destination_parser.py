@@ -1,54 +1,80 @@
 # src/agents/destination_parser.py
-from dotenv import load_dotenv
+import os
+import threading
+from typing import Any, Dict, Optional
+
 from .base_agent import BaseAgent
+from src.integrations.groq_client import GroqClient, get_groq_client
+from src.integrations.trip_extractor import extract_trip, normalize_dates
 from src.schema.travel_models import TripRequest
 from src.utils.logger import pretty_print
-import os, requests, json, re
+import json, re
+
 
-load_dotenv()
+def _field(input_data, name):
+    # Graph state object, or a plain dict when called directly
+    if isinstance(input_data, dict):
+        return input_data.get(name)
+    return getattr(input_data, name, None)
 
 
 class DestinationParserAgent(BaseAgent):
-    def __init__(self):
-        self.groq_api_key = os.getenv("GROQ_API_KEY")
+    """
+    Trip request from the UI's structured fields, or parsed from free text.
+
+    Free text goes through the rule-based extractor (trip_extractor) first; the
+    LLM is only asked when the rules' confidence is below `min_confidence`
+    (PARSER_MIN_CONFIDENCE, default 0.9 = destination and both dates found).
+    stats() counts how often the LLM was avoided.
+    """
+
+    def __init__(
+        self, llm: Optional[GroqClient] = None, min_confidence: Optional[float] = None
+    ):
+        # Shared pooled client (timeouts, retries, metrics) unless one is injected
+        self.llm = llm or get_groq_client()
+        if min_confidence is None:
+            min_confidence = float(os.getenv("PARSER_MIN_CONFIDENCE", 0.9))
+        self.min_confidence = min_confidence
+        self._lock = threading.Lock()
+        self.rule_hits = 0  # free text handled without the LLM
+        self.llm_calls = 0  # free text that needed the LLM
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits, misses = self.rule_hits, self.llm_calls
+        total = hits + misses
+        return {
+            "rule_hits": hits,
+            "llm_calls": misses,
+            "llm_avoided_rate": round(hits / total, 4) if total else 0.0,
+        }
 
     def __call__(self, state):
         return self.run(state)
 
     def call_groq_llm(self, user_input):
         # (unchanged) … kept for fallback when user types a single prompt
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json",
-        }
         prompt = (
             "Extract the following fields from the user's travel request and output them as strict JSON (no explanations, no markdown, no comments): "
             "origin, destination, start_date, end_date, budget, preferences. "
             "If a field is not mentioned, set it to null. "
             f'User input: "{user_input}"\nJSON:'
         )
-        payload = {
-            "model": "llama3-8b-8192",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 300,
-            "temperature": 0.0,
-        }
-        response = requests.post(url, headers=headers, json=payload)
-        result = response.json()
-        if "choices" not in result:
-            raise RuntimeError(f"Groq API returned error: {result}")
-        return result["choices"][0]["message"]["content"]
+        return self.llm.complete(prompt, max_tokens=300, temperature=0.0)
 
     def run(self, input_data):
         """
         Pass-through mode:
           - If input_data.trip_request already contains structured fields, validate and return it.
+            Dates like "September 12th" are normalized to ISO when dateutil
+            can read them; others ("next Friday") are passed on unchanged.
         Fallback mode:
-          - Else, parse free-text input (user_input) with the LLM and return TripRequest.
+          - Else, parse free-text input (user_input) with the rules, or with the
+            LLM when the rules aren't confident, and return TripRequest.
         """
         # ---------- Pass-through ----------
-        tr_dict = getattr(input_data, "trip_request", None)
+        tr_dict = _field(input_data, "trip_request")
         if (
             isinstance(tr_dict, dict)
             and tr_dict.get("destination")
@@ -56,8 +82,11 @@ class DestinationParserAgent(BaseAgent):
             and tr_dict.get("end_date")
         ):
             try:
+                start, end = normalize_dates(tr_dict["start_date"], tr_dict["end_date"])
+                start = start or tr_dict["start_date"]
+                end = end or tr_dict["end_date"]
                 # Normalize preferences to list-of-str when possible
-                trip = TripRequest(**tr_dict)
+                trip = TripRequest(**{**tr_dict, "start_date": start, "end_date": end})
                 if isinstance(trip.preferences, str):
                     trip.preferences = [trip.preferences]
                 pretty_print("Trip Request (pass-through)", trip.dict())
@@ -67,7 +96,28 @@ class DestinationParserAgent(BaseAgent):
                 print("Pass-through TripRequest validation failed:", e)
 
         # ---------- Fallback: parse free text ----------
-        user_input = input_data.user_input
+        user_input = _field(input_data, "user_input") or ""
+
+        # Rules first: no model call for the usual "Tokyo, Sep 12-17, $2000" input
+        extracted = extract_trip(user_input)
+        if extracted.confidence >= self.min_confidence:
+            try:
+                trip = TripRequest(**extracted.trip_request())
+            except Exception as e:
+                print("Rule-based TripRequest validation failed:", e)
+            else:
+                with self._lock:
+                    self.rule_hits += 1
+                pretty_print(
+                    f"Trip Request (rules, confidence {extracted.confidence})", trip.dict()
+                )
+                out = {"trip_request": trip.dict()}
+                if extracted.currency and not _field(input_data, "currency"):
+                    out["currency"] = extracted.currency
+                return out
+
+        with self._lock:
+            self.llm_calls += 1
         llm_output = self.call_groq_llm(user_input)
         json_match = re.search(r"\{.*\}", llm_output, re.DOTALL)
         if not json_match:
@@ -1,16 +1,50 @@
 # src/agents/flight_hotel_scraper.py
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
 from .base_agent import BaseAgent
+from .base_agent import stream_writer as _stream_writer
 from src.utils.logger import pretty_print
 
 # Amadeus TEST env integrations you built & tested
 from src.integrations.travel_scraper.reference import city_to_codes
-from src.integrations.travel_scraper.flights import FlightQuery, search_flights
+from src.integrations.travel_scraper.flights import (
+    FlightQuery,
+    search_flights_with_age,
+)
 from src.integrations.travel_scraper.parsing import (
     summarize_offers_airports_and_carriers,
 )
 
-from src.integrations.travel_scraper.hotels import HotelQuery, search_hotels
-from src.integrations.travel_scraper.parsing_hotels import summarize_hotels_offers
+from src.integrations.travel_scraper.hotels import (
+    HotelQuery,
+    iter_hotel_summaries_with_age,
+)
+from src.integrations.travel_scraper.parsing_hotels import (
+    CheapestHotels,
+    summary_price,
+)
+
+# Shared worker pool for the agent's independent branches. It is process-wide so a
+# branch that times out keeps running in the background instead of blocking run().
+_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="flight-hotel")
+
+
+def _result_by(fut: Future, deadline: float):
+    """Wait for `fut` until the absolute `deadline` (time.monotonic())."""
+    return fut.result(timeout=max(deadline - time.monotonic(), 0))
+
+
+def _reason(e: Exception) -> str:
+    return "timed out" if isinstance(e, FutureTimeout) else str(e)
+
+
+def _with_age(items, age_s):
+    """Stamp each result with how old its upstream answer is (0 = live)."""
+    for item in items:
+        item["freshness_age_s"] = round(age_s, 1)
+    return items
 
 
 class FlightHotelScraperAgent(BaseAgent):
@@ -20,8 +54,32 @@ class FlightHotelScraperAgent(BaseAgent):
     - Flights: origin/dest codes -> Flight Offers Search -> tidy summaries (airports + carriers)
     - Hotels: Hotel List -> v3 Hotel Offers -> tidy summaries
     - Budget: allocate ~15% of total trip budget to hotels, filter out pricier ones
+
+    Concurrency: origin/destination code lookups run in parallel, then the hotel
+    branch starts as soon as the destination is known while flights wait for both
+    codes. Each branch has its own timeout, so wall time ~= the slowest branch.
+
+    Streaming: as hotel offer chunks arrive, the current cheapest `hotels_top_k`
+    are emitted as {"event": "hotels", "top": [...], "received": n} on
+    LangGraph's "custom" stream (see TravelBuddySupervisor.run(on_event=...)).
+
+    Freshness: cached searches may be served stale while they refresh in the
+    background, so every flight/hotel summary carries "freshness_age_s" (seconds
+    since its data was fetched, 0 = live) for the UI to label.
     """
 
+    def __init__(
+        self,
+        resolve_timeout: float = 15.0,
+        flights_timeout: float = 45.0,
+        hotels_timeout: float = 60.0,
+        hotels_top_k: int = 10,
+    ):
+        self.resolve_timeout = resolve_timeout
+        self.flights_timeout = flights_timeout
+        self.hotels_timeout = hotels_timeout
+        self.hotels_top_k = hotels_top_k
+
     def __call__(self, state):
         return self.run(state)
 
@@ -33,6 +91,7 @@ class FlightHotelScraperAgent(BaseAgent):
         start_date = tr.get("start_date")
         end_date = tr.get("end_date")
         currency = (input_data.currency or "USD").strip().upper()
+        emit = _stream_writer()
 
         if not destination or not start_date or not end_date:
             return {
@@ -41,57 +100,50 @@ class FlightHotelScraperAgent(BaseAgent):
                 "error": "Missing destination and/or dates.",
             }
 
-        # ---- 1) Resolve IATA city/airport codes ----
+        # ---- 1) Resolve IATA city/airport codes (both at once) ----
         # We accept either a city name ("Rome") or a code ("ROM"/"FCO")
+        resolve_deadline = time.monotonic() + self.resolve_timeout
+        o_fut = _EXECUTOR.submit(
+            city_to_codes, origin or "LHE"
+        )  # fallback origin if user left blank
+        d_fut = _EXECUTOR.submit(city_to_codes, destination)
         try:
-            o_codes = city_to_codes(
-                origin or "LHE"
-            )  # fallback origin if user left blank
-            d_codes = city_to_codes(destination)
+            d_codes = _result_by(d_fut, resolve_deadline)
         except Exception as e:
-            return {
-                "flight_options": [],
-                "hotel_options": [],
-                "error": f"IATA resolution failed: {e}",
-            }
+            return self._failed(f"IATA resolution failed: {_reason(e)}")
+
+        # ---- 2) Hotels branch can start now (only needs the destination city) ----
+        h_fut = _EXECUTOR.submit(
+            self._search_hotels, d_codes["city"], start_date, end_date, currency, emit
+        )
+        hotels_deadline = time.monotonic() + self.hotels_timeout
+
+        try:
+            o_codes = _result_by(o_fut, resolve_deadline)
+        except Exception as e:
+            return self._failed(f"IATA resolution failed: {_reason(e)}")
 
         origin_iata = o_codes["city"] or o_codes["airport"]
         dest_iata = d_codes["city"] or d_codes["airport"]
 
-        # ---- 2) Flights (TEST env) ----
+        # ---- 3) Flights branch (runs alongside hotels) ----
+        f_fut = _EXECUTOR.submit(
+            self._search_flights, origin_iata, dest_iata, start_date, end_date, currency
+        )
+        flights_deadline = time.monotonic() + self.flights_timeout
+
         try:
-            fq = FlightQuery(
-                origin_iata=origin_iata,
-                dest_iata=dest_iata,
-                depart_date=start_date,
-                return_date=end_date,
-                adults=1,
-                currency=currency,
-                max_results=20,
-                travel_class="ECONOMY",
-            )
-            raw_offers = search_flights(fq)
-            flight_summaries = summarize_offers_airports_and_carriers(raw_offers)
+            flight_summaries = _result_by(f_fut, flights_deadline)
         except Exception as e:
             # Keep the app flowing; show friendly fallback
             flight_summaries = []
-            print("Flight search failed:", e)
+            print("Flight search failed:", _reason(e))
 
-        # ---- 3) Hotels (Hotel List -> v3 Offers) ----
         try:
-            hq = HotelQuery(
-                city_code=d_codes["city"],  # e.g., "ROM"
-                check_in=start_date,
-                check_out=end_date,
-                adults=1,
-                currency=currency,
-                max_hotels=40,  # ask more IDs; TEST data is sparse
-            )
-            v3_offers, hotel_list = search_hotels(hq)
-            hotel_summaries = summarize_hotels_offers(v3_offers, hotel_list)
+            hotel_summaries = _result_by(h_fut, hotels_deadline)
         except Exception as e:
             hotel_summaries = []
-            print("Hotel search failed:", e)
+            print("Hotel search failed:", _reason(e))
 
         # ---- 4) Apply hotel budget filter (15% of total budget) ----
         budget_total = tr.get("budget")
@@ -112,3 +164,39 @@ class FlightHotelScraperAgent(BaseAgent):
             "flight_options": flight_summaries,
             "hotel_options": hotel_summaries,
         }
+
+    def _failed(self, error: str):
+        return {"flight_options": [], "hotel_options": [], "error": error}
+
+    def _search_flights(self, origin_iata, dest_iata, start_date, end_date, currency):
+        fq = FlightQuery(
+            origin_iata=origin_iata,
+            dest_iata=dest_iata,
+            depart_date=start_date,
+            return_date=end_date,
+            adults=1,
+            currency=currency,
+            max_results=20,
+            travel_class="ECONOMY",
+        )
+        raw_offers, age_s = search_flights_with_age(fq)
+        return _with_age(summarize_offers_airports_and_carriers(raw_offers), age_s)
+
+    def _search_hotels(self, city_code, start_date, end_date, currency, emit):
+        # Hotel List (cached catalogue) -> v3 Offers, summarized chunk by chunk
+        hq = HotelQuery(
+            city_code=city_code,  # e.g., "ROM"
+            check_in=start_date,
+            check_out=end_date,
+            adults=1,
+            currency=currency,
+            max_hotels=40,  # ask more IDs; TEST data is sparse
+        )
+        top = CheapestHotels(k=self.hotels_top_k)
+        summaries = []
+        for batch, age_s in iter_hotel_summaries_with_age(hq):
+            summaries.extend(_with_age(batch, age_s))
+            top.add_all(batch)
+            emit({"event": "hotels", "top": top.top(), "received": top.seen})
+        summaries.sort(key=summary_price)
+        return summaries
@@ -1,23 +1,50 @@
-from .base_agent import BaseAgent
+import os
+from typing import Optional
+
+from .base_agent import BaseAgent, stream_writer
+from src.integrations.groq_client import GroqClient, get_groq_client
+from src.integrations.llm_cache import generation_key, get_generation, put_generation
 from src.schema.travel_models import TripRequest
+from src.utils.json_stream import JsonArrayStream
 from src.utils.logger import pretty_print
-import os
-import requests
 import json
 
-from dotenv import load_dotenv
 
-load_dotenv()
+def _emit_days(emit, days, start: int = 0):
+    for i, day in enumerate(days, start):
+        emit({"event": "itinerary_day", "index": i, "day": day})
 
 
 class ItineraryAgent(BaseAgent):
-    def __init__(self):
-        self.groq_api_key = os.getenv("GROQ_API_KEY")
+    """
+    Day-by-day itinerary from the LLM.
+
+    Streaming (default; ITINERARY_STREAM=0 or stream=False turns it off): the
+    reply is read over SSE and fed to a JsonArrayStream, so every day is emitted
+    as {"event": "itinerary_day", "index": i, "day": "..."} on LangGraph's
+    "custom" stream as soon as its JSON element is complete. Cached and
+    non-streamed itineraries emit the same events, all at once.
+    """
+
+    TEMPERATURE = 0.7
+
+    def __init__(
+        self,
+        llm: Optional[GroqClient] = None,
+        use_cache: bool = True,
+        stream: Optional[bool] = None,
+    ):
+        self.llm = llm or get_groq_client()
+        # Same destination/length/preferences -> reuse a previous itinerary
+        self.use_cache = use_cache
+        if stream is None:
+            stream = os.getenv("ITINERARY_STREAM", "1").lower() not in ("0", "false", "no")
+        self.stream = stream
 
     def __call__(self, state):
         return self.run(state)
 
-    def call_groq_llm(self, trip_request):
+    def _prompt(self, trip_request) -> str:
         # Unpacking trip request info
         destination = trip_request.get("destination", "the destination")
         start_date = trip_request.get("start_date", "")
@@ -28,40 +55,61 @@ class ItineraryAgent(BaseAgent):
         else:
             preferences_str = preferences or "general sightseeing"
 
-        prompt = (
+        return (
             f"Generate a detailed day-by-day travel itinerary for a trip to {destination} from {start_date} to {end_date}."
             f" The traveler prefers: {preferences_str}. "
             "Respond ONLY with a strict JSON array, where each element is a string describing the plan for one day. Do not include explanations, markdown, or any extra text."
             'Example: ["Day 1: ...", "Day 2: ..."]'
         )
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": "llama3-8b-8192",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 350,
-            "temperature": 0.7,
-        }
-        response = requests.post(url, headers=headers, json=payload)
-        try:
-            result = response.json()
-        except Exception as e:
-            print("Error decoding JSON from Groq:", e)
-            print("Raw response:", response.text)
-            raise RuntimeError(f"Groq did not return valid JSON: {response.text}")
-        if "choices" not in result:
-            print("Groq API error:", result)
-            raise RuntimeError(f"Groq API returned error: {result}")
-        return result["choices"][0]["message"]["content"]
+
+    def call_groq_llm(self, trip_request):
+        return self.llm.complete(
+            self._prompt(trip_request), max_tokens=350, temperature=self.TEMPERATURE
+        )
+
+    def stream_groq_llm(self, trip_request):
+        """Like call_groq_llm(), but yields the reply text as it is generated."""
+        return self.llm.stream_complete(
+            self._prompt(trip_request), max_tokens=350, temperature=self.TEMPERATURE
+        )
+
+    def _stream_days(self, trip_request, emit):
+        """Stream the reply, emitting days as they complete; returns (parser, full text)."""
+        parser = JsonArrayStream()
+        text = []
+        for delta in self.stream_groq_llm(trip_request):
+            text.append(delta)
+            days = parser.feed(delta)
+            _emit_days(emit, days, start=len(parser.items) - len(days))
+        return parser, "".join(text)
 
     def run(self, input_data):
         trip_request = input_data.trip_request  # Access as attribute
         if not trip_request:
             return {"itinerary": [], "error": "No trip request provided"}
-        llm_output = self.call_groq_llm(trip_request)
+        emit = stream_writer()
+
+        # No key -> neither read nor written (use_cache=False, unknown trip length)
+        key = (
+            generation_key("itinerary", trip_request, self.llm.model, self.TEMPERATURE)
+            if self.use_cache
+            else None
+        )
+        cached = get_generation(key)
+        if cached is not None:
+            _emit_days(emit, cached)
+            pretty_print("Itinerary (cached):", cached)
+            return {"itinerary": cached}
+
+        if self.stream:
+            parser, llm_output = self._stream_days(trip_request, emit)
+            if parser.done and not parser.skipped:
+                put_generation(key, parser.items)
+                pretty_print("Itinerary:", parser.items)
+                return {"itinerary": parser.items}
+            # Unterminated/odd array: fall back to parsing the whole text below
+        else:
+            llm_output = self.call_groq_llm(trip_request)
         # print("Raw LLM itinerary output:", llm_output)
         import re
 
@@ -73,6 +121,14 @@ class ItineraryAgent(BaseAgent):
             return {"itinerary": [], "error": "No itinerary JSON found in LLM output"}
         try:
             itinerary = json.loads(json_str)
+            put_generation(key, itinerary)  # only parsed results are cached
+            # Emit what the stream didn't: everything when not streaming, the
+            # rest when the incremental parser stopped early. If the recovered
+            # list doesn't start with the streamed days, re-send it from day 0
+            # (events carry an index, so consumers replace rather than append).
+            streamed = parser.items if self.stream else []
+            start = len(streamed) if itinerary[: len(streamed)] == streamed else 0
+            _emit_days(emit, itinerary[start:], start=start)
             pretty_print("Itinerary:", itinerary)
             return {"itinerary": itinerary}
         except Exception as e:
@@ -1,21 +1,23 @@
+from typing import Optional
+
 from .base_agent import BaseAgent
+from src.integrations.groq_client import GroqClient, get_groq_client
+from src.integrations.llm_cache import generation_key, get_generation, put_generation
 from src.utils.logger import pretty_print
-import os
-import requests
 import json
 import re
 
-from dotenv import load_dotenv
-
-load_dotenv()
-
 
 class PackingListAgent(BaseAgent):
     def __call__(self, state):
         return self.run(state)
 
-    def __init__(self):
-        self.groq_api_key = os.getenv("GROQ_API_KEY")
+    TEMPERATURE = 0.5
+
+    def __init__(self, llm: Optional[GroqClient] = None, use_cache: bool = True):
+        self.llm = llm or get_groq_client()
+        # Same destination/length/preferences -> reuse a previous checklist
+        self.use_cache = use_cache
 
     def call_groq_llm(
         self, destination: str, start_date: str, end_date: str, preferences
@@ -36,30 +38,7 @@ class PackingListAgent(BaseAgent):
             "Checklist should cover essentials (documents, chargers, adapters), weather-agnostic clothing basics, "
             'and a few items related to the preferences. Example format: ["Passport", "Phone charger", "..."] based on what may or may not be required'
         )
-        url = "https://api.groq.com/openai/v1/chat/completions"
-        headers = {
-            "Authorization": f"Bearer {self.groq_api_key}",
-            "Content-Type": "application/json",
-        }
-        payload = {
-            "model": "llama3-8b-8192",
-            "messages": [{"role": "user", "content": prompt}],
-            "max_tokens": 350,
-            "temperature": 0.5,
-        }
-        resp = requests.post(url, headers=headers, json=payload)
-        try:
-            result = resp.json()
-        except Exception as e:
-            print("Error decoding JSON from Groq:", e)
-            print("Raw response:", resp.text)
-            raise RuntimeError(f"Groq did not return valid JSON: {resp.text}")
-
-        if "choices" not in result:
-            print("Groq API Error:", result)
-            raise RuntimeError(f"Groq API returned error: {result}")
-
-        return result["choices"][0]["message"]["content"]
+        return self.llm.complete(prompt, max_tokens=350, temperature=self.TEMPERATURE)
 
     def run(self, input_data):
         # Expect prior agents to have filled trip_request (and optionally itinerary)
@@ -69,9 +48,20 @@ class PackingListAgent(BaseAgent):
         tr = input_data.trip_request
         destination = tr.get("destination", "the destination")
         start_date = tr.get("start_date", "")
-        end_date = tr.get("end date", "")
+        end_date = tr.get("end_date", "")
         preferences = tr.get("preferences", [])
 
+        # No key -> neither read nor written (use_cache=False, unknown trip length)
+        key = (
+            generation_key("packing_list", tr, self.llm.model, self.TEMPERATURE)
+            if self.use_cache
+            else None
+        )
+        cached = get_generation(key)
+        if cached is not None:
+            pretty_print("Packing List (cached):", cached)
+            return {"packing_list": cached}
+
         llm_output = self.call_groq_llm(destination, start_date, end_date, preferences)
         # print("Raw Debugging output (packing_list_agent):", llm_output)  #
 
@@ -87,6 +77,7 @@ class PackingListAgent(BaseAgent):
             packing_list = [
                 str(item).strip() for item in packing_list if str(item).strip()
             ]
+            put_generation(key, packing_list)
             pretty_print("Packing List:", packing_list)
             return {"packing_list": packing_list}
         except Exception as e:
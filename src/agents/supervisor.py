@@ -1,16 +1,33 @@
 # src/agents/supervisor.py
+import os
+import threading
 from langgraph.graph import StateGraph
 from src.agents.destination_parser import DestinationParserAgent
 from src.agents.flight_hotel_scraper import FlightHotelScraperAgent
 from src.agents.itinerary_agent import ItineraryAgent
 from src.agents.packing_list_agent import PackingListAgent
 from src.agents.reminder_agent import ReminderAgent
+from src.agents.trip_plan_agent import TripPlanAgent
 from src.schema.travel_models import TravelBuddyState
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Callable, Union
+
+
+LLM_MODES = ("separate", "fused")
 
 
 class TravelBuddySupervisor:
-    def __init__(self):
+    """
+    llm_mode picks how the itinerary and packing list are generated:
+      - "separate": ItineraryAgent + PackingListAgent, two LLM calls in parallel
+      - "fused":    TripPlanAgent, one structured call for both (falls back to
+                    two calls if the reply doesn't parse)
+    Default: the LLM_MODE env var, else "separate".
+    """
+
+    def __init__(self, llm_mode: Optional[str] = None):
+        self.llm_mode = (llm_mode or os.getenv("LLM_MODE") or "separate").lower()
+        if self.llm_mode not in LLM_MODES:
+            raise ValueError(f"llm_mode must be one of {LLM_MODES}, got {self.llm_mode!r}")
         self.graph = StateGraph(state_schema=TravelBuddyState)
         self._build_graph()
         # StateGraph defines the workflow, to run it, it must be compiled into a runnable object first
@@ -21,25 +38,44 @@ class TravelBuddySupervisor:
         # Add nodes (agents) to the workflow graph
         self.graph.add_node("destination_parser", DestinationParserAgent())
         self.graph.add_node("flight_hotel_scraper", FlightHotelScraperAgent())
-        self.graph.add_node("itinerary_agent", ItineraryAgent())
-        self.graph.add_node("packing_list_agent", PackingListAgent())
         self.graph.add_node("reminder_agent", ReminderAgent())
 
         # Define the data flow (edges)
+        # Fan-out after parsing: flights/hotels and the LLM branch only need
+        # trip_request, so LangGraph runs them in the same (parallel) step.
         self.graph.add_edge("destination_parser", "flight_hotel_scraper")
-        self.graph.add_edge("flight_hotel_scraper", "itinerary_agent")
-        self.graph.add_edge("itinerary_agent", "packing_list_agent")
-        self.graph.add_edge("packing_list_agent", "reminder_agent")
+        if self.llm_mode == "fused":
+            # One call writes both itinerary and packing_list
+            self.graph.add_node("trip_plan_agent", TripPlanAgent())
+            self.graph.add_edge("destination_parser", "trip_plan_agent")
+            self.graph.add_edge("trip_plan_agent", "reminder_agent")
+        else:
+            self.graph.add_node("itinerary_agent", ItineraryAgent())
+            self.graph.add_node("packing_list_agent", PackingListAgent())
+            self.graph.add_edge("destination_parser", "itinerary_agent")
+            self.graph.add_edge("destination_parser", "packing_list_agent")
+            # Reminders map "today's plan" from the itinerary, so they join on it
+            self.graph.add_edge("itinerary_agent", "reminder_agent")
+            self.graph.set_finish_point("packing_list_agent")
 
         # Set entry and exit nodes
         self.graph.set_entry_point("destination_parser")
-        # self.graph.set_finish_point("flight_hotel_scraper") #tested, it works
-        # self.graph.set_finish_point("itinerary_agent") #tested, it works
-        # self.graph.set_finish_point("packing_list_agent") #testes, it works
+        # Fan-in: the run ends once every branch has reached a finish point
+        self.graph.set_finish_point("flight_hotel_scraper")
         self.graph.set_finish_point("reminder_agent")
-        # self.graph.set_exit_node("reminder_agent")
 
-    def run(self, state: Union[str, Dict[str, Any], TravelBuddyState]):
+    def run(
+        self,
+        state: Union[str, Dict[str, Any], TravelBuddyState],
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        """
+        Run the graph and return the final state.
+
+        on_event: optional callback for progress events agents write to the
+        "custom" stream (e.g. {"event": "hotels", "top": [...]}) while the
+        graph is still running; used by the UI to render partial results.
+        """
         # 🔒 Coerce input safely (NO double-wrapping!)
         if isinstance(state, str):
             state = {"user_input": state}
@@ -56,5 +92,38 @@ class TravelBuddySupervisor:
         # 🔍 Extra debug – leave this for now
         print("SUPERVISOR BEFORE INVOKE ->", state, type(state.get("user_input")))
 
-        result = self.runnable_graph.invoke(state)
+        if on_event is None:
+            return self.runnable_graph.invoke(state)
+
+        result = None
+        for mode, chunk in self.runnable_graph.stream(
+            state, stream_mode=["custom", "values"]
+        ):
+            if mode == "custom":
+                on_event(chunk)
+            else:
+                result = chunk  # "values": full state after each step
         return result
+
+
+# -----------------------------------------------------------------------------
+# Process-wide compiled supervisor
+# -----------------------------------------------------------------------------
+# Building the StateGraph, instantiating the agents and compiling is pure setup
+# work; the compiled graph holds no per-request state (no checkpointer), so all
+# sessions/threads can share one instance and just call .run().
+
+_SUPERVISORS: Dict[str, TravelBuddySupervisor] = {}
+_SUPERVISOR_LOCK = threading.Lock()
+
+
+def get_supervisor(llm_mode: Optional[str] = None) -> TravelBuddySupervisor:
+    """Returns the shared TravelBuddySupervisor for `llm_mode`, compiling it on first use."""
+    mode = (llm_mode or os.getenv("LLM_MODE") or "separate").lower()
+    supervisor = _SUPERVISORS.get(mode)
+    if supervisor is None:
+        with _SUPERVISOR_LOCK:
+            supervisor = _SUPERVISORS.get(mode)
+            if supervisor is None:
+                supervisor = _SUPERVISORS[mode] = TravelBuddySupervisor(mode)
+    return supervisor
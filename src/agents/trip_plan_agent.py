@@ -0,0 +1,147 @@
+import contextvars
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+import jsonschema
+
+from .base_agent import BaseAgent, stream_writer
+from .itinerary_agent import ItineraryAgent, _emit_days
+from .packing_list_agent import PackingListAgent
+from src.integrations.groq_client import GroqClient, GroqError, get_groq_client
+from src.integrations.llm_cache import generation_key, get_generation, put_generation
+from src.utils.logger import pretty_print
+
+# What the fused call must return (also shown to the model in the prompt)
+TRIP_PLAN_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "itinerary": {
+            "type": "array",
+            "items": {"type": "string", "pattern": "\\S"},
+            "minItems": 1,
+            "description": 'one element per day, "Day N: ..."',
+        },
+        "packing_list": {
+            "type": "array",
+            "items": {"type": "string", "pattern": "\\S"},
+            "minItems": 1,
+            "description": "packing checklist items",
+        },
+    },
+    "required": ["itinerary", "packing_list"],
+}
+
+
+def _parse_plan(text: str) -> Optional[Dict[str, list]]:
+    """The {"itinerary", "packing_list"} object if `text` matches the schema, else None."""
+    try:
+        plan = json.loads(text)
+        jsonschema.validate(plan, TRIP_PLAN_SCHEMA)
+    except (TypeError, ValueError, jsonschema.ValidationError):
+        return None
+    return {
+        field: [i.strip() for i in plan[field] if i.strip()]
+        for field in TRIP_PLAN_SCHEMA["required"]
+    }
+
+
+class TripPlanAgent(BaseAgent):
+    """
+    "Fused" mode: itinerary AND packing list from ONE structured LLM call.
+
+    ItineraryAgent and PackingListAgent send nearly the same trip context in two
+    round trips; this agent asks once for a JSON object (response_format
+    json_object, TRIP_PLAN_SCHEMA) and returns both fields. If the reply does
+    not parse/match the schema, it falls back to the two separate agents.
+    Plans are cached by trip signature like the separate generations.
+    """
+
+    TEMPERATURE = 0.6
+
+    def __init__(self, llm: Optional[GroqClient] = None, use_cache: bool = True):
+        self.llm = llm or get_groq_client()
+        self.use_cache = use_cache
+        # Fallback path; non-streaming so the days are emitted once, when known
+        self.itinerary_agent = ItineraryAgent(llm=self.llm, use_cache=use_cache, stream=False)
+        self.packing_agent = PackingListAgent(llm=self.llm, use_cache=use_cache)
+        self.fallbacks = 0  # fused replies that had to be redone as two calls
+
+    def __call__(self, state):
+        return self.run(state)
+
+    def call_groq_llm(self, trip_request) -> str:
+        destination = trip_request.get("destination", "the destination")
+        start_date = trip_request.get("start_date", "")
+        end_date = trip_request.get("end_date", "")
+        preferences = trip_request.get("preferences", [])
+        if isinstance(preferences, list):
+            pref_str = ", ".join(preferences)
+        else:
+            pref_str = preferences or "general sightseeing"
+
+        prompt = (
+            f"Plan a trip to {destination} from {start_date} to {end_date}. "
+            f"The traveler prefers: {pref_str}.\n"
+            "Respond ONLY with a JSON object matching this JSON schema:\n"
+            f"{json.dumps(TRIP_PLAN_SCHEMA)}\n"
+            "- itinerary: a detailed plan for each day of the trip, one string per day\n"
+            "- packing_list: essentials (documents, chargers, adapters), clothing basics "
+            "and a few items related to the preferences\n"
+            'Example: {"itinerary": ["Day 1: ...", "Day 2: ..."], "packing_list": ["Passport", "..."]}'
+        )
+        return self.llm.complete(
+            prompt,
+            max_tokens=700,  # both artifacts, 350 each before
+            temperature=self.TEMPERATURE,
+            response_format={"type": "json_object"},
+        )
+
+    def run(self, input_data):
+        trip_request = input_data.trip_request
+        if not trip_request:
+            return {"itinerary": [], "packing_list": [], "error": "No trip request provided"}
+        emit = stream_writer()
+
+        # No key -> neither read nor written (use_cache=False, unknown trip length)
+        key = (
+            generation_key("trip_plan", trip_request, self.llm.model, self.TEMPERATURE)
+            if self.use_cache
+            else None
+        )
+        plan = get_generation(key)
+        if plan is None:
+            try:
+                plan = _parse_plan(self.call_groq_llm(trip_request))
+            except GroqError as e:
+                # e.g. a 400 because the model rejected response_format
+                print("Fused trip plan call failed:", e)
+                plan = None
+            if plan is None:
+                return self._fallback(input_data)
+            put_generation(key, plan)
+
+        _emit_days(emit, plan["itinerary"])
+        pretty_print("Trip plan (fused):", plan)
+        return {"itinerary": plan["itinerary"], "packing_list": plan["packing_list"]}
+
+    def _fallback(self, input_data):
+        self.fallbacks += 1
+        print("Fused trip plan unusable; falling back to two LLM calls")
+        # In parallel, like the separate-mode graph, so a failed fused call costs
+        # one extra round trip rather than two. Each branch runs in a copy of
+        # this context so its stream writer still reaches the graph run.
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="trip-plan") as pool:
+            itinerary = pool.submit(
+                contextvars.copy_context().run, self.itinerary_agent.run, input_data
+            )
+            packing = pool.submit(
+                contextvars.copy_context().run, self.packing_agent.run, input_data
+            )
+            out = dict(itinerary.result())
+            packing = packing.result()
+        if "error" in packing:
+            # keep the itinerary's error (if any) visible too
+            packing["error"] = "; ".join(filter(None, [out.get("error"), packing["error"]]))
+        out.update(packing)
+        return out
@@ -0,0 +1,347 @@
+# groq_client.py
+"""
+Shared Groq (OpenAI-compatible chat completions) client for every agent.
+
+The agents used to copy-paste a bare requests.post() with no timeout, so one
+hung Groq call blocked a worker forever. GroqClient instead:
+
+  - sends every call over ONE pooled keep-alive session (same pooling as the
+    Amadeus client, see amadeus_client.get_session)
+  - enforces connect/read timeouts (GROQ_CONNECT_TIMEOUT / GROQ_READ_TIMEOUT)
+  - retries 429/5xx and timeouts with full-jitter backoff, honoring Retry-After
+    (GROQ_MAX_RETRIES / GROQ_RETRY_BACKOFF / GROQ_RETRY_BACKOFF_CAP)
+  - records per-call latency and token usage; groq_stats() aggregates them
+  - streams replies over server-sent events (stream_complete), so callers can
+    use the text while it is still being generated
+
+Usage:
+    text = get_groq_client().complete("Say hi", max_tokens=20, temperature=0.0)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from dotenv import load_dotenv
+
+from src.integrations.travel_scraper.amadeus_client import (
+    PoolConfig,
+    RetryPolicy,
+    _retry_after,
+    get_session,
+)
+
+load_dotenv()
+
+GROQ_BASE_URL = "https://api.groq.com/openai/v1"
+DEFAULT_MODEL = os.getenv("GROQ_MODEL", "llama3-8b-8192")
+
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class GroqError(RuntimeError):
+    """Groq call failed for good (bad status after retries, or no completion)."""
+
+
+@dataclass
+class CallMetrics:
+    """One chat-completion call, as recorded in GroqClient.recent."""
+
+    model: str
+    latency_s: float  # wall time including retries/backoff
+    attempts: int
+    ok: bool
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    first_token_s: Optional[float] = None  # streamed calls: time to first delta
+
+
+def _retry_policy_from_env() -> RetryPolicy:
+    return RetryPolicy(
+        max_retries=int(os.getenv("GROQ_MAX_RETRIES", 2)),
+        backoff_base=float(os.getenv("GROQ_RETRY_BACKOFF", 0.5)),
+        backoff_cap=float(os.getenv("GROQ_RETRY_BACKOFF_CAP", 20)),
+    )
+
+
+def _timeouts_from_env() -> Tuple[float, float]:
+    return (
+        float(os.getenv("GROQ_CONNECT_TIMEOUT", 5)),
+        float(os.getenv("GROQ_READ_TIMEOUT", 60)),
+    )
+
+
+class GroqClient:
+    """
+    Thread-safe chat-completions client.
+
+    Args:
+        api_key:      Groq key (GROQ_API_KEY by default); checked on first call
+        base_url:     API root (override for tests)
+        model:        default model for calls that don't pass one
+        session:      requests.Session to use (default: a shared pooled one)
+        timeout:      (connect, read) seconds
+        retry_policy: retries for 429/5xx/timeouts
+        keep_recent:  how many CallMetrics to keep in `recent`
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: str = GROQ_BASE_URL,
+        model: str = DEFAULT_MODEL,
+        session: Optional[requests.Session] = None,
+        timeout: Optional[Tuple[float, float]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        keep_recent: int = 100,
+    ):
+        self.api_key = api_key if api_key is not None else os.getenv("GROQ_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        # Its own pool config -> its own pooled session, separate from Amadeus'
+        self.session = session or get_session(
+            PoolConfig(
+                pool_connections=1,
+                pool_maxsize=int(os.getenv("GROQ_POOL_MAXSIZE", 8)),
+            )
+        )
+        self.timeout = timeout or _timeouts_from_env()
+        self.retry_policy = retry_policy or _retry_policy_from_env()
+        self._lock = threading.Lock()
+        self.recent: Deque[CallMetrics] = deque(maxlen=keep_recent)
+        self._totals = {
+            "calls": 0,
+            "errors": 0,
+            "retries": 0,
+            "latency_total_s": 0.0,
+            "latency_max_s": 0.0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+        }
+
+    # -- calls -------------------------------------------------------------
+    def _post(
+        self, payload: Dict[str, Any], metrics: CallMetrics, stream: bool = False
+    ) -> requests.Response:
+        """POST /chat/completions with retries; returns the first non-retried 2xx."""
+        if not self.api_key:
+            raise GroqError("GROQ_API_KEY missing")
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            metrics.attempts = attempt + 1
+            can_retry = attempt < policy.max_retries
+            try:
+                r = self.session.post(
+                    f"{self.base_url}/chat/completions",
+                    json=payload,
+                    headers=headers,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if not can_retry:
+                    raise GroqError(f"Groq request failed: {e}") from e
+                time.sleep(policy.delay(attempt))
+                attempt += 1
+                continue
+            if r.status_code in _RETRY_STATUSES and can_retry:
+                r.close()
+                time.sleep(policy.delay(attempt, _retry_after(r.headers)))
+                attempt += 1
+                continue
+            if r.status_code >= 400:
+                raise GroqError(f"Groq API returned {r.status_code}: {r.text}")
+            return r
+
+    @staticmethod
+    def _count_usage(metrics: CallMetrics, usage: Optional[Dict[str, Any]]) -> None:
+        usage = usage or {}
+        metrics.prompt_tokens = int(usage.get("prompt_tokens") or 0)
+        metrics.completion_tokens = int(usage.get("completion_tokens") or 0)
+        metrics.total_tokens = int(
+            usage.get("total_tokens") or metrics.prompt_tokens + metrics.completion_tokens
+        )
+
+    def chat_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        **params: Any,
+    ) -> Dict[str, Any]:
+        """
+        POST /chat/completions and return the raw JSON response.
+        Extra keyword args (max_tokens, temperature, ...) go into the payload.
+        """
+        model = model or self.model
+        payload = {"model": model, "messages": messages, **params}
+        start = time.monotonic()
+        metrics = CallMetrics(model=model, latency_s=0.0, attempts=0, ok=False)
+        try:
+            r = self._post(payload, metrics)
+            try:
+                result = r.json()
+            except ValueError as e:
+                raise GroqError(f"Groq did not return valid JSON: {r.text}") from e
+            if "choices" not in result:
+                raise GroqError(f"Groq API returned error: {result}")
+            self._count_usage(metrics, result.get("usage"))
+            metrics.ok = True
+            return result
+        finally:
+            metrics.latency_s = time.monotonic() - start
+            self._record(metrics)
+
+    def stream_chat_completion(
+        self,
+        messages: List[Dict[str, Any]],
+        model: Optional[str] = None,
+        **params: Any,
+    ) -> Iterator[str]:
+        """
+        Server-sent-events version of chat_completion(): yields content deltas
+        as they arrive. Retries only happen before the first byte; the read
+        timeout then bounds the gap between two chunks. The call's metrics
+        (incl. time to first token) are recorded when the stream ends or the
+        consumer stops iterating.
+        """
+        model = model or self.model
+        payload = {"model": model, "messages": messages, "stream": True, **params}
+        start = time.monotonic()
+        metrics = CallMetrics(model=model, latency_s=0.0, attempts=0, ok=False)
+        r: Optional[requests.Response] = None
+        try:
+            r = self._post(payload, metrics, stream=True)
+            # SSE is UTF-8 by spec; without a charset requests would assume ISO-8859-1
+            r.encoding = "utf-8"
+            for line in r.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue  # keep-alive blanks / SSE comments
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    chunk = json.loads(data)
+                except ValueError as e:
+                    raise GroqError(f"Bad stream chunk from Groq: {data}") from e
+                if "error" in chunk:
+                    raise GroqError(f"Groq stream error: {chunk['error']}")
+                # Groq reports usage on the last chunk (x_groq.usage)
+                usage = chunk.get("usage") or (chunk.get("x_groq") or {}).get("usage")
+                if usage:
+                    self._count_usage(metrics, usage)
+                for choice in chunk.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        if metrics.first_token_s is None:
+                            metrics.first_token_s = time.monotonic() - start
+                        yield delta
+            metrics.ok = True
+        except requests.RequestException as e:
+            raise GroqError(f"Groq stream failed: {e}") from e
+        finally:
+            if r is not None:
+                r.close()
+            metrics.latency_s = time.monotonic() - start
+            self._record(metrics)
+
+    def complete(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 350,
+        temperature: float = 0.7,
+        **params: Any,
+    ) -> str:
+        """Single user-message completion; returns the reply text."""
+        result = self.chat_completion(
+            [{"role": "user", "content": prompt}],
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **params,
+        )
+        return result["choices"][0]["message"]["content"]
+
+    def stream_complete(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        max_tokens: int = 350,
+        temperature: float = 0.7,
+        **params: Any,
+    ) -> Iterator[str]:
+        """Streaming complete(): yields the reply text in pieces."""
+        return self.stream_chat_completion(
+            [{"role": "user", "content": prompt}],
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            **params,
+        )
+
+    # -- metrics -----------------------------------------------------------
+    def _record(self, m: CallMetrics) -> None:
+        with self._lock:
+            self.recent.append(m)
+            t = self._totals
+            t["calls"] += 1
+            t["errors"] += not m.ok
+            t["retries"] += m.attempts - 1
+            t["latency_total_s"] += m.latency_s
+            t["latency_max_s"] = max(t["latency_max_s"], m.latency_s)
+            t["prompt_tokens"] += m.prompt_tokens
+            t["completion_tokens"] += m.completion_tokens
+            t["total_tokens"] += m.total_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Totals over all calls (calls, errors, retries, token counts), latency
+        avg/max, and the most recent call's CallMetrics as a dict.
+        """
+        with self._lock:
+            t = dict(self._totals)
+            last = asdict(self.recent[-1]) if self.recent else None
+        avg = t["latency_total_s"] / t["calls"] if t["calls"] else 0.0
+        return {
+            **t,
+            "latency_total_s": round(t["latency_total_s"], 4),
+            "latency_max_s": round(t["latency_max_s"], 4),
+            "latency_avg_s": round(avg, 4),
+            "last_call": last,
+        }
+
+
+# -----------------------------------------------------------------------------
+# Process-wide shared client
+# -----------------------------------------------------------------------------
+_SHARED_CLIENT: Optional[GroqClient] = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+def get_groq_client() -> GroqClient:
+    """The shared GroqClient (created on first use, thread-safe)."""
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        with _SHARED_CLIENT_LOCK:
+            if _SHARED_CLIENT is None:
+                _SHARED_CLIENT = GroqClient()
+    return _SHARED_CLIENT
+
+
+def groq_stats() -> Dict[str, Any]:
+    """Latency/token metrics of the shared client."""
+    return get_groq_client().stats()
@@ -0,0 +1,105 @@
+# llm_cache.py
+"""
+Response cache for LLM generations (itinerary, packing list).
+
+Popular trips repeat a lot ("Rome, 5 days, history + food"), so a generation is
+keyed on a normalized trip signature instead of the raw prompt:
+
+  - kind:         which generation ("itinerary", "packing_list", ...)
+  - destination:  case/accent/whitespace-insensitive ("  rome" == "Rome")
+  - trip length:  days between start and end date (the dates themselves don't
+                  matter, a 5-day Rome plan fits any 5 days)
+  - preferences:  lower-cased, de-duplicated, sorted
+  - model + temperature bucket (0.25 wide: 0.7 and 0.8 share a bucket)
+
+Parsed results (not raw LLM text) are stored, so a bad generation is never
+pinned. Trips whose length can't be computed (non-ISO dates) get no key and
+are never cached, so a 3-day trip can't be served a 10-day plan; agents built
+with use_cache=False use no key either, so they neither read nor overwrite
+shared entries. Storage is a ResponseCache (TTL + LRU) configured by
+LLM_CACHE_* env vars; set LLM_CACHE_BACKEND=disk to keep generations across
+restarts.
+"""
+
+from __future__ import annotations
+
+import threading
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+from src.integrations.travel_scraper.locations import normalize_name
+from src.utils.cache import ResponseCache, cache_from_env, make_key
+
+GENERATION_TTL = 7 * 24 * 3600  # a plan for "Rome, 5 days" doesn't go stale fast
+TEMPERATURE_BUCKET = 0.25
+
+# Created on first use, so importing never touches the filesystem
+_CACHE: Optional[ResponseCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def _llm_cache() -> ResponseCache:
+    global _CACHE
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                _CACHE = cache_from_env(
+                    "LLM",
+                    ttl=GENERATION_TTL,
+                    max_entries=1024,
+                    max_bytes=8 * 1024 * 1024,
+                )
+    return _CACHE
+
+
+def trip_days(start_date: Optional[str], end_date: Optional[str]) -> Optional[int]:
+    """Inclusive day count of a trip ("2025-09-12".."2025-09-16" -> 5), None if unknown."""
+    try:
+        days = (date.fromisoformat(end_date) - date.fromisoformat(start_date)).days + 1
+    except (TypeError, ValueError):
+        return None
+    return days if days > 0 else None
+
+
+def _preferences(value: Any) -> List[str]:
+    items = value if isinstance(value, list) else str(value or "").split(",")
+    return sorted({" ".join(str(p).lower().split()) for p in items} - {""})
+
+
+def generation_key(
+    kind: str, trip_request: Dict[str, Any], model: str, temperature: float
+) -> Optional[str]:
+    """
+    Cache key for one generation of `kind` for this trip (see module docstring),
+    or None when the trip length is unknown (don't cache).
+    """
+    days = trip_days(trip_request.get("start_date"), trip_request.get("end_date"))
+    if days is None:
+        return None
+    bucket = round(round(temperature / TEMPERATURE_BUCKET) * TEMPERATURE_BUCKET, 2)
+    return make_key(
+        "llm",
+        kind,
+        normalize_name(str(trip_request.get("destination") or "")),
+        days,
+        _preferences(trip_request.get("preferences")),
+        model,
+        bucket,
+    )
+
+
+def get_generation(key: Optional[str]) -> Optional[Any]:
+    """Cached parsed generation for `key`, or None (counts a hit/miss; a None key is skipped)."""
+    if key is None:
+        return None
+    return _llm_cache().get(key)
+
+
+def put_generation(key: Optional[str], value: Any) -> None:
+    if key is not None:
+        _llm_cache().put(key, value)
+
+
+def llm_cache_stats() -> Dict[str, Any]:
+    """Hit rate / size of the generation cache."""
+    return _llm_cache().stats()
@@ -3,15 +3,181 @@ airlines.py
 -----------
 Map airline carrier codes (e.g., "QR") to readable names ("Qatar Airways")
 using Amadeus Airline Code Lookup.
+
+Names live in a persistent AirlineNameStore (SQLite file shared by worker
+processes, warmed from a bundled snapshot), so cold workers don't re-query
+/v1/reference-data/airlines. Codes the API doesn't know are cached as
+"unknown" for a while (negative caching) instead of being refetched every time.
 """
 
 from __future__ import annotations
-from typing import Dict, List
-from .amadeus_client import AmadeusClient
 
-# Simple in-memory cache so repeated lookups don't hit your quota.
-# KEY: code string ("QR"), VALUE: airline name ("Qatar Airways")
-_CODE_NAME_CACHE: Dict[str, str] = {}
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.cache import default_cache_dir
+from .amadeus_client import get_client
+from .async_client import get_async_client
+
+UNKNOWN_AIRLINE = "Unknown Airline"
+
+SNAPSHOT_PATH = Path(__file__).resolve().parent / "data" / "airlines.json"
+
+
+class AirlineNameStore:
+    """
+    Persistent {code: name} store.
+
+      - path:         SQLite file (":memory:" for a private, non-persistent store)
+      - negative_ttl: seconds an "unknown code" answer is trusted before re-asking
+      - snapshot:     JSON {code: name} bulk-loaded when the store is empty
+
+    Reads go through an in-process dict first; the SQLite file is what other
+    processes (and the next restart) see.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        negative_ttl: float = 7 * 24 * 3600,
+        snapshot: Optional[Path] = SNAPSHOT_PATH,
+    ):
+        self.negative_ttl = negative_ttl
+        self._lock = threading.Lock()
+        # code -> (name or None for "unknown", updated_at)
+        self._memo: Dict[str, Tuple[Optional[str], float]] = {}
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS airlines ("
+                " code TEXT PRIMARY KEY, name TEXT, updated_at REAL)"
+            )
+        if snapshot is not None and len(self) == 0:
+            self.warm_up(snapshot)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM airlines").fetchone()[0])
+
+    def warm_up(self, snapshot: Path = SNAPSHOT_PATH) -> int:
+        """Bulk-load a {code: name} JSON snapshot; live names already stored win."""
+        names: Dict[str, str] = json.loads(Path(snapshot).read_text(encoding="utf-8"))
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO airlines VALUES (?, ?, ?)",
+                [(code, name, now) for code, name in names.items()],
+            )
+        return len(names)
+
+    def _fresh(self, name: Optional[str], updated_at: float) -> bool:
+        return name is not None or time.time() - updated_at < self.negative_ttl
+
+    def lookup(self, codes: List[str]) -> Tuple[Dict[str, str], List[str]]:
+        """
+        Returns ({code: name} for codes we can answer, [codes to fetch]).
+        Negatively cached codes are answered as UNKNOWN_AIRLINE.
+        """
+        found: Dict[str, str] = {}
+        pending: List[str] = []
+        with self._lock:
+            for c in codes:
+                hit = self._memo.get(c)
+                if hit and self._fresh(*hit):
+                    found[c] = hit[0] or UNKNOWN_AIRLINE
+                else:
+                    pending.append(c)
+            if pending:
+                marks = ",".join("?" * len(pending))
+                rows = self._conn.execute(
+                    f"SELECT code, name, updated_at FROM airlines WHERE code IN ({marks})",
+                    pending,
+                ).fetchall()
+                for code, name, updated_at in rows:
+                    self._memo[code] = (name, updated_at)
+                    if self._fresh(name, updated_at):
+                        found[code] = name or UNKNOWN_AIRLINE
+        return found, [c for c in pending if c not in found]
+
+    def remember(self, names: Dict[str, str], unknown: List[str] = ()) -> None:
+        """Store resolved names, plus negative entries for `unknown` codes."""
+        now = time.time()
+        rows = [(c, n, now) for c, n in names.items()]
+        rows += [(c, None, now) for c in unknown if c not in names]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO airlines VALUES (?, ?, ?)", rows
+            )
+            for code, name, ts in rows:
+                self._memo[code] = (name, ts)
+
+
+_STORE: Optional[AirlineNameStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_airline_store() -> AirlineNameStore:
+    """
+    Process-wide store. AIRLINE_CACHE_PATH picks the SQLite file
+    (default: <cache dir>/airlines.sqlite; ":memory:" disables persistence).
+    """
+    global _STORE
+    if _STORE is None:
+        with _STORE_LOCK:
+            if _STORE is None:
+                path = os.getenv("AIRLINE_CACHE_PATH") or (
+                    default_cache_dir() / "airlines.sqlite"
+                )
+                _STORE = AirlineNameStore(path)
+    return _STORE
+
+
+def _names_from_response(resp: Dict) -> Dict[str, str]:
+    names: Dict[str, str] = {}
+    for item in resp.get("data", []):
+        code = item.get("iataCode") or item.get("icaoCode")
+        # prefer a stable, human-friendly name:
+        name = item.get("businessName") or item.get("commonName") or item.get("name")
+        if code and name:
+            names[code] = str(name).title()
+    return names
+
+
+def _resolve_cached(codes: List[str]) -> Tuple[List[str], Dict[str, str], List[str]]:
+    """Normalize & dedupe inputs (skip falsy: None/""), then split off store misses."""
+    uniq = [c for c in dict.fromkeys(codes) if c]
+    if not uniq:
+        return uniq, {}, []
+    found, to_fetch = get_airline_store().lookup(uniq)
+    return uniq, found, to_fetch
+
+
+def _chunks(codes: List[str]) -> List[List[str]]:
+    """Split codes for /v1/reference-data/airlines (AIRLINE_LOOKUP_CHUNK per call)."""
+    size = max(int(os.getenv("AIRLINE_LOOKUP_CHUNK", 20)), 1)
+    return [codes[i : i + size] for i in range(0, len(codes), size)]
+
+
+def _merge_fetched(
+    uniq: List[str], found: Dict[str, str], to_fetch: List[str], resps: List[Dict]
+) -> Dict[str, str]:
+    fetched: Dict[str, str] = {}
+    for resp in resps:
+        fetched.update(_names_from_response(resp))
+    # Anything we asked for but didn't get back is negatively cached
+    get_airline_store().remember(fetched, unknown=to_fetch)
+    found.update(fetched)
+    # Build final mapping, fill missing with placeholder
+    return {c: found.get(c, UNKNOWN_AIRLINE) for c in uniq}
 
 
 def map_airline_codes_to_names(codes: List[str]) -> Dict[str, str]:
@@ -19,30 +185,34 @@ def map_airline_codes_to_names(codes: List[str]) -> Dict[str, str]:
     Accepts a list of airline codes and returns {code: name}.
 
     - Deduplicates input codes
-    - Uses a simple cache to avoid repeated network calls
+    - Answers from the persistent store (incl. negative entries) when possible
+    - Fetches the rest in as few calls as possible (chunks of AIRLINE_LOOKUP_CHUNK)
     - Falls back to "Unknown Airline" for anything not returned by the API
     """
-    # 1) Normalize & dedupe inputs (skip falsy: None/"")
-    uniq = [c for c in dict.fromkeys(codes) if c]
-    if not uniq:
-        return {}
-
-    # 2) Check cache first
-    to_fetch = [c for c in uniq if c not in _CODE_NAME_CACHE]
-    if to_fetch:
-        cli = AmadeusClient()
-        # Official endpoint: /v1/reference-data/airlines
-        resp = cli.get(
-            "/v1/reference-data/airlines", {"airlineCodes": ",".join(to_fetch)}
-        )
-        for item in resp.get("data", []):
-            code = item.get("iataCode") or item.get("icaoCode")
-            # prefer a stable, human-friendly name:
-            name = (
-                item.get("businessName") or item.get("commonName") or item.get("name")
-            )
-            if code and name:
-                _CODE_NAME_CACHE[code] = str(name).title()
+    uniq, found, to_fetch = _resolve_cached(codes)
+    if not to_fetch:
+        return {c: found.get(c, UNKNOWN_AIRLINE) for c in uniq}
+
+    cli = get_client()
+    # Official endpoint: /v1/reference-data/airlines
+    resps = [
+        cli.get("/v1/reference-data/airlines", {"airlineCodes": ",".join(chunk)})
+        for chunk in _chunks(to_fetch)
+    ]
+    return _merge_fetched(uniq, found, to_fetch, resps)
+
 
-    # 3) Build final mapping, fill missing with placeholder
-    return {c: _CODE_NAME_CACHE.get(c, "Unknown Airline") for c in uniq}
+async def map_airline_codes_to_names_async(codes: List[str]) -> Dict[str, str]:
+    """Async twin of map_airline_codes_to_names() (shares the same store)."""
+    uniq, found, to_fetch = _resolve_cached(codes)
+    if not to_fetch:
+        return {c: found.get(c, UNKNOWN_AIRLINE) for c in uniq}
+
+    cli = get_async_client()
+    resps = await asyncio.gather(
+        *(
+            cli.get("/v1/reference-data/airlines", {"airlineCodes": ",".join(chunk)})
+            for chunk in _chunks(to_fetch)
+        )
+    )
+    return _merge_fetched(uniq, found, to_fetch, list(resps))
@@ -1,7 +1,13 @@
 # amadeus_client.py
-import os, time, requests
+import os, random, time, threading, requests
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
 from typing import Optional, Dict, Any, List, Union
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -9,6 +15,9 @@ from tenacity import (
     retry_if_exception_type,
 )
 
+from src.utils.cache import default_cache_dir
+from src.utils.rate_limit import RateLimit, RateLimiter
+
 load_dotenv()
 
 API_KEY = os.getenv("AMADEUS_API_KEY")
@@ -24,20 +33,282 @@ class AmadeusError(Exception):
     pass
 
 
+# -----------------------------------------------------------------------------
+# Connection pooling
+# -----------------------------------------------------------------------------
+# Every AmadeusClient used to call module-level requests.get/post, which opens a
+# brand-new TCP+TLS connection per call. We now keep ONE requests.Session per
+# pool configuration for the whole process, so keep-alive sockets are reused by
+# every client (flights, hotels, reference data, airlines...).
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """
+    Tuning knobs for the shared HTTP connection pool.
+
+      - pool_connections: how many per-host pools to keep (we mostly talk to 1 host)
+      - pool_maxsize:     max keep-alive sockets kept per host
+      - pool_block:       block when all sockets are busy instead of opening extras
+      - keep_alive:       False sends "Connection: close" (debugging only)
+      - connect_retries:  retries for failed CONNECTS only (never re-sends a request)
+      - backoff_factor:   urllib3 backoff between connect retries (seconds)
+    """
+
+    pool_connections: int = 4
+    pool_maxsize: int = 16
+    pool_block: bool = False
+    keep_alive: bool = True
+    connect_retries: int = 2
+    backoff_factor: float = 0.3
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        """Build a config from AMADEUS_POOL_* env vars (defaults above if unset)."""
+        return cls(
+            pool_connections=int(os.getenv("AMADEUS_POOL_CONNECTIONS", 4)),
+            pool_maxsize=int(os.getenv("AMADEUS_POOL_MAXSIZE", 16)),
+            pool_block=os.getenv("AMADEUS_POOL_BLOCK", "false").lower() == "true",
+            keep_alive=os.getenv("AMADEUS_KEEP_ALIVE", "true").lower() != "false",
+            connect_retries=int(os.getenv("AMADEUS_CONNECT_RETRIES", 2)),
+            backoff_factor=float(os.getenv("AMADEUS_CONNECT_BACKOFF", 0.3)),
+        )
+
+
+class _CountingAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that counts requests sent and sockets actually opened.
+
+    urllib3 reconnects a dropped keep-alive connection in place, so its own
+    num_connections undercounts handshakes; we count real connect() calls.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+        self.connects = 0
+        super().__init__(*args, **kwargs)
+
+    def _count_connect(self):
+        with self._lock:
+            self.connects += 1
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        adapter = self
+
+        class _HTTPConn(HTTPConnection):
+            def connect(self):
+                adapter._count_connect()
+                super().connect()
+
+        class _HTTPSConn(HTTPSConnection):
+            def connect(self):
+                adapter._count_connect()
+                super().connect()
+
+        class _HTTPPool(HTTPConnectionPool):
+            ConnectionCls = _HTTPConn
+
+        class _HTTPSPool(HTTPSConnectionPool):
+            ConnectionCls = _HTTPSConn
+
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _HTTPPool,
+            "https": _HTTPSPool,
+        }
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests_sent += 1
+        return super().send(request, **kwargs)
+
+
+_SESSIONS: Dict[PoolConfig, requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _build_session(config: PoolConfig) -> requests.Session:
+    # Only connection errors are retried here; HTTP status handling stays in get().
+    retries = Retry(
+        total=None,
+        connect=config.connect_retries,
+        read=0,
+        status=0,
+        other=0,
+        redirect=5,
+        backoff_factor=config.backoff_factor,
+        raise_on_status=False,
+    )
+    adapter = _CountingAdapter(
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block,
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if not config.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def get_session(config: Optional[PoolConfig] = None) -> requests.Session:
+    """
+    Returns the process-wide pooled session for `config` (env config by default).
+    Sessions are created lazily, once per distinct config.
+    """
+    config = config or PoolConfig.from_env()
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(config)
+        if session is None:
+            session = _build_session(config)
+            _SESSIONS[config] = session
+        return session
+
+
+def pool_stats(session: Optional[requests.Session] = None) -> Dict[str, int]:
+    """
+    Connection reuse counters for a pooled session (the default one if omitted).
+
+    Returns:
+      {"requests": N, "hits": requests on a reused socket, "misses": new sockets}
+
+    A miss is a fresh TCP+TLS handshake (including reconnects of dropped sockets).
+    """
+    session = session or get_session()
+    stats = {"requests": 0, "hits": 0, "misses": 0}
+    for adapter in {id(a): a for a in session.adapters.values()}.values():
+        if isinstance(adapter, _CountingAdapter):
+            stats["requests"] += adapter.requests_sent
+            stats["misses"] += adapter.connects
+    stats["hits"] = max(stats["requests"] - stats["misses"], 0)
+    return stats
+
+
+# -----------------------------------------------------------------------------
+# Rate limiting + retries
+# -----------------------------------------------------------------------------
+# Amadeus enforces per-second quotas (TEST: 10 TPS). Every GET first takes a
+# token from the global "*" bucket (AMADEUS_RATE_LIMIT, "rate[:burst]") and from
+# its endpoint bucket if one is configured (AMADEUS_RATE_LIMITS, e.g.
+# "/v2/shopping/flight-offers=1:2,/v3/shopping/hotel-offers=5"). Buckets live in
+# a SQLite file (AMADEUS_RATE_LIMIT_PATH, default <cache dir>/amadeus_rate.sqlite;
+# ":memory:" keeps them per process) so all worker processes share the quota.
+
+GLOBAL_BUCKET = "*"
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retries for throttled (429) / failing (5xx) GETs.
+
+      - max_retries:  extra attempts after the first one
+      - backoff_base: first backoff ceiling in seconds, doubled per attempt
+      - backoff_cap:  largest backoff ceiling (also caps Retry-After)
+    Waits use full jitter (uniform 0..ceiling) unless the server sends Retry-After.
+    """
+
+    max_retries: int = 3
+    backoff_base: float = 0.5
+    backoff_cap: float = 30.0
+
+    @classmethod
+    def from_env(cls) -> "RetryPolicy":
+        return cls(
+            max_retries=int(os.getenv("AMADEUS_MAX_RETRIES", 3)),
+            backoff_base=float(os.getenv("AMADEUS_RETRY_BACKOFF", 0.5)),
+            backoff_cap=float(os.getenv("AMADEUS_RETRY_BACKOFF_CAP", 30)),
+        )
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.backoff_cap)
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2**attempt))
+
+
+def _retry_after(headers: Any) -> Optional[float]:
+    """Retry-After as seconds (delta-seconds or HTTP-date form), else None."""
+    value = headers.get("Retry-After") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _limiter_from_env() -> RateLimiter:
+    default = RateLimit.parse(os.getenv("AMADEUS_RATE_LIMIT", "10" if ENV == "test" else "40"))
+    limits: Dict[str, RateLimit] = {}
+    for item in os.getenv("AMADEUS_RATE_LIMITS", "").split(","):
+        prefix, _, spec = item.partition("=")
+        if prefix.strip() and spec.strip():
+            limits[prefix.strip()] = RateLimit.parse(spec)
+    path = os.getenv("AMADEUS_RATE_LIMIT_PATH") or default_cache_dir() / "amadeus_rate.sqlite"
+    return RateLimiter(default, limits, path=None if str(path) == ":memory:" else path)
+
+
+_LIMITER: Optional[RateLimiter] = None
+_LIMITER_LOCK = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter (created lazily from AMADEUS_RATE_LIMIT* env vars)."""
+    global _LIMITER
+    if _LIMITER is None:
+        with _LIMITER_LOCK:
+            if _LIMITER is None:
+                _LIMITER = _limiter_from_env()
+    return _LIMITER
+
+
+def rate_limit_stats() -> Dict[str, Dict[str, Any]]:
+    """Queue-wait metrics per bucket of the shared limiter."""
+    return get_rate_limiter().stats()
+
+
+def buckets_for(limiter: RateLimiter, path: str) -> List[str]:
+    """["*"] plus the longest configured endpoint prefix matching `path`."""
+    prefixes = [p for p in limiter.limits if p != GLOBAL_BUCKET and path.startswith(p)]
+    return [GLOBAL_BUCKET] + ([max(prefixes, key=len)] if prefixes else [])
+
+
 class AmadeusClient:
     def __init__(
         self,
         api_key: str = API_KEY,
         api_secret: str = API_SECRET,
         base_url: str = BASE_URL,
+        session: Optional[requests.Session] = None,
+        pool_config: Optional[PoolConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
         if not api_key or not api_secret:
             raise ValueError("AMADEUS_API_KEY/SECRET missing")
         self.api_key = api_key
         self.api_secret = api_secret
         self.base_url = base_url
+        # Shared keep-alive pool unless the caller injects its own session
+        self.session = session or get_session(pool_config)
+        # None -> the process-wide limiter (get_rate_limiter()), resolved per call
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self.retries: int = 0  # 429/5xx retries performed (for tests/metrics)
         self._token: Optional[str] = None
         self._exp: float = 0
+        # Single-flight guard: threads that see an expired token wait here while
+        # ONE of them performs the OAuth exchange.
+        self._token_lock = threading.Lock()
+        self.token_refreshes: int = 0  # successful OAuth exchanges (for tests/metrics)
 
     def _need_token(self) -> bool:
         return not self._token or time.time() >= self._exp - 30
@@ -56,25 +327,73 @@ class AmadeusClient:
             "client_secret": self.api_secret,
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        r = requests.post(url, data=data, headers=headers, timeout=20)
+        r = self.session.post(url, data=data, headers=headers, timeout=20)
         if r.status_code != 200:
             raise AmadeusError(f"OAuth failed: {r.status_code} {r.text}")
         payload = r.json()
         self._token = payload["access_token"]
         self._exp = time.time() + int(payload.get("expires_in", 1799))
+        self.token_refreshes += 1
 
     def _auth_header(self) -> Dict[str, str]:
         if self._need_token():
-            self._refresh_token()
+            with self._token_lock:
+                # Re-check: another thread may have refreshed while we waited
+                if self._need_token():
+                    self._refresh_token()
         return {"Authorization": f"Bearer {self._token}"}
 
     def get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
-        r = requests.get(
-            f"{self.base_url}{path}",
-            headers=self._auth_header(),
-            params=params,
-            timeout=30,
-        )
-        if r.status_code >= 400:
-            raise AmadeusError(f"GET {path} failed: {r.status_code} {r.text}")
-        return r.json()
+        limiter = self.rate_limiter or get_rate_limiter()
+        buckets = buckets_for(limiter, path)
+        policy = self.retry_policy
+        for attempt in range(policy.max_retries + 1):
+            for bucket in buckets:
+                limiter.acquire(bucket)
+            r = self.session.get(
+                f"{self.base_url}{path}",
+                headers=self._auth_header(),
+                params=params,
+                timeout=30,
+            )
+            if r.status_code in _RETRY_STATUSES and attempt < policy.max_retries:
+                delay = policy.delay(attempt, _retry_after(r.headers))
+                self.retries += 1
+                if r.status_code == 429:
+                    # Quota hit: close the bucket for everyone (threads AND
+                    # processes); the next acquire() does the waiting.
+                    limiter.penalize(buckets[-1], delay)
+                else:
+                    time.sleep(delay)
+                continue
+            if r.status_code >= 400:
+                raise AmadeusError(f"GET {path} failed: {r.status_code} {r.text}")
+            return r.json()
+        raise AssertionError("unreachable")  # loop always returns or raises
+
+    def pool_stats(self) -> Dict[str, int]:
+        """Connection hit/miss counters for this client's session."""
+        return pool_stats(self.session)
+
+
+# -----------------------------------------------------------------------------
+# Process-wide shared client
+# -----------------------------------------------------------------------------
+# One client == one cached bearer token. Every travel_scraper module goes
+# through get_client() so a trip plan does ONE OAuth exchange, not one per call.
+
+_SHARED_CLIENT: Optional[AmadeusClient] = None
+_SHARED_CLIENT_LOCK = threading.Lock()
+
+
+def get_client() -> AmadeusClient:
+    """
+    Returns the shared AmadeusClient (created on first use, thread-safe).
+    Raises ValueError like AmadeusClient() if keys are missing.
+    """
+    global _SHARED_CLIENT
+    if _SHARED_CLIENT is None:
+        with _SHARED_CLIENT_LOCK:
+            if _SHARED_CLIENT is None:
+                _SHARED_CLIENT = AmadeusClient()
+    return _SHARED_CLIENT
@@ -0,0 +1,191 @@
+# async_client.py
+"""
+Asyncio twin of amadeus_client.py, built on httpx.
+
+One event loop can drive hundreds of concurrent Amadeus calls through a single
+pooled httpx.AsyncClient (no thread per request). Same env config, same
+AmadeusError, same single-flight OAuth token, same rate limiter and 429/5xx
+retry policy as the sync client (waits are awaited, never blocking the loop;
+a SQLite-backed limiter, which may wait on another process's file lock, is
+called from a worker thread).
+
+Usage:
+    cli = get_async_client()
+    data = await cli.get("/v1/reference-data/locations", {"keyword": "Rome"})
+
+The shared client belongs to its event loop and holds a connection pool, so
+close it before the loop goes away: run the entry coroutine with
+async_client.run(main()) instead of asyncio.run(main()), or await
+aclose_async_client() at the end of the loop's work.
+"""
+
+import asyncio, time, weakref
+from typing import Any, Dict, Optional
+
+import httpx
+from tenacity import (
+    retry,
+    stop_after_attempt,
+    wait_exponential,
+    retry_if_exception_type,
+)
+
+from src.utils.rate_limit import RateLimiter
+from .amadeus_client import (
+    _RETRY_STATUSES,
+    API_KEY,
+    API_SECRET,
+    BASE_URL,
+    AmadeusError,
+    PoolConfig,
+    RetryPolicy,
+    _retry_after,
+    buckets_for,
+    get_rate_limiter,
+)
+
+
+class AsyncAmadeusClient:
+    def __init__(
+        self,
+        api_key: str = API_KEY,
+        api_secret: str = API_SECRET,
+        base_url: str = BASE_URL,
+        http: Optional[httpx.AsyncClient] = None,
+        pool_config: Optional[PoolConfig] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        if not api_key or not api_secret:
+            raise ValueError("AMADEUS_API_KEY/SECRET missing")
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url
+        self.http = http or self._build_http(pool_config or PoolConfig.from_env())
+        self._token: Optional[str] = None
+        self._exp: float = 0
+        self._token_lock = asyncio.Lock()
+        self.token_refreshes: int = 0
+        self.rate_limiter = rate_limiter  # None -> get_rate_limiter()
+        self.retry_policy = retry_policy or RetryPolicy.from_env()
+        self.retries: int = 0
+
+    @staticmethod
+    def _build_http(config: PoolConfig) -> httpx.AsyncClient:
+        # Map the sync PoolConfig onto httpx limits/transport
+        limits = httpx.Limits(
+            max_connections=config.pool_maxsize * config.pool_connections,
+            max_keepalive_connections=config.pool_maxsize if config.keep_alive else 0,
+        )
+        transport = httpx.AsyncHTTPTransport(
+            limits=limits, retries=config.connect_retries
+        )
+        return httpx.AsyncClient(transport=transport, timeout=30)
+
+    def _need_token(self) -> bool:
+        return not self._token or time.time() >= self._exp - 30
+
+    @retry(
+        reraise=True,
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(1, 2, 8),
+        retry=retry_if_exception_type(AmadeusError),
+    )
+    async def _refresh_token(self):
+        url = f"{self.base_url}/v1/security/oauth2/token"
+        data = {
+            "grant_type": "client_credentials",
+            "client_id": self.api_key,
+            "client_secret": self.api_secret,
+        }
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        r = await self.http.post(url, data=data, headers=headers, timeout=20)
+        if r.status_code != 200:
+            raise AmadeusError(f"OAuth failed: {r.status_code} {r.text}")
+        payload = r.json()
+        self._token = payload["access_token"]
+        self._exp = time.time() + int(payload.get("expires_in", 1799))
+        self.token_refreshes += 1
+
+    async def _auth_header(self) -> Dict[str, str]:
+        if self._need_token():
+            async with self._token_lock:
+                if self._need_token():
+                    await self._refresh_token()
+        return {"Authorization": f"Bearer {self._token}"}
+
+    @staticmethod
+    async def _limiter_call(limiter: RateLimiter, fn, *args):
+        # In-memory buckets are a dict update under a lock: call inline
+        if limiter.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        limiter = self.rate_limiter or get_rate_limiter()
+        buckets = buckets_for(limiter, path)
+        policy = self.retry_policy
+        for attempt in range(policy.max_retries + 1):
+            for bucket in buckets:
+                wait = await self._limiter_call(limiter, limiter.reserve, bucket)
+                if wait > 0:
+                    await asyncio.sleep(wait)
+            r = await self.http.get(
+                f"{self.base_url}{path}",
+                headers=await self._auth_header(),
+                params=params,
+            )
+            if r.status_code in _RETRY_STATUSES and attempt < policy.max_retries:
+                delay = policy.delay(attempt, _retry_after(r.headers))
+                self.retries += 1
+                if r.status_code == 429:
+                    await self._limiter_call(limiter, limiter.penalize, buckets[-1], delay)
+                else:
+                    await asyncio.sleep(delay)
+                continue
+            if r.status_code >= 400:
+                raise AmadeusError(f"GET {path} failed: {r.status_code} {r.text}")
+            return r.json()
+        raise AssertionError("unreachable")  # loop always returns or raises
+
+    async def aclose(self):
+        await self.http.aclose()
+
+
+# httpx.AsyncClient (and asyncio.Lock) belong to the loop they were first used
+# on, so we keep one shared client PER running event loop.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncAmadeusClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_client() -> AsyncAmadeusClient:
+    """
+    Returns the shared AsyncAmadeusClient for the running event loop.
+    Must be called from inside a coroutine.
+    """
+    loop = asyncio.get_running_loop()
+    cli = _ASYNC_CLIENTS.get(loop)
+    if cli is None:
+        cli = AsyncAmadeusClient()
+        _ASYNC_CLIENTS[loop] = cli
+    return cli
+
+
+async def aclose_async_client() -> None:
+    """Close and forget the running loop's shared client (no-op if none was made)."""
+    cli = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if cli is not None:
+        await cli.aclose()
+
+
+def run(coro):
+    """asyncio.run(coro) that closes the loop's shared client before the loop ends."""
+
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aclose_async_client()
+
+    return asyncio.run(main())
@@ -0,0 +1,152 @@
+"""
+fare_calendar.py
+----------------
+Flexible-date fare search ("±3 days around my dates").
+
+Runs search_flights() over a grid of (depart, return) date shifts of one
+FlightQuery and condenses it into a PriceCalendar: a NumPy matrix of the
+cheapest grandTotal per cell, rows = depart offset, columns = return offset.
+
+  - cells already in the flight-offer cache are answered without an API call
+  - the rest run concurrently (max_parallel); every call goes through the
+    client's shared token-bucket limiter (AMADEUS_RATE_LIMIT*, see
+    amadeus_client.py), so a 7x7 grid can't burst 49 requests past the quota
+  - cells that make no sense (return before departure) or failed are nan
+
+Usage:
+    cal = search_price_calendar(FlightQuery("LHE", "ROM", "2025-09-12", "2025-09-17"))
+    print(cal.render())             # grid with the cheapest cells marked "*"
+    cal.cheapest(3)                 # [(depart, return, price), ...]
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .flights import _FLIGHT_CACHE, FlightQuery, flight_query_key, search_flights
+from .offer_table import FlightOfferTable
+
+# (row, col) in the calendar matrix
+_Cell = Tuple[int, int]
+
+
+@dataclass
+class PriceCalendar:
+    """
+    Cheapest total price per (depart, return) date pair.
+
+      - depart_dates: row labels ("YYYY-MM-DD")
+      - return_dates: column labels ([None] for one-way searches)
+      - prices:       float matrix [len(depart_dates), len(return_dates)], nan = no fare
+      - currency:     currency of the prices
+      - cached_cells / fetched_cells: how each cell was answered
+    """
+
+    depart_dates: List[str]
+    return_dates: List[Optional[str]]
+    prices: np.ndarray
+    currency: str
+    cached_cells: int = 0
+    fetched_cells: int = 0
+    failed: List[Tuple[str, Optional[str]]] = field(default_factory=list)
+
+    def cheapest(self, n: int = 1) -> List[Tuple[str, Optional[str], float]]:
+        """The n cheapest cells as (depart, return, price), cheapest first."""
+        flat = self.prices.ravel()
+        order = np.argsort(flat, kind="stable")  # nan sorts last
+        order = order[~np.isnan(flat[order])][:n]
+        cols = len(self.return_dates)
+        return [
+            (self.depart_dates[i // cols], self.return_dates[i % cols], float(flat[i]))
+            for i in order
+        ]
+
+    def cheapest_mask(self, n: int = 3) -> np.ndarray:
+        """Boolean matrix marking the n cheapest cells (ties included)."""
+        best = self.cheapest(n)
+        if not best:
+            return np.zeros(self.prices.shape, dtype=bool)
+        return self.prices <= best[-1][2]
+
+    def render(self, highlight: int = 3) -> str:
+        """Plain-text grid; the `highlight` cheapest cells are marked with "*"."""
+        mask = self.cheapest_mask(highlight)
+        head = ["depart \\ return"] + [r or "one-way" for r in self.return_dates]
+        rows = [head]
+        for i, d in enumerate(self.depart_dates):
+            cells = []
+            for j in range(len(self.return_dates)):
+                p = self.prices[i, j]
+                cells.append("-" if np.isnan(p) else f"{p:,.0f}{'*' if mask[i, j] else ''}")
+            rows.append([d] + cells)
+        widths = [max(len(r[k]) for r in rows) for k in range(len(head))]
+        lines = ["  ".join(c.rjust(w) for c, w in zip(r, widths)) for r in rows]
+        return "\n".join(lines + [f"(* cheapest, {self.currency})"])
+
+
+def _shifted(day: str, offset: int) -> str:
+    return (date.fromisoformat(day) + timedelta(days=offset)).isoformat()
+
+
+def _cheapest_total(offers: List[Dict]) -> float:
+    if not offers:
+        return float("nan")
+    prices = FlightOfferTable.from_offers(offers)["price"]
+    return float(np.nanmin(prices)) if not np.isnan(prices).all() else float("nan")
+
+
+def search_price_calendar(
+    q: FlightQuery,
+    depart_days: int = 3,
+    return_days: int = 3,
+    max_parallel: int = 4,
+    use_cache: bool = True,
+) -> PriceCalendar:
+    """
+    Search q shifted by -depart_days..+depart_days (departure) and
+    -return_days..+return_days (return; ignored for one-way) and return the
+    PriceCalendar of cheapest fares. Every cell is a normal search_flights()
+    call, so it reads/writes the same flight-offer cache.
+    """
+    depart_dates = [_shifted(q.depart_date, k) for k in range(-depart_days, depart_days + 1)]
+    return_dates: List[Optional[str]] = (
+        [_shifted(q.return_date, k) for k in range(-return_days, return_days + 1)]
+        if q.return_date
+        else [None]
+    )
+    prices = np.full((len(depart_dates), len(return_dates)), np.nan)
+    cal = PriceCalendar(depart_dates, return_dates, prices, q.currency)
+
+    # Plan the grid: answer cached cells now, queue the rest
+    todo: Dict[_Cell, FlightQuery] = {}
+    for i, d in enumerate(depart_dates):
+        for j, r in enumerate(return_dates):
+            if r is not None and r < d:
+                continue  # return before departure
+            cell_q = replace(q, depart_date=d, return_date=r)
+            cached = _FLIGHT_CACHE.get(flight_query_key(cell_q)) if use_cache else None
+            if cached is not None:
+                prices[i, j] = _cheapest_total(cached)
+                cal.cached_cells += 1
+            else:
+                todo[(i, j)] = cell_q
+    if not todo:
+        return cal
+
+    workers = max(1, min(max_parallel, len(todo)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fare-calendar") as pool:
+        futures = {pool.submit(search_flights, cell_q, use_cache=False): cell for cell, cell_q in todo.items()}
+        for fut in as_completed(futures):
+            i, j = futures[fut]
+            try:
+                prices[i, j] = _cheapest_total(fut.result())
+                cal.fetched_cells += 1
+            except Exception as e:
+                cal.failed.append((depart_dates[i], return_dates[j]))
+                print(f"Fare calendar cell {depart_dates[i]}/{return_dates[j]} failed:", e)
+    return cal
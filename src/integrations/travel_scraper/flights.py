@@ -6,18 +6,43 @@ Responsible for searching flight offers via Amadeus Self-Service API.
 Exposes:
   - FlightQuery (dataclass): a typed container for user input parameters.
   - search_flights(q: FlightQuery) -> list[dict]: returns raw Amadeus offers.
+  - search_flights_async(q: FlightQuery): same, for asyncio callers.
+  - search_flights_with_age(q) / _async: (offers, age in seconds of the answer).
+  - flight_cache_stats(): hit/miss metrics of the offer cache.
+
+Identical (normalized) queries are answered from a TTL/LRU cache for a few minutes,
+since users often re-run the same plan. Configure it with FLIGHT_CACHE_* env vars
+(see src/utils/cache.py), or pass use_cache=False to force a live search.
+Stale-while-revalidate: an answer past its TTL but within FLIGHT_CACHE_MAX_STALE
+is served immediately and refreshed in the background.
+Concurrent identical searches that miss the cache share ONE upstream request
+(single-flight, see src/utils/singleflight.py); callers must not mutate the
+returned list.
+
+Filters (max_price, non_stop, included/excluded airlines) are pushed DOWN to the
+API (maxPrice, nonStop, includedAirlineCodes, excludedAirlineCodes) so Amadeus
+returns fewer, smaller offers. A vectorized client-side pass (FlightOfferTable)
+then drops anything the API still let through, e.g. when the TEST env ignores
+a filter or FLIGHT_FILTER_PUSHDOWN=0 disables pushdown.
 
 We intentionally return the raw JSON dicts from Amadeus so the calling code
 (LangChain/Streamlit) can decide how to render, sort, or post-process.
 """
 
 from __future__ import annotations  # allows list[dict] typing on python <3.9
+import math
+import os
 from dataclasses import (
+    asdict,
     dataclass,
 )  # dataclass is a decorator to auto-generate __init__, __repr__, etc.
-from typing import Optional, List, Any, Dict
+from typing import Optional, List, Any, Dict, Tuple
 
-from .amadeus_client import AmadeusClient  # our OAuth + GET helper (Step 1)
+from src.utils.cache import cache_from_env, make_key
+from src.utils.singleflight import SingleFlight
+from .amadeus_client import get_client  # shared OAuth + GET helper (Step 1)
+from .async_client import get_async_client  # asyncio twin of the above
+from .offer_table import FlightOfferTable  # columnar filter for the fallback
 
 # ^ relative import from the same package (the leading dot means this package)
 
@@ -30,6 +55,12 @@ class FlightQuery:
     """
     A plain data-holder for flight search parameters.
     Using a dataclass makes construction and validation easier and keeps code tidy
+
+    Filters:
+      - max_price:         total price cap (grandTotal, all travelers)
+      - non_stop:          True -> direct flights only
+      - included_airlines: only these carrier codes (e.g. ["QR", "EK"])
+      - excluded_airlines: never these carrier codes
     """
 
     origin_iata: str
@@ -42,28 +73,67 @@ class FlightQuery:
     max_price: Optional[float] = None
     non_stop: Optional[bool] = None
     travel_class: Optional[str] = None
+    included_airlines: Optional[List[str]] = None
+    excluded_airlines: Optional[List[str]] = None
+
+
+# Fares go stale quickly, so the default TTL is short (10 min). Up to 30 min
+# old answers are still shown instantly while a background search refreshes
+# them, and hot entries are refreshed a minute before they expire.
+_FLIGHT_CACHE = cache_from_env(
+    "FLIGHT",
+    ttl=600,
+    max_entries=256,
+    max_bytes=32 * 1024 * 1024,
+    max_stale=1800,
+    refresh_ahead=60,
+)
+
+
+# In-flight searches by flight_query_key: identical concurrent misses coalesce
+_IN_FLIGHT = SingleFlight("flights")
+
+
+def flight_query_key(q: FlightQuery) -> str:
+    """
+    Cache key for a FlightQuery. Codes/currency/class are upper-cased and strings
+    stripped, so "rom"/"ROM " and "economy"/"ECONOMY" hit the same entry; airline
+    lists are compared as sets.
+    """
+    norm: Dict[str, Any] = {}
+    for field, value in asdict(q).items():
+        if isinstance(value, str):
+            value = value.strip()
+            if field != "depart_date" and field != "return_date":
+                value = value.upper()
+        elif isinstance(value, list):
+            value = _airline_codes(value) or None
+        norm[field] = value
+    return make_key("flight-offers", norm)
+
+
+def flight_cache_stats() -> Dict[str, Any]:
+    """Hit rate / size of the flight-offer cache, plus coalesced searches."""
+    return {**_FLIGHT_CACHE.stats(), "coalesced": _IN_FLIGHT.coalesced}
 
 
 # -------------------------------------
-# 2) The main function the app will use
+# 2) Request building (shared by sync + async)
 # -------------------------------------
-def search_flights(q: FlightQuery) -> List[Dict]:
-    """
-    Call Amadeus Flight Offers Search (v2) with parameters from FlightQuery
-    and return a list of raw offer dictionaries.
+def _airline_codes(codes: Optional[List[str]]) -> List[str]:
+    """Strip/upper-case/dedupe carrier codes, sorted (stable params + cache keys)."""
+    return sorted({c.strip().upper() for c in codes or [] if c and c.strip()})
 
-    Args:
-        q (FlightQuery): the user's search parameters.
-    Returns:
-        List[Dict]: a list of flight offers as dicts (raw amadeus JSON).
-    """
-    # Create an API client. This will:
-    # - lazily fetch/refresh a bearer token (OAuth2 client-credentials)
-    # - provide a .get() method with Authorization header
-    cli = AmadeusClient()
 
-    # Build the querystring parameters as a Python dict[str, Any].
-    # Keys must match Amadeus parameter names
+def _pushdown_enabled() -> bool:
+    return os.getenv("FLIGHT_FILTER_PUSHDOWN", "1").lower() not in ("0", "false", "no")
+
+
+def _flight_params(q: FlightQuery) -> Dict[str, object]:
+    """
+    Build the querystring parameters as a Python dict[str, Any].
+    Keys must match Amadeus parameter names.
+    """
     params: Dict[str, object] = {
         "originLocationCode": q.origin_iata,
         "destinationLocationCode": q.dest_iata,
@@ -81,30 +151,139 @@ def search_flights(q: FlightQuery) -> List[Dict]:
         params["nonStop"] = str(q.non_stop).lower()  # bool -> "true"/"false"
     if q.travel_class:
         params["travelClass"] = q.travel_class  # e.g., "Economy"
+    if not _pushdown_enabled():
+        return params
+
+    # Server-side filters: Amadeus drops non-matching offers before sending them.
+    if q.max_price is not None:
+        # maxPrice is a whole number PER TRAVELER; round up so we never lose an
+        # offer that fits the total budget (the client-side pass is exact).
+        params["maxPrice"] = max(math.ceil(q.max_price / max(q.adults, 1)), 1)
+    included = _airline_codes(q.included_airlines)
+    excluded = _airline_codes(q.excluded_airlines)
+    # The API rejects both lists together; exclusions then happen client-side.
+    if included:
+        params["includedAirlineCodes"] = ",".join(included)
+    elif excluded:
+        params["excludedAirlineCodes"] = ",".join(excluded)
+    return params
+
+
+def _has_filters(q: FlightQuery) -> bool:
+    return bool(
+        q.max_price is not None
+        or q.non_stop
+        or q.included_airlines
+        or q.excluded_airlines
+    )
+
+
+def _offers_from_response(q: FlightQuery, response_json: Dict) -> List[Dict]:
+    # The payload envelope typically has a "data" key holding a list of offers.
+    offers: List[Dict] = response_json.get("data", [])
+    if not offers or not _has_filters(q):
+        return offers
+
+    # Client-side fallback for whatever the API did not filter. Offers with a
+    # missing/unexpected price or shape are kept rather than accidentally dropped.
+    kept = FlightOfferTable.from_offers(offers).filter(
+        max_price=q.max_price,
+        max_stops=0 if q.non_stop else None,
+        only_carriers=_airline_codes(q.included_airlines) or None,
+        exclude_carriers=_airline_codes(q.excluded_airlines) or None,
+        keep_unknown=True,
+    )
+    return kept.to_offers()
+
+
+# -------------------------------------
+# 3) The main function the app will use
+# -------------------------------------
+def search_flights(q: FlightQuery, use_cache: bool = True) -> List[Dict]:
+    """
+    Call Amadeus Flight Offers Search (v2) with parameters from FlightQuery
+    and return a list of raw offer dictionaries.
+
+    Args:
+        q (FlightQuery): the user's search parameters.
+        use_cache (bool): answer repeated identical queries from the offer cache.
+    Returns:
+        List[Dict]: a list of flight offers as dicts (raw amadeus JSON).
+    """
+    return search_flights_with_age(q, use_cache)[0]
+
+
+def search_flights_with_age(
+    q: FlightQuery, use_cache: bool = True
+) -> Tuple[List[Dict], float]:
+    """
+    search_flights() plus the age of the answer in seconds (0.0 = just fetched).
+
+    A cached answer past its TTL but within FLIGHT_CACHE_MAX_STALE is returned
+    at once and refreshed in the background (stale-while-revalidate).
+    """
+    key = flight_query_key(q)
+    if use_cache:
+        hit = _FLIGHT_CACHE.lookup(key)
+        if hit is not None:
+            offers, age, needs_refresh = hit
+            if needs_refresh:
+                _FLIGHT_CACHE.refresh_in_background(
+                    key, lambda: _IN_FLIGHT.do(key, _fetch_flights, q)
+                )
+            return offers, age
+
+    # Someone already searching the same thing? Wait for their answer instead.
+    offers = _IN_FLIGHT.do(key, _fetch_flights, q)
+    _FLIGHT_CACHE.put(key, offers)
+    return offers, 0.0
+
+
+def _fetch_flights(q: FlightQuery) -> List[Dict]:
+    # Grab the process-wide API client. It:
+    # - lazily fetches/refreshes ONE shared bearer token (OAuth2 client-credentials)
+    # - provides a .get() method with Authorization header over pooled connections
+    cli = get_client()
 
     # Perform the authenticated GET request. The client:
     #  - ensures a valid token exists
     #  - sends Authorization: Bearer <token>
     #  - raises a helpful error if HTTP status >= 400
-    response_json: Dict = cli.get("/v2/shopping/flight-offers", params)
+    response_json: Dict = cli.get("/v2/shopping/flight-offers", _flight_params(q))
+    return _offers_from_response(q, response_json)
 
-    # The payload envelope typically has a "data" key holding a list of offers.
-    offers: List[Dict] = response_json.get("data", [])
 
-    # Optional client-side budget filter: if max_price is set, drop offers that exceed it.
-    if q.max_price is not None:
+async def search_flights_async(q: FlightQuery, use_cache: bool = True) -> List[Dict]:
+    """
+    Asyncio version of search_flights(): same params, same return shape, but
+    awaits the shared httpx client so many searches can share one event loop.
+    """
+    return (await search_flights_with_age_async(q, use_cache))[0]
+
+
+async def search_flights_with_age_async(
+    q: FlightQuery, use_cache: bool = True
+) -> Tuple[List[Dict], float]:
+    """Async twin of search_flights_with_age() (refreshes run on the cache's pool)."""
+    key = flight_query_key(q)
+    if use_cache:
+        hit = _FLIGHT_CACHE.lookup(key)
+        if hit is not None:
+            offers, age, needs_refresh = hit
+            if needs_refresh:
+                _FLIGHT_CACHE.refresh_in_background(
+                    key, lambda: _IN_FLIGHT.do(key, _fetch_flights, q)
+                )
+            return offers, age
+
+    offers = await _IN_FLIGHT.do_async(key, _fetch_flights_async, q)
+    _FLIGHT_CACHE.put(key, offers)
+    return offers, 0.0
+
 
-        def within_budget(offer: Dict) -> bool:
-            """
-            Defensice extraction: some offers might have different shapes.
-            We try to parse price.grandTotal as a float and compare.
-            """
-            try:
-                total_str = offer["price"]["grandTotal"]  # Type: str, eng, "742.15"
-                total_val = float(total_str)
-                return total_val <= q.max_price
-            except Exception:
-                # If price missing/unexpected, we keep the offer rather than accidentally dropping it
-                return True
-
-    return offers
+async def _fetch_flights_async(q: FlightQuery) -> List[Dict]:
+    cli = get_async_client()
+    response_json: Dict = await cli.get(
+        "/v2/shopping/flight-offers", _flight_params(q)
+    )
+    return _offers_from_response(q, response_json)
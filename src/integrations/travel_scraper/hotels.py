@@ -12,12 +12,40 @@ STEP 2: Use Hotel Search v3 to fetch OFFERS for a set of hotelIds
 Why do we do STEP 1 first?
 - In v3, /shopping/hotel-offers *requires* hotelIds and removed cityCode.
   To search by city or coordinates, Amadeus now directs you to the Hotel List API first.
+
+STEP 1 returns static data (ids, names, addresses, geo) that rarely changes, so
+it is kept as a per-city CityCatalogue: compact records in a long-TTL,
+compressed disk cache (HOTEL_LIST_CACHE_*), loaded lazily and memoized in
+memory together with its {hotelId: record} index. Concurrent misses for the
+same city share one Hotel List call (single-flight).
+
+STEP 2 offers are cached per HotelQuery for a short TTL (HOTEL_OFFERS_CACHE_*)
+with stale-while-revalidate: an answer within HOTEL_OFFERS_CACHE_MAX_STALE past
+its TTL is served at once and refreshed in the background. Only complete
+answers (no failed chunk) are cached. The *_with_age variants also report how
+old the answer is.
+
+Every step also has an `*_async` twin (same inputs/outputs) for asyncio callers.
+
+Streaming: iter_hotel_summaries() / aiter_hotel_summaries() yield enriched
+summaries one offer chunk at a time, so a UI can show the first hotels long
+before the slowest chunk is back (pair with parsing_hotels.CheapestHotels).
 """
 
 from __future__ import annotations
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-from .amadeus_client import AmadeusClient  # your OAuth+HTTP helper
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from cachetools import TTLCache
+
+from src.utils.cache import ResponseCache, cache_from_env, make_key
+from src.utils.singleflight import SingleFlight
+from .amadeus_client import get_client  # shared OAuth+HTTP helper
+from .async_client import get_async_client
+from .parsing_hotels import index_hotel_list, summarize_hotels_offers
 
 
 @dataclass
@@ -32,6 +60,8 @@ class HotelQuery:
       - adults:      int            (1..9)
       - currency:    str            (ISO 4217 e.g. "USD")
       - max_hotels:  int            (# of hotelIds to include in v3 search)
+      - chunk_size:  int            (hotelIds per v3 request)
+      - max_parallel: int           (v3 requests in flight at once)
     """
 
     city_code: str
@@ -40,23 +70,236 @@ class HotelQuery:
     adults: int = 1
     currency: str = "USD"
     max_hotels: int = 25
+    chunk_size: int = 20
+    max_parallel: int = 4
 
 
-def list_hotels_by_city(city_code: str) -> List[Dict]:
+# ---------- STEP 1: static hotel catalogue (per city) ----------
+HOTEL_LIST_TTL = 7 * 24 * 3600  # static data: a week is plenty
+
+
+@dataclass
+class CityCatalogue:
     """
-    STEP 1: Call Hotel List API by city to get hotel “static” records.
+    Static Hotel List data for one city code.
 
-    Returns:
-      list[dict] where each dict typically contains:
-        - hotelId (str, 8 chars like "RTPAR001")
-        - name, address, latitude/longitude, etc. (varies)
+      - hotels: compact records (hotelId, name, address, latitude/longitude)
+      - index:  {hotelId: record}, built once and reused for enrichment
+
+    Shared between callers: treat both as read-only.
     """
-    cli = AmadeusClient()
+
+    city_code: str
+    hotels: List[Dict]
+    index: Dict[str, Dict]
+
+
+# Disk cache is created on first use (not at import), so importing this module
+# never touches the filesystem.
+_HOTEL_LIST_CACHE: Optional[ResponseCache] = None
+_HOTEL_LIST_LOCK = threading.Lock()
+
+# Parsed catalogues (records + index) for the cities this process has seen.
+_CATALOGUES: TTLCache = TTLCache(maxsize=64, ttl=HOTEL_LIST_TTL)
+_CATALOGUES_LOCK = threading.Lock()
+# Concurrent misses for the same city share one Hotel List call
+_CATALOGUE_FLIGHTS = SingleFlight("hotel-list")
+
+# Offers (prices/availability) move fast: 15 min fresh, served up to an hour
+# stale while a background search refreshes them.
+_HOTEL_OFFERS_CACHE = cache_from_env(
+    "HOTEL_OFFERS",
+    ttl=900,
+    max_entries=128,
+    max_bytes=32 * 1024 * 1024,
+    max_stale=3600,
+    refresh_ahead=60,
+)
+
+
+def _hotel_list_cache() -> ResponseCache:
+    global _HOTEL_LIST_CACHE
+    if _HOTEL_LIST_CACHE is None:
+        with _HOTEL_LIST_LOCK:
+            if _HOTEL_LIST_CACHE is None:
+                _HOTEL_LIST_CACHE = cache_from_env(
+                    "HOTEL_LIST",
+                    ttl=HOTEL_LIST_TTL,
+                    max_entries=1024,
+                    max_bytes=128 * 1024 * 1024,
+                    backend="disk",
+                    compress=True,
+                )
+    return _HOTEL_LIST_CACHE
+
+
+def _compact_hotel(h: Dict) -> Optional[Dict]:
+    """Keep only the fields we enrich summaries with (drops chain codes, ids, etc.)."""
+    hid = h.get("hotelId") or h.get("hotel", {}).get("hotelId")
+    if not isinstance(hid, str) or not hid:
+        return None
+    rec: Dict[str, Any] = {"hotelId": hid}
+    if h.get("name"):
+        rec["name"] = h["name"]
+    addr = h.get("address")
+    if isinstance(addr, dict):
+        lines = addr.get("lines")
+        short = {
+            "lines": lines[:1] if isinstance(lines, list) else None,
+            "cityName": addr.get("cityName"),
+            "countryCode": addr.get("countryCode"),
+        }
+        short = {k: v for k, v in short.items() if v}
+        if short:
+            rec["address"] = short
+    # The API nests coordinates under "geoCode"; flatten them once here
+    geo = h.get("geoCode") if isinstance(h.get("geoCode"), dict) else h
+    if geo.get("latitude") is not None and geo.get("longitude") is not None:
+        rec["latitude"] = geo["latitude"]
+        rec["longitude"] = geo["longitude"]
+    return rec
+
+
+def _catalogue_key(city_code: str) -> str:
+    return make_key("hotel-list", city_code)
+
+
+def _cached_catalogue(city_code: str) -> Optional[CityCatalogue]:
+    """Memoized catalogue, else the disk cache (parsed + indexed once), else None."""
+    with _CATALOGUES_LOCK:
+        cat = _CATALOGUES.get(city_code)
+    if cat is not None:
+        return cat
+    hotels = _hotel_list_cache().get(_catalogue_key(city_code))
+    if hotels is None:
+        return None
+    return _remember_catalogue(city_code, hotels)
+
+
+def _remember_catalogue(city_code: str, hotels: List[Dict]) -> CityCatalogue:
+    cat = CityCatalogue(city_code, hotels, index_hotel_list(hotels))
+    with _CATALOGUES_LOCK:
+        _CATALOGUES[city_code] = cat
+    return cat
+
+
+def _catalogue_from_response(city_code: str, payload: Dict) -> CityCatalogue:
+    hotels = [r for r in map(_compact_hotel, payload.get("data", [])) if r]
+    if not hotels:
+        # Empty answers (common in TEST) are not worth pinning for a week
+        return CityCatalogue(city_code, [], {})
+    _hotel_list_cache().put(_catalogue_key(city_code), hotels)
+    return _remember_catalogue(city_code, hotels)
+
+
+def get_city_catalogue(city_code: str) -> CityCatalogue:
+    """
+    STEP 1: static hotel catalogue for a city, from memory, disk, or (on a miss)
+    the Hotel List API.
+    """
+    city_code = city_code.strip().upper()
+    cat = _cached_catalogue(city_code)
+    if cat is not None:
+        return cat
+    return _CATALOGUE_FLIGHTS.do(city_code, _fetch_catalogue, city_code)
+
+
+def _fetch_catalogue(city_code: str) -> CityCatalogue:
+    # A leader that just finished may have filled the cache between our miss
+    # and taking the lead
+    cat = _cached_catalogue(city_code)
+    if cat is not None:
+        return cat
+    cli = get_client()
     # Minimal required param is cityCode. (We avoid extra filters to keep it simple in TEST.)
     payload: Dict = cli.get(
         "/v1/reference-data/locations/hotels/by-city", {"cityCode": city_code}
     )
-    return payload.get("data", [])
+    return _catalogue_from_response(city_code, payload)
+
+
+async def get_city_catalogue_async(city_code: str) -> CityCatalogue:
+    """Async twin of get_city_catalogue() (same memory/disk caches)."""
+    city_code = city_code.strip().upper()
+    cat = _cached_catalogue(city_code)
+    if cat is not None:
+        return cat
+    return await _CATALOGUE_FLIGHTS.do_async(
+        city_code, _fetch_catalogue_async, city_code
+    )
+
+
+async def _fetch_catalogue_async(city_code: str) -> CityCatalogue:
+    cat = _cached_catalogue(city_code)
+    if cat is not None:
+        return cat
+    cli = get_async_client()
+    payload: Dict = await cli.get(
+        "/v1/reference-data/locations/hotels/by-city", {"cityCode": city_code}
+    )
+    return _catalogue_from_response(city_code, payload)
+
+
+def catalogue_index(city_code: str, hotel_list: List[Dict]) -> Dict[str, Dict]:
+    """
+    {hotelId: record} for `hotel_list`: the prebuilt index when the list is the
+    cached catalogue of `city_code` (what search_hotels returns), else a new one.
+    """
+    with _CATALOGUES_LOCK:
+        cat = _CATALOGUES.get(city_code.strip().upper())
+    if cat is not None and cat.hotels is hotel_list:
+        return cat.index
+    return index_hotel_list(hotel_list)
+
+
+def hotel_catalogue_stats() -> Dict[str, Any]:
+    """
+    Disk cache hit/miss/size stats, the number of catalogues in memory and how
+    many lookups were coalesced into another caller's in-flight request.
+    """
+    return {
+        **_hotel_list_cache().stats(),
+        "in_memory": len(_CATALOGUES),
+        "coalesced": _CATALOGUE_FLIGHTS.coalesced,
+    }
+
+
+def list_hotels_by_city(city_code: str) -> List[Dict]:
+    """
+    STEP 1: Hotel List API by city -> hotel “static” records (cached, see
+    get_city_catalogue()).
+
+    Returns:
+      list[dict] where each dict contains:
+        - hotelId (str, 8 chars like "RTPAR001")
+        - name, address, latitude/longitude when the API knows them
+    """
+    return get_city_catalogue(city_code).hotels
+
+
+async def list_hotels_by_city_async(city_code: str) -> List[Dict]:
+    """Async twin of list_hotels_by_city()."""
+    return (await get_city_catalogue_async(city_code)).hotels
+
+
+def _offer_params(
+    hotel_ids: List[str],
+    check_in: str,
+    check_out: str,
+    adults: int,
+    currency: str,
+    best_rate_only: bool,
+) -> Dict[str, str | int]:
+    params: Dict[str, str | int] = {
+        "hotelIds": ",".join(hotel_ids),
+        "adults": adults,
+        "checkInDate": check_in,
+        "checkOutDate": check_out,
+        "currency": currency,
+    }
+    if best_rate_only:
+        params["bestRateOnly"] = "true"
+    return params
 
 
 def search_hotel_offers_by_ids(
@@ -78,50 +321,261 @@ def search_hotel_offers_by_ids(
     if not hotel_ids:
         return []
 
-    cli = AmadeusClient()
-    params: Dict[str, str | int] = {
-        "hotelIds": ",".join(hotel_ids),
-        "adults": adults,
-        "checkInDate": check_in,
-        "checkOutDate": check_out,
-        "currency": currency,
-    }
-    if best_rate_only:
-        params["bestRateOnly"] = "true"
-
+    cli = get_client()
+    params = _offer_params(
+        hotel_ids, check_in, check_out, adults, currency, best_rate_only
+    )
     payload: Dict = cli.get("/v3/shopping/hotel-offers", params)
     return payload.get("data", [])
 
 
+async def search_hotel_offers_by_ids_async(
+    hotel_ids: List[str],
+    check_in: str,
+    check_out: str,
+    adults: int = 1,
+    currency: str = "USD",
+    best_rate_only: bool = True,
+) -> List[Dict]:
+    """Async twin of search_hotel_offers_by_ids()."""
+    if not hotel_ids:
+        return []
+
+    cli = get_async_client()
+    params = _offer_params(
+        hotel_ids, check_in, check_out, adults, currency, best_rate_only
+    )
+    payload: Dict = await cli.get("/v3/shopping/hotel-offers", params)
+    return payload.get("data", [])
+
+
+def _first_hotel_ids(hotel_list: List[Dict], limit: int) -> List[str]:
+    """Extract and trim hotelIds safely."""
+    ids: List[str] = []
+    for h in hotel_list:
+        hid = h.get("hotelId") or h.get("hotel", {}).get("hotelId")
+        if isinstance(hid, str) and hid:
+            ids.append(hid)
+        if len(ids) >= limit:
+            break
+    return ids
+
+
+def _chunked(ids: List[str], size: int) -> List[List[str]]:
+    size = max(size, 1)
+    return [ids[i : i + size] for i in range(0, len(ids), size)]
+
+
+def iter_hotel_offer_chunks(q: HotelQuery, hotel_ids: List[str]) -> Iterator[List[Dict]]:
+    """
+    Fetch v3 offers for `hotel_ids` in chunks of q.chunk_size, at most
+    q.max_parallel requests at a time, yielding each chunk's offers AS IT ARRIVES.
+
+    A failed chunk is logged and skipped: it only drops its own hotels.
+    """
+    chunks = _chunked(hotel_ids, q.chunk_size)
+    if not chunks:
+        return
+    workers = max(1, min(q.max_parallel, len(chunks)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="hotel-offers") as pool:
+        futures = {
+            pool.submit(
+                search_hotel_offers_by_ids,
+                hotel_ids=chunk,
+                check_in=q.check_in,
+                check_out=q.check_out,
+                adults=q.adults,
+                currency=q.currency,
+                best_rate_only=True,
+            ): chunk
+            for chunk in chunks
+        }
+        for fut in as_completed(futures):
+            try:
+                yield fut.result()
+            except Exception as e:
+                print(f"Hotel offers chunk failed ({len(futures[fut])} hotels):", e)
+
+
+def hotel_query_key(q: HotelQuery) -> str:
+    """Offer-cache key: the search itself, not how it is chunked/parallelized."""
+    return make_key(
+        "hotel-offers",
+        q.city_code.strip().upper(),
+        q.check_in,
+        q.check_out,
+        q.adults,
+        q.currency.strip().upper(),
+        q.max_hotels,
+    )
+
+
+def hotel_offers_cache_stats() -> Dict[str, Any]:
+    """Hit/stale/refresh metrics of the hotel offers cache."""
+    return _HOTEL_OFFERS_CACHE.stats()
+
+
+class _IncompleteOffers(Exception):
+    """A background refresh lost a chunk: keep the previous cached answer."""
+
+
+def _fetch_all_offers(q: HotelQuery) -> List[Dict]:
+    """Every offer for q, or _IncompleteOffers (used by background refreshes)."""
+    ids = _first_hotel_ids(list_hotels_by_city(q.city_code), q.max_hotels)
+    expected = len(_chunked(ids, q.chunk_size))
+    chunks = list(iter_hotel_offer_chunks(q, ids))
+    if len(chunks) < expected:
+        raise _IncompleteOffers(f"{expected - len(chunks)} of {expected} chunks failed")
+    return [o for chunk in chunks for o in chunk]
+
+
+def _cached_offers(q: HotelQuery, key: str) -> Optional[Tuple[List[Dict], float]]:
+    """(offers, age_s) from the offers cache, scheduling a refresh when due."""
+    hit = _HOTEL_OFFERS_CACHE.lookup(key)
+    if hit is None:
+        return None
+    offers, age, needs_refresh = hit
+    if needs_refresh:
+        _HOTEL_OFFERS_CACHE.refresh_in_background(key, lambda: _fetch_all_offers(q))
+    return offers, age
+
+
+def _iter_offer_chunks_with_age(
+    q: HotelQuery, hotel_list: List[Dict]
+) -> Iterator[Tuple[List[Dict], float]]:
+    """
+    (offers, age_s) chunks for q: one chunk from the cache, else the live
+    chunks as they arrive (age 0.0), caching the answer if none failed.
+    """
+    key = hotel_query_key(q)
+    cached = _cached_offers(q, key)
+    if cached is not None:
+        yield cached
+        return
+
+    ids = _first_hotel_ids(hotel_list, q.max_hotels)
+    expected = len(_chunked(ids, q.chunk_size))
+    offers: List[Dict] = []
+    received = 0
+    for chunk_offers in iter_hotel_offer_chunks(q, ids):
+        received += 1
+        offers.extend(chunk_offers)
+        yield chunk_offers, 0.0
+    if received == expected:
+        _HOTEL_OFFERS_CACHE.put(key, offers)
+
+
 def search_hotels(q: HotelQuery) -> Tuple[List[Dict], List[Dict]]:
     """
     High-level convenience:
       1) Get hotels for the city (Hotel List)
       2) Pick the first N hotelIds (q.max_hotels)
-      3) Fetch offers for those IDs (Hotel Search v3)
+      3) Fetch offers for those IDs (Hotel Search v3), in parallel chunks
+         (or answer from the offers cache, see the module docstring)
 
     Returns:
       (offers, hotel_list)  -> both lists of dicts
       - offers: v3 items, each with "hotel" and "offers"[] (dynamic/availability)
-      - hotel_list: list API items (static name/address/geo you can use to enrich)
+      - hotel_list: compact list API records (static name/address/geo you can
+        use to enrich; catalogue_index(q.city_code, hotel_list) is prebuilt)
     """
+    offers, hotel_list, _age = search_hotels_with_age(q)
+    return offers, hotel_list
+
+
+def search_hotels_with_age(q: HotelQuery) -> Tuple[List[Dict], List[Dict], float]:
+    """search_hotels() plus the age in seconds of the offers (0.0 = just fetched)."""
     hotel_list: List[Dict] = list_hotels_by_city(q.city_code)
 
-    # Extract and trim hotelIds safely
-    ids: List[str] = []
-    for h in hotel_list:
-        hid = h.get("hotelId") or h.get("hotel", {}).get("hotelId")
-        if isinstance(hid, str) and hid:
-            ids.append(hid)
-        if len(ids) >= q.max_hotels:
-            break
+    offers: List[Dict] = []
+    age = 0.0
+    for chunk_offers, age in _iter_offer_chunks_with_age(q, hotel_list):
+        offers.extend(chunk_offers)
+    return offers, hotel_list, age
 
-    offers: List[Dict] = search_hotel_offers_by_ids(
-        hotel_ids=ids,
-        check_in=q.check_in,
-        check_out=q.check_out,
-        adults=q.adults,
-        currency=q.currency,
-        best_rate_only=True,
-    )
+
+async def _aiter_hotel_offer_chunks(
+    q: HotelQuery, hotel_ids: List[str]
+) -> AsyncIterator[List[Dict]]:
+    """Async twin of iter_hotel_offer_chunks() (semaphore instead of a pool)."""
+    gate = asyncio.Semaphore(max(q.max_parallel, 1))
+
+    async def fetch(chunk: List[str]) -> Optional[List[Dict]]:
+        async with gate:
+            try:
+                return await search_hotel_offers_by_ids_async(
+                    hotel_ids=chunk,
+                    check_in=q.check_in,
+                    check_out=q.check_out,
+                    adults=q.adults,
+                    currency=q.currency,
+                    best_rate_only=True,
+                )
+            except Exception as e:
+                print(f"Hotel offers chunk failed ({len(chunk)} hotels):", e)
+                return None
+
+    for done in asyncio.as_completed([fetch(c) for c in _chunked(hotel_ids, q.chunk_size)]):
+        chunk_offers = await done
+        if chunk_offers is not None:  # failed chunks are skipped, like the sync twin
+            yield chunk_offers
+
+
+async def _aiter_offer_chunks_with_age(
+    q: HotelQuery, hotel_list: List[Dict]
+) -> AsyncIterator[Tuple[List[Dict], float]]:
+    """Async twin of _iter_offer_chunks_with_age()."""
+    key = hotel_query_key(q)
+    cached = _cached_offers(q, key)
+    if cached is not None:
+        yield cached
+        return
+
+    ids = _first_hotel_ids(hotel_list, q.max_hotels)
+    expected = len(_chunked(ids, q.chunk_size))
+    offers: List[Dict] = []
+    received = 0
+    async for chunk_offers in _aiter_hotel_offer_chunks(q, ids):
+        received += 1
+        offers.extend(chunk_offers)
+        yield chunk_offers, 0.0
+    if received == expected:
+        _HOTEL_OFFERS_CACHE.put(key, offers)
+
+
+async def search_hotels_async(q: HotelQuery) -> Tuple[List[Dict], List[Dict]]:
+    """Async twin of search_hotels(); returns (offers, hotel_list)."""
+    hotel_list: List[Dict] = await list_hotels_by_city_async(q.city_code)
+
+    offers: List[Dict] = []
+    async for chunk_offers, _age in _aiter_offer_chunks_with_age(q, hotel_list):
+        offers.extend(chunk_offers)
     return offers, hotel_list
+
+
+def iter_hotel_summaries(q: HotelQuery) -> Iterator[List[Dict]]:
+    """
+    Streaming version of search_hotels() + summarize_hotels_offers().
+
+    Yields one batch of enriched summaries per offer chunk, in arrival order
+    (each batch sorted cheapest first). Empty/failed chunks yield nothing.
+    A cached answer arrives as a single batch.
+    """
+    for batch, _age in iter_hotel_summaries_with_age(q):
+        yield batch
+
+
+def iter_hotel_summaries_with_age(q: HotelQuery) -> Iterator[Tuple[List[Dict], float]]:
+    """iter_hotel_summaries() yielding (batch, age_s of the offers) pairs."""
+    catalogue = get_city_catalogue(q.city_code)
+    for chunk_offers, age in _iter_offer_chunks_with_age(q, catalogue.hotels):
+        if chunk_offers:
+            yield summarize_hotels_offers(chunk_offers, list_index=catalogue.index), age
+
+
+async def aiter_hotel_summaries(q: HotelQuery) -> AsyncIterator[List[Dict]]:
+    """Async twin of iter_hotel_summaries()."""
+    catalogue = await get_city_catalogue_async(q.city_code)
+    async for chunk_offers, _age in _aiter_offer_chunks_with_age(q, catalogue.hotels):
+        if chunk_offers:
+            yield summarize_hotels_offers(chunk_offers, list_index=catalogue.index)
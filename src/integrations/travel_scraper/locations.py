@@ -0,0 +1,200 @@
+"""
+locations.py
+------------
+Offline IATA location index used by reference.city_to_codes().
+
+Answers "Rome" / "roma" / "ROM" / "FCO" -> {"city": "ROM", "airport": "FCO"}
+from memory (dict lookups, microseconds), so only true misses go to the
+Amadeus /v1/reference-data/locations API.
+
+What it knows:
+  - city (metro) codes and their airports, primary airport first (LON -> LHR...)
+  - city names + aliases ("Roma", "Bombay"), accent/case-insensitive
+  - airport -> city mapping (FCO -> ROM)
+  - prefix matching ("Barcel" -> BCN) and fuzzy matching ("Barcelonna")
+    for inputs of 4+ characters only, so short names like "Bar" never get
+    misrouted to Barcelona/Bari
+
+Data:
+  - bundled snapshot: data/locations.json
+  - learned entries (API misses written back): <cache dir>/locations_learned.json
+"""
+
+from __future__ import annotations
+
+import bisect
+import difflib
+import json
+import os
+import threading
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.cache import default_cache_dir
+
+SNAPSHOT_PATH = Path(__file__).resolve().parent / "data" / "locations.json"
+
+# (city code, primary airport code)
+_Entry = Tuple[str, str]
+
+
+def normalize_name(s: str) -> str:
+    """Case/accent/whitespace-insensitive form: " São  Paulo" -> "sao paulo"."""
+    s = unicodedata.normalize("NFKD", s)
+    s = "".join(ch for ch in s if not unicodedata.combining(ch))
+    return " ".join(s.casefold().replace(".", " ").split())
+
+
+class LocationIndex:
+    """
+    In-memory name/code index. Entries are small (city, airport) tuples shared
+    between every name and code that points at them.
+    """
+
+    MIN_FUZZY_LEN = 4
+
+    def __init__(
+        self,
+        snapshot: Optional[Path] = SNAPSHOT_PATH,
+        learned_path: Optional[Path] = None,
+    ):
+        self._lock = threading.Lock()
+        self._by_name: Dict[str, _Entry] = {}
+        self._by_code: Dict[str, _Entry] = {}
+        self._sorted_names: List[str] = []
+        self._learned_path = Path(learned_path) if learned_path else None
+        self._learned: Dict[str, Dict[str, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+        if snapshot is not None:
+            for row in json.loads(Path(snapshot).read_text(encoding="utf-8")):
+                self.add(row["city"], row["airports"], [row["name"], *row["aliases"]])
+        if self._learned_path and self._learned_path.exists():
+            try:
+                self._learned = json.loads(self._learned_path.read_text("utf-8"))
+            except (OSError, ValueError):
+                self._learned = {}
+            for name, codes in self._learned.items():
+                self.add(codes["city"], [codes["airport"]], [name])
+
+    # -- building ------------------------------------------------------------
+    def add(self, city: str, airports: List[str], names: List[str]) -> None:
+        """Register a city code, its airports (primary first) and its names."""
+        city = city.upper()
+        airports = [a.upper() for a in airports if a] or [city]
+        entry: _Entry = self._by_code.get(city) or (city, airports[0])
+        with self._lock:
+            self._by_code.setdefault(city, entry)
+            for a in airports:
+                self._by_code.setdefault(a, (city, a))
+            for n in names:
+                key = normalize_name(n)
+                if key and key not in self._by_name:
+                    self._by_name[key] = entry
+                    bisect.insort(self._sorted_names, key)
+
+    def learn(self, query: str, codes: Dict[str, str]) -> None:
+        """Write back an API answer so the next lookup for `query` is offline."""
+        if not codes.get("city"):
+            return
+        self.add(codes["city"], [codes.get("airport") or codes["city"]], [query])
+        if self._learned_path is None:
+            return
+        with self._lock:
+            self._learned[query] = {
+                "city": codes["city"],
+                "airport": codes.get("airport") or codes["city"],
+            }
+            self._learned_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self._learned_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._learned, ensure_ascii=False), "utf-8")
+            os.replace(tmp, self._learned_path)
+
+    # -- lookups -------------------------------------------------------------
+    def _match(self, query: str, exact: bool = False) -> Optional[_Entry]:
+        raw = query.strip()
+        key = normalize_name(raw)
+        if not key:
+            return None
+
+        # 1) exact name / alias
+        hit = self._by_name.get(key)
+        if hit:
+            return hit
+
+        # 2) IATA city or airport code
+        if len(raw) == 3 and raw.isalpha():
+            hit = self._by_code.get(raw.upper())
+            if hit:
+                return hit
+
+        if exact or len(key) < self.MIN_FUZZY_LEN:
+            return None
+
+        # add()/learn() may run concurrently: scan the sorted names and copy the
+        # name list under the lock, then do the (slow) fuzzy match outside it
+        with self._lock:
+            # 3) prefix: shortest known name starting with the query
+            names = self._sorted_names
+            i = bisect.bisect_left(names, key)
+            candidates = []
+            while i < len(names) and names[i].startswith(key):
+                candidates.append(names[i])
+                i += 1
+            if candidates:
+                return self._by_name[min(candidates, key=len)]
+            known = list(names)
+
+        # 4) fuzzy (typos)
+        close = difflib.get_close_matches(key, known, n=1, cutoff=0.85)
+        return self._by_name[close[0]] if close else None
+
+    def resolve(self, query: str) -> Optional[Dict[str, str]]:
+        """{"city", "airport"} for `query`, or None when the index can't tell."""
+        hit = self._match(query)
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not hit:
+            return None
+        return {"city": hit[0], "airport": hit[1]}
+
+    def peek(self, query: str, exact: bool = False) -> Optional[Dict[str, str]]:
+        """
+        resolve() without touching the hit/miss counters, for probing words of
+        free text; exact=True skips prefix/fuzzy matching.
+        """
+        hit = self._match(query, exact=exact)
+        return {"city": hit[0], "airport": hit[1]} if hit else None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "names": len(self._by_name),
+            "codes": len(self._by_code),
+        }
+
+
+_INDEX: Optional[LocationIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_location_index() -> LocationIndex:
+    """
+    Process-wide index, loaded lazily on first use. Learned entries persist to
+    LOCATIONS_LEARNED_PATH (default: <cache dir>/locations_learned.json).
+    """
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                learned = os.getenv("LOCATIONS_LEARNED_PATH") or (
+                    default_cache_dir() / "locations_learned.json"
+                )
+                _INDEX = LocationIndex(learned_path=Path(learned))
+    return _INDEX
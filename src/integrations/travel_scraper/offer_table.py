@@ -0,0 +1,309 @@
+"""
+offer_table.py
+--------------
+Columnar view of Amadeus Flight Offers for filtering and ranking.
+
+parsing.py walks the nested offer dicts every time it needs a field (and
+re-parses "grandTotal" strings on every sort). FlightOfferTable flattens a
+batch ONCE into typed NumPy columns, so filter / sort / top-K / dedupe are
+array operations, then converts the surviving rows back to the usual
+summary dicts (parsing.summarize_offer_airports_and_carriers format).
+
+Columns (one row per offer, outbound leg unless stated):
+  - price        float64         grandTotal (nan when missing)
+  - currency     object (str)
+  - stops        int16           max connections over all legs (-1 unknown)
+  - depart       datetime64[m]   first departure (local time, NaT unknown)
+  - arrive       datetime64[m]   final arrival
+  - duration_min float64         itinerary duration in minutes (nan unknown)
+  - origin       object (str)    outbound departure airport
+  - destination  object (str)    outbound arrival airport
+  - carriers     object (tuple)  carrier codes over all legs, in order
+                                 (operating carrier preferred, like parsing.py)
+
+Marketing carrier codes (segment "carrierCode") are kept alongside for
+only_carriers / exclude_carriers, which must agree with Amadeus'
+included/excludedAirlineCodes: those filter on the marketing carrier, so a
+codeshare returned for an included airline is kept even when another airline
+operates it, and one sold by an excluded airline is dropped.
+
+Usage:
+    table = FlightOfferTable.from_offers(raw_offers)
+    best = table.filter(max_price=800, max_stops=1).dedupe().top_k(10)
+    summaries = best.to_summaries()
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .parsing import _carrier_codes_for_leg, get_total_price, summarize_offers_in_order
+
+_ISO_DURATION = re.compile(r"^P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?)?$")
+
+
+def _duration_minutes(value: Optional[str]) -> float:
+    """'PT7H30M' / 'P1DT2H' -> minutes; nan when missing or malformed."""
+    m = _ISO_DURATION.match(value or "")
+    if not m or not any(m.groups()):
+        return float("nan")
+    d, h, mins = (int(g or 0) for g in m.groups())
+    return float(d * 1440 + h * 60 + mins)
+
+
+def _timestamp(value: Optional[str]) -> np.datetime64:
+    try:
+        return np.datetime64(value, "m") if value else np.datetime64("NaT", "m")
+    except ValueError:
+        return np.datetime64("NaT", "m")
+
+
+def _object_array(values: Sequence[Any]) -> np.ndarray:
+    # np.array() would try to broadcast tuples into a 2-D array
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = list(values)
+    return arr
+
+
+class FlightOfferTable:
+    """
+    Immutable columnar batch of flight offers. Every operation returns a NEW
+    table (row subset / order) sharing the same raw offer dicts.
+    """
+
+    COLUMNS = (
+        "price",
+        "currency",
+        "stops",
+        "depart",
+        "arrive",
+        "duration_min",
+        "origin",
+        "destination",
+        "carriers",
+    )
+
+    def __init__(
+        self,
+        offers: np.ndarray,
+        columns: Dict[str, np.ndarray],
+        carrier_vocab: Dict[str, int],
+        carrier_matrix: np.ndarray,
+        marketing_matrix: Optional[np.ndarray] = None,
+    ):
+        self.offers = offers  # object array of raw offer dicts
+        self.columns = columns
+        # Row x carrier membership, so carrier filters are vectorized too
+        self._carrier_vocab = carrier_vocab
+        self._carrier_matrix = carrier_matrix
+        # Same vocab, marketing carriers instead of (operating-preferred) carriers
+        self._marketing_matrix = (
+            carrier_matrix if marketing_matrix is None else marketing_matrix
+        )
+
+    # -- construction --------------------------------------------------------
+    @classmethod
+    def from_offers(cls, offers: Iterable[Dict]) -> "FlightOfferTable":
+        """Flatten raw Amadeus offers (one pass over the nested dicts)."""
+        offers = list(offers)
+        n = len(offers)
+        price = np.full(n, np.nan)
+        stops = np.full(n, -1, dtype=np.int16)
+        depart = np.full(n, np.datetime64("NaT", "m"))
+        arrive = np.full(n, np.datetime64("NaT", "m"))
+        duration = np.full(n, np.nan)
+        currency: List[Optional[str]] = [None] * n
+        origin: List[Optional[str]] = [None] * n
+        destination: List[Optional[str]] = [None] * n
+        carriers: List[tuple] = [()] * n
+        marketing: List[tuple] = [()] * n
+        vocab: Dict[str, int] = {}
+
+        for i, o in enumerate(offers):
+            total = get_total_price(o)
+            if total is not None:
+                price[i] = total
+            currency[i] = (o.get("price") or {}).get("currency")
+
+            itins = o.get("itineraries") or []
+            legs = [it.get("segments") or [] for it in itins]
+            if legs and all(legs):
+                stops[i] = max(len(segs) - 1 for segs in legs)
+            if legs and legs[0]:
+                first, last = legs[0][0], legs[0][-1]
+                depart[i] = _timestamp((first.get("departure") or {}).get("at"))
+                arrive[i] = _timestamp((last.get("arrival") or {}).get("at"))
+                origin[i] = (first.get("departure") or {}).get("iataCode")
+                destination[i] = (last.get("arrival") or {}).get("iataCode")
+                duration[i] = _duration_minutes(itins[0].get("duration"))
+
+            codes = tuple(
+                dict.fromkeys(
+                    c for leg in range(len(itins)) for c in _carrier_codes_for_leg(o, leg)
+                )
+            )
+            carriers[i] = codes
+            marketing[i] = tuple(
+                dict.fromkeys(
+                    seg.get("carrierCode")
+                    for segs in legs
+                    for seg in segs
+                    if seg.get("carrierCode")
+                )
+            )
+            for c in codes + marketing[i]:
+                vocab.setdefault(c, len(vocab))
+
+        matrix = np.zeros((n, len(vocab)), dtype=bool)
+        marketing_matrix = np.zeros((n, len(vocab)), dtype=bool)
+        for i, codes in enumerate(carriers):
+            matrix[i, [vocab[c] for c in codes]] = True
+            marketing_matrix[i, [vocab[c] for c in marketing[i]]] = True
+
+        columns = {
+            "price": price,
+            "currency": _object_array(currency),
+            "stops": stops,
+            "depart": depart,
+            "arrive": arrive,
+            "duration_min": duration,
+            "origin": _object_array(origin),
+            "destination": _object_array(destination),
+            "carriers": _object_array(carriers),
+        }
+        return cls(_object_array(offers), columns, vocab, matrix, marketing_matrix)
+
+    def _take(self, rows: np.ndarray) -> "FlightOfferTable":
+        return FlightOfferTable(
+            self.offers[rows],
+            {k: v[rows] for k, v in self.columns.items()},
+            self._carrier_vocab,
+            self._carrier_matrix[rows],
+            self._marketing_matrix[rows],
+        )
+
+    # -- access --------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.offers)
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        return self.columns[column]
+
+    def to_offers(self) -> List[Dict]:
+        """Raw offer dicts, in table order."""
+        return list(self.offers)
+
+    # -- vectorized operations -----------------------------------------------
+    def _carrier_mask(self, codes: Iterable[str], marketing: bool = False) -> np.ndarray:
+        wanted = {c.upper() for c in codes}
+        cols = [i for c, i in self._carrier_vocab.items() if c in wanted]
+        if not cols:
+            return np.zeros(len(self), dtype=bool)
+        matrix = self._marketing_matrix if marketing else self._carrier_matrix
+        return matrix[:, cols].any(axis=1)
+
+    def filter(
+        self,
+        max_price: Optional[float] = None,
+        max_stops: Optional[int] = None,
+        max_duration_min: Optional[float] = None,
+        include_carriers: Optional[Iterable[str]] = None,
+        only_carriers: Optional[Iterable[str]] = None,
+        exclude_carriers: Optional[Iterable[str]] = None,
+        currency: Optional[str] = None,
+        keep_unknown: bool = False,
+    ) -> "FlightOfferTable":
+        """
+        Rows matching ALL given conditions. Unknown values (nan price, -1 stops,
+        nan duration) fail a condition on that column unless keep_unknown=True.
+
+        include_carriers: keep offers flown by ANY of these carriers
+        only_carriers:    keep offers flown ONLY by these carriers, either as
+                          operating or (codeshares) as marketing carriers
+        exclude_carriers: drop offers touching ANY of these carriers, as operating
+                          or marketing carrier (like excludedAirlineCodes)
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if max_price is not None:
+            price = self.columns["price"]
+            mask &= (price <= max_price) | (keep_unknown & np.isnan(price))
+        if max_stops is not None:
+            stops = self.columns["stops"]
+            mask &= ((stops >= 0) | keep_unknown) & (stops <= max_stops)
+        if max_duration_min is not None:
+            dur = self.columns["duration_min"]
+            mask &= (dur <= max_duration_min) | (keep_unknown & np.isnan(dur))
+        if include_carriers:
+            mask &= self._carrier_mask(include_carriers)
+        if only_carriers:
+            allowed = {c.upper() for c in only_carriers}
+            others = [c for c in self._carrier_vocab if c not in allowed]
+            mask &= ~self._carrier_mask(others) | ~self._carrier_mask(others, marketing=True)
+        if exclude_carriers:
+            mask &= ~self._carrier_mask(exclude_carriers)
+            mask &= ~self._carrier_mask(exclude_carriers, marketing=True)
+        if currency:
+            mask &= self.columns["currency"] == currency.upper()
+        return self._take(np.flatnonzero(mask))
+
+    def _order(self, by: str, descending: bool) -> np.ndarray:
+        """Stable row order by a numeric/time column; nan/NaT always last."""
+        col = self.columns[by]
+        kind = col.dtype.kind
+        if kind == "M":
+            missing, keys = np.isnat(col), col.view(np.int64)
+        elif kind == "f":
+            missing, keys = np.isnan(col), col
+        elif kind in "iu":
+            missing, keys = np.zeros(len(col), dtype=bool), col
+        else:
+            raise ValueError(f"cannot sort by non-numeric column {by!r}")
+        if descending:
+            keys = -keys
+        return np.lexsort((keys, missing))  # last key is the primary one
+
+    def sort_by(self, by: str = "price", descending: bool = False) -> "FlightOfferTable":
+        return self._take(self._order(by, descending))
+
+    def top_k(self, k: int, by: str = "price") -> "FlightOfferTable":
+        """The k smallest rows by `by` (cheapest first by default), sorted."""
+        if k <= 0:
+            return self._take(np.array([], dtype=np.intp))
+        if k >= len(self):
+            return self.sort_by(by)
+        col = self.columns[by]
+        if col.dtype.kind == "f" and not np.isnan(col).any():
+            # O(n) partition, then sort only the k winners (stable on ties is
+            # not guaranteed by argpartition, so re-sort with the row index)
+            part = np.argpartition(col, k - 1)[:k]
+            return self._take(part[np.lexsort((part, col[part]))])
+        return self._take(self._order(by, False)[:k])
+
+    def dedupe(self) -> "FlightOfferTable":
+        """
+        Drop offers that repeat the same itinerary (airports, times, stops and
+        carriers) at a higher price; the cheapest copy of each is kept and the
+        table order is otherwise preserved.
+        """
+        if len(self) < 2:
+            return self
+        cols = ("origin", "destination", "depart", "arrive", "stops", "carriers")
+        keys = np.array([repr(k) for k in zip(*(self.columns[c] for c in cols))])
+        _, codes = np.unique(keys, return_inverse=True)
+        by_price = self._order("price", False)
+        _, first = np.unique(codes[by_price], return_index=True)
+        keep = np.sort(by_price[first])  # back to the current table order
+        return self._take(keep)
+
+    # -- output --------------------------------------------------------------
+    def to_summaries(
+        self, names_map: Optional[Dict[str, str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Rows in table order as summarize_offer_airports_and_carriers() dicts
+        (airline names resolved with one batched lookup unless `names_map`).
+        """
+        return summarize_offers_in_order(self.to_offers(), names_map)
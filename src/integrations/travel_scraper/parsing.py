@@ -307,12 +307,17 @@ def summarize_offers_airports(offers: List[Dict]) -> List[Dict[str, Any]]:
     return [summarize_offer_airports(o) for o in sorted_offers]
 
 
-def summarize_offer_airports_and_carriers(offer: Dict) -> Dict[str, Any]:
+def summarize_offer_airports_and_carriers(
+    offer: Dict, names_map: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
     """
     Airport summary + carriers (codes and resolved names) per leg.
 
     Requires airlines.map_airline_codes_to_names() to resolve names. If that
     import failed, names will be "Unknown Airline" via fallback.
+
+    Pass `names_map` ({code: name}) when names were already resolved for a batch;
+    the function then makes no lookups at all.
     """
     outbound = _leg_airport_times(offer, 0)
     inbound = _leg_airport_times(offer, 1)
@@ -320,8 +325,9 @@ def summarize_offer_airports_and_carriers(offer: Dict) -> Dict[str, Any]:
     out_codes = _carrier_codes_for_leg(offer, 0)
     in_codes = _carrier_codes_for_leg(offer, 1) if inbound["from_airport"] else []
 
-    # Lookup airline names in one batch call (dedup codes first)
-    names_map = map_airline_codes_to_names(list({*out_codes, *in_codes}))
+    if names_map is None:
+        # Lookup airline names in one batch call (dedup codes first)
+        names_map = map_airline_codes_to_names(list({*out_codes, *in_codes}))
 
     def with_names(codes: List[str]) -> List[str]:
         # always returns something (e.g., "XX — Unknown Airline") if lookup fails
@@ -349,9 +355,29 @@ def summarize_offer_airports_and_carriers(offer: Dict) -> Dict[str, Any]:
     }
 
 
+def summarize_offers_in_order(
+    offers: List[Dict], names_map: Optional[Dict[str, str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    summarize_offer_airports_and_carriers() for every offer, keeping the given
+    order. Two passes so airline names cost ONE (chunked) lookup per batch
+    instead of one per offer:
+      1) collect carrier codes from every offer and resolve them together
+      2) build the summaries (pure, no network)
+    """
+    if names_map is None:
+        all_codes = [
+            code for o in offers for leg in (0, 1) for code in _carrier_codes_for_leg(o, leg)
+        ]
+        names_map = map_airline_codes_to_names(all_codes)
+    return [summarize_offer_airports_and_carriers(o, names_map) for o in offers]
+
+
 def summarize_offers_airports_and_carriers(offers: List[Dict]) -> List[Dict[str, Any]]:
     """
-    Batch version of the above; sorts by numeric price for stable display.
+    Batch version of the above; sorts by numeric price for stable display and
+    resolves airline names once for the whole batch (summarize_offers_in_order).
+    For filtering/ranking big batches see offer_table.FlightOfferTable.
     """
 
     def price_as_float(o: Dict) -> float:
@@ -360,5 +386,4 @@ def summarize_offers_airports_and_carriers(offers: List[Dict]) -> List[Dict[str,
         except Exception:
             return float("inf")
 
-    offers_sorted = sorted(offers, key=price_as_float)
-    return [summarize_offer_airports_and_carriers(o) for o in offers_sorted]
+    return summarize_offers_in_order(sorted(offers, key=price_as_float))
@@ -3,10 +3,14 @@ parsing_hotels.py
 -----------------
 Turn Hotel Search v3 offers into clean summaries, and optionally ENRICH
 them with static fields (name/address/geo) from the Hotel List API response.
+
+CheapestHotels keeps a running cheapest-first top-K while summaries stream in.
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List, Optional
+import heapq
+import itertools
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from datetime import datetime
 
 
@@ -26,25 +30,37 @@ def _nights_between(check_in: str | None, check_out: str | None) -> Optional[int
         return None
 
 
-def _cheapest_offer(hotel_item: Dict) -> Optional[Dict]:
+def _offer_total(offer: Dict) -> Optional[float]:
+    """price.total as float, or None when missing/unparseable."""
     try:
-        offers = hotel_item.get("offers", [])
-        pairs = []
-        for o in offers:
-            total = o.get("price", {}).get("total")
-            if total:
-                try:
-                    pairs.append((float(total), o))
-                except Exception:
-                    pass
-        if not pairs:
-            return None
-        pairs.sort(key=lambda p: p[0])
-        return pairs[0][1]
-    except Exception:
+        total = (offer.get("price") or {}).get("total")
+        return float(total) if total else None
+    except (AttributeError, TypeError, ValueError):
         return None
 
 
+def _cheapest_with_total(hotel_item: Dict) -> Tuple[float, Optional[Dict]]:
+    """
+    (total, offer) of the cheapest priced offer in one pass (linear min, no
+    list/sort); (inf, None) when no offer has a usable price. Ties keep the
+    first offer.
+    """
+    best: Optional[Dict] = None
+    best_total = float("inf")
+    offers = hotel_item.get("offers") or []
+    if not isinstance(offers, list):
+        return best_total, None
+    for o in offers:
+        total = _offer_total(o) if isinstance(o, dict) else None
+        if total is not None and (best is None or total < best_total):
+            best, best_total = o, total
+    return best_total, best
+
+
+def _cheapest_offer(hotel_item: Dict) -> Optional[Dict]:
+    return _cheapest_with_total(hotel_item)[1]
+
+
 # ---------- NEW: build a quick lookup from Hotel List ----------
 def index_hotel_list(hotel_list: List[Dict]) -> Dict[str, Dict]:
     """
@@ -82,13 +98,20 @@ def _geo_from_list_item(item: Dict) -> Optional[Dict]:
 
 
 # ---------- summaries ----------
+_NOT_GIVEN: Any = object()
+
+
 def summarize_hotel_offer(
-    v3_item: Dict, list_index: Dict[str, Dict] | None = None
+    v3_item: Dict,
+    list_index: Dict[str, Dict] | None = None,
+    cheapest: Optional[Dict] = _NOT_GIVEN,
 ) -> Dict[str, Any]:
     """
     v3_item: one element from /v3/shopping/hotel-offers "data" array.
       Expect a "hotel" sub-dict with at least hotelId and (often) name.
       Static details (address/geo) may be missing in v3, so we enrich from Hotel List when provided.
+    cheapest: the item's cheapest offer if the caller already computed it
+      (None means "no priced offer"); omitted -> computed here.
 
     Return: compact dict for UI.
     """
@@ -96,7 +119,7 @@ def summarize_hotel_offer(
     hid = hotel.get("hotelId")
 
     # BEST (cheapest) offer inside this v3 item
-    cheap = _cheapest_offer(v3_item)
+    cheap = _cheapest_offer(v3_item) if cheapest is _NOT_GIVEN else cheapest
 
     # Start with whatever v3 gives us
     out: Dict[str, Any] = {
@@ -134,20 +157,65 @@ def summarize_hotel_offer(
 
 
 def summarize_hotels_offers(
-    v3_items: List[Dict], hotel_list: List[Dict] | None = None
+    v3_items: List[Dict],
+    hotel_list: List[Dict] | None = None,
+    list_index: Dict[str, Dict] | None = None,
 ) -> List[Dict[str, Any]]:
     """
     Map all v3 items to summaries, enriched with Hotel List info when provided.
     Sort by cheapest price if available.
+
+    Pass `list_index` (e.g. hotels.get_city_catalogue(city).index) to reuse a
+    prebuilt index instead of rebuilding one from `hotel_list`.
     """
-    idx = index_hotel_list(hotel_list or [])
+    idx = list_index if list_index is not None else index_hotel_list(hotel_list or [])
 
-    def price_as_float(item: Dict) -> float:
-        o = _cheapest_offer(item)
-        try:
-            return float(o.get("price", {}).get("total")) if o else float("inf")
-        except Exception:
-            return float("inf")
+    # Single pass: each item's cheapest offer is found ONCE, then we
+    # decorate-sort on its total (stable: equal prices keep input order)
+    decorated = [(*_cheapest_with_total(x), x) for x in v3_items]
+    decorated.sort(key=lambda d: d[0])
+    return [summarize_hotel_offer(x, idx, cheapest=o) for _, o, x in decorated]
+
+
+# ---------- incremental top-K ----------
+def summary_price(summary: Dict[str, Any]) -> float:
+    """Cheapest total of a summary as float; inf when unknown (sorts last)."""
+    try:
+        return float((summary.get("cheapest") or {}).get("total"))
+    except (TypeError, ValueError):
+        return float("inf")
+
+
+class CheapestHotels:
+    """
+    Running top-K of hotel summaries, cheapest first.
+
+    Backed by a size-K max-heap (negated price), so each add() is O(log K)
+    no matter how many summaries stream through. k=None keeps everything.
+    """
 
-    v3_sorted = sorted(v3_items, key=price_as_float)
-    return [summarize_hotel_offer(x, idx) for x in v3_sorted]
+    def __init__(self, k: Optional[int] = 10):
+        self.k = k
+        self.seen = 0
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        self._seq = itertools.count()  # tie-breaker: equal prices keep arrival order
+
+    def add(self, summary: Dict[str, Any]) -> None:
+        self.seen += 1
+        # -seq so that, among equal prices, the EARLIEST arrival is kept
+        entry = (-summary_price(summary), -next(self._seq), summary)
+        if self.k is None or len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif self.k > 0:
+            heapq.heappushpop(self._heap, entry)
+
+    def add_all(self, summaries: Iterable[Dict[str, Any]]) -> None:
+        for s in summaries:
+            self.add(s)
+
+    def top(self) -> List[Dict[str, Any]]:
+        """Current top-K, cheapest first."""
+        return [e[2] for e in sorted(self._heap, reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
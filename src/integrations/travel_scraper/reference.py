@@ -1,20 +1,34 @@
+from __future__ import annotations
+
 from typing import Dict, List
-from src.integrations.travel_scraper.amadeus_client import AmadeusClient, AmadeusError
+from src.integrations.travel_scraper.amadeus_client import AmadeusError, get_client
+from src.integrations.travel_scraper.async_client import get_async_client
+from src.integrations.travel_scraper.locations import get_location_index, normalize_name
+from src.utils.singleflight import SingleFlight
+
+# Concurrent lookups of the same (normalized) name share one Locations call
+_IN_FLIGHT = SingleFlight("city-to-codes")
+
+
+def _location_params(keyword: str, limit: int) -> Dict:
+    return {"keyword": keyword, "subType": "CITY,AIRPORT", "page[limit]": limit}
 
 
 def search_airports_and_cities(keyword: str, limit: int = 5) -> List[dict]:
-    cli = AmadeusClient()
-    params = {"keyword": keyword, "subType": "CITY,AIRPORT", "page[limit]": limit}
-    data = cli.get("/v1/reference-data/locations", params)
+    cli = get_client()
+    data = cli.get("/v1/reference-data/locations", _location_params(keyword, limit))
     return data.get("data", [])
 
 
-def city_to_codes(city_or_iata: str) -> Dict[str, str]:
-    s = city_or_iata.upper()
-    if len(s) == 3:  # LHE, KHI,etc
-        return {"city": s, "airport": s}
+async def search_airports_and_cities_async(keyword: str, limit: int = 5) -> List[dict]:
+    cli = get_async_client()
+    data = await cli.get(
+        "/v1/reference-data/locations", _location_params(keyword, limit)
+    )
+    return data.get("data", [])
 
-    items = search_airports_and_cities(city_or_iata, limit=5)
+
+def _codes_from_items(city_or_iata: str, items: List[dict]) -> Dict[str, str]:
     if not items:
         raise AmadeusError(f"No IATA match for '{city_or_iata}'")
 
@@ -29,3 +43,55 @@ def city_to_codes(city_or_iata: str) -> Dict[str, str]:
     # Fallback to top result if one type missing
     code = items[0].get("iataCode")
     return {"city": city_code or code, "airport": airport_code or code}
+
+
+def _offline_codes(city_or_iata: str) -> Dict[str, str] | None:
+    """
+    Answer from the offline LocationIndex when possible. An unknown but explicit
+    code (3 upper-case letters, e.g. "XYZ") is trusted as-is like before;
+    anything else that misses ("Bar", "Timbuktu") goes to the API.
+    """
+    hit = get_location_index().resolve(city_or_iata)
+    if hit:
+        return hit
+    s = city_or_iata.strip()
+    if len(s) == 3 and s.isalpha() and s.isupper():  # LHE, KHI,etc
+        return {"city": s, "airport": s}
+    return None
+
+
+def _lookup_codes(city_or_iata: str) -> Dict[str, str]:
+    items = search_airports_and_cities(city_or_iata, limit=5)
+    codes = _codes_from_items(city_or_iata, items)
+    get_location_index().learn(city_or_iata, codes)  # next time: offline
+    return codes
+
+
+async def _lookup_codes_async(city_or_iata: str) -> Dict[str, str]:
+    items = await search_airports_and_cities_async(city_or_iata, limit=5)
+    codes = _codes_from_items(city_or_iata, items)
+    get_location_index().learn(city_or_iata, codes)
+    return codes
+
+
+def city_to_codes(city_or_iata: str) -> Dict[str, str]:
+    codes = _offline_codes(city_or_iata)
+    if codes:
+        return codes
+    # "Rome", "rome " etc. arriving together share one API call; copy the
+    # shared dict so callers can't mutate each other's answer
+    key = normalize_name(city_or_iata)
+    return dict(_IN_FLIGHT.do(key, _lookup_codes, city_or_iata))
+
+
+async def city_to_codes_async(city_or_iata: str) -> Dict[str, str]:
+    codes = _offline_codes(city_or_iata)
+    if codes:
+        return codes
+    key = normalize_name(city_or_iata)
+    return dict(await _IN_FLIGHT.do_async(key, _lookup_codes_async, city_or_iata))
+
+
+def coalesced_lookups() -> int:
+    """How many city_to_codes() API lookups piggybacked on an identical one."""
+    return _IN_FLIGHT.coalesced
@@ -0,0 +1,333 @@
+# trip_extractor.py
+"""
+Rule-based (model-free) extraction of a trip request from free text.
+
+DestinationParserAgent runs this before asking the LLM. Typical requests are
+formulaic ("visit Tokyo from September 12th to September 17th, budget around
+$2000, interested in anime and traditional food"), so plain rules get them
+right in well under a millisecond:
+
+  - places:       words after "to / visit / in / from" looked up in the offline
+                  IATA LocationIndex (names, aliases, codes); "from X" is the origin
+  - dates:        "September 12th", "12 Sept 2025", "2025-09-12", "9/12/2025" and
+                  ranges ("Sep 12-17") parsed with dateutil; a date without a
+                  year is the next such day on/after today; "for 5 days" gives
+                  the end date when only the start is known
+  - budget:       "$2,000", "1.5k EUR", "2000 euros", "budget of 1800"
+  - preferences:  the list after "interested in / love / enjoy / into ...",
+                  plus known keywords (museums, beaches, nightlife, ...)
+
+Every field adds to a confidence score (destination and both dates weigh the
+most; an ambiguous destination or implausible dates cost some). Callers use
+the LLM only when the score is below their threshold.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from dateutil import parser as date_parser
+
+from src.integrations.travel_scraper.locations import get_location_index
+
+# Confidence each field contributes (sums to 1.0)
+WEIGHTS = {
+    "destination": 0.4,
+    "start_date": 0.25,
+    "end_date": 0.25,
+    "budget": 0.05,
+    "preferences": 0.05,
+}
+AMBIGUITY_PENALTY = 0.3  # several different cities after "to / visit / in"
+# Dates that parse but make no sense for a trip (start in the past, end before
+# start, longer than MAX_TRIP_DAYS) cost enough to always go to the LLM
+IMPLAUSIBLE_PENALTY = 0.5
+MAX_TRIP_DAYS = 60
+
+_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY", "₹": "INR"}
+_CURRENCY_WORDS = {
+    "usd": "USD", "dollar": "USD", "dollars": "USD", "bucks": "USD",
+    "eur": "EUR", "euro": "EUR", "euros": "EUR",
+    "gbp": "GBP", "pound": "GBP", "pounds": "GBP",
+    "jpy": "JPY", "yen": "JPY",
+    "inr": "INR", "rupee": "INR", "rupees": "INR",
+    "cad": "CAD", "aud": "AUD", "chf": "CHF", "pkr": "PKR",
+}  # fmt: skip
+_CURRENCY_ALT = "|".join(sorted(_CURRENCY_WORDS, key=len, reverse=True))
+
+_MONTH = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|"
+    r"aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_DAY = r"\d{1,2}(?:st|nd|rd|th)?"
+# "Sep 3, 2025" but not "Sep 3-9, 1500 euros": a year is 19xx/20xx and is not
+# followed by a currency / "k" (then it is an amount)
+_YEAR = (
+    rf"(?:,?\s+(?:19|20)\d\d\b(?!\s*(?:[$€£¥₹]|k\b|(?:{_CURRENCY_ALT})\b)))?"
+)
+_TO = r"\s*(?:-|–|to|until|through|till)\s*"
+
+_DATE_RE = re.compile(
+    "|".join(
+        [
+            # ranges within one month: "September 12-17", "12 to 17 Sep 2025"
+            rf"(?P<mrange>(?P<m1>{_MONTH})\s+(?P<d1>{_DAY}){_TO}(?P<d2>{_DAY})\b(?P<y1>{_YEAR}))",
+            rf"(?P<drange>(?P<d3>{_DAY}){_TO}(?P<d4>{_DAY})\s+(?:of\s+)?(?P<m2>{_MONTH})(?P<y2>{_YEAR}))",
+            # single dates
+            r"(?P<iso>\d{4}-\d{1,2}-\d{1,2})",
+            r"(?P<num>\d{1,2}/\d{1,2}/\d{2,4})",
+            rf"(?P<md>{_MONTH}\s+{_DAY}\b{_YEAR})",
+            rf"(?P<dm>{_DAY}\s+(?:of\s+)?{_MONTH}{_YEAR})",
+        ]
+    ),
+    re.IGNORECASE,
+)
+_DURATION_RE = re.compile(r"\bfor\s+(\d{1,2})\s+(days?|nights?)\b", re.IGNORECASE)
+
+_MONTH_WORDS = re.compile(rf"^{_MONTH}$", re.IGNORECASE)
+# lookahead, so overlapping cues are all seen ("to visit Tokyo", "from X to Y")
+_PLACE_RE = re.compile(
+    r"(?=\b(from|to|visit(?:ing)?|in|at)\s+((?:[^\W\d_][\w'.-]*)(?:\s+[^\W\d_][\w'.-]*){0,2}))",
+    re.IGNORECASE,
+)
+
+_AMOUNT = r"(\d[\d,]*(?:\.\d+)?)\s*(k\b)?"
+_BUDGET_RES = [
+    re.compile(rf"([$€£¥₹])\s?{_AMOUNT}", re.IGNORECASE),
+    re.compile(
+        rf"{_AMOUNT}\s*({_CURRENCY_ALT})\b",
+        re.IGNORECASE,
+    ),
+    re.compile(rf"(budget)\D{{0,20}}?{_AMOUNT}", re.IGNORECASE),
+]
+
+_PREF_CLAUSE_RE = re.compile(
+    r"\b(?:interested in|into|love|enjoy|prefer(?:s|ence for)?|focus(?:ed)? on|fan of)"
+    r"\s+(?!to\b)([^.;!?]+)",
+    re.IGNORECASE,
+)
+_PREF_SPLIT_RE = re.compile(r"\s*(?:,|&|\band\b|\bor\b|\bplus\b)\s*", re.IGNORECASE)
+_PREF_ARTICLES = re.compile(r"^(?:the|some|a|an|lots of|a lot of)\s+", re.IGNORECASE)
+# canonical preference -> words that imply it
+PREFERENCE_KEYWORDS = {
+    "history": ["history", "historic", "historical", "ruins"],
+    "museums": ["museum", "museums"],
+    "food": ["food", "foodie", "cuisine", "restaurants", "street food"],
+    "nightlife": ["nightlife", "bars", "clubbing", "clubs"],
+    "beaches": ["beach", "beaches"],
+    "hiking": ["hiking", "hike", "hikes", "trekking"],
+    "shopping": ["shopping", "markets"],
+    "art": ["art", "galleries"],
+    "nature": ["nature", "parks", "wildlife"],
+    "architecture": ["architecture"],
+    "anime": ["anime", "manga"],
+    "music": ["music", "concerts"],
+    "wine": ["wine", "vineyards"],
+    "relaxation": ["relax", "relaxing", "spa"],
+}
+
+
+@dataclass
+class ExtractedTrip:
+    """Result of extract_trip(); fields are None/empty when not found."""
+
+    origin: Optional[str] = None
+    destination: Optional[str] = None
+    start_date: Optional[str] = None  # ISO yyyy-mm-dd
+    end_date: Optional[str] = None
+    budget: Optional[float] = None
+    currency: Optional[str] = None
+    preferences: List[str] = field(default_factory=list)
+    confidence: float = 0.0
+
+    def trip_request(self) -> Dict[str, Any]:
+        """The fields TripRequest knows about."""
+        return {
+            "origin": self.origin,
+            "destination": self.destination,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "budget": self.budget,
+            "preferences": self.preferences or None,
+        }
+
+
+# -----------------------------------------------------------------------------
+# Dates
+# -----------------------------------------------------------------------------
+def _next_year(d: date) -> Optional[date]:
+    """Same day one year later; None for Feb 29 (no such day next year)."""
+    try:
+        return d.replace(year=d.year + 1)
+    except ValueError:
+        return None
+
+
+def _to_date(text: str, today: date) -> Optional[date]:
+    """
+    One date phrase -> date; no explicit year -> next occurrence from today
+    (None for a past Feb 29, whose next occurrence is years away).
+    """
+    try:
+        d = date_parser.parse(text, default=datetime(today.year, 1, 1)).date()
+    except (ValueError, OverflowError):
+        return None
+    if not re.search(r"\d{4}", text) and d < today:
+        return _next_year(d)
+    return d
+
+
+def _find_dates(text: str, today: date) -> List[date]:
+    found: List[Optional[date]] = []
+    for m in _DATE_RE.finditer(text):
+        g = m.groupdict()
+        if g["mrange"]:
+            year = g["y1"] or ""
+            found += [
+                _to_date(f"{g['m1']} {g['d1']}{year}", today),
+                _to_date(f"{g['m1']} {g['d2']}{year}", today),
+            ]
+        elif g["drange"]:
+            year = g["y2"] or ""
+            found += [
+                _to_date(f"{g['d3']} {g['m2']}{year}", today),
+                _to_date(f"{g['d4']} {g['m2']}{year}", today),
+            ]
+        else:
+            found.append(_to_date(m.group(0), today))
+    return [d for d in found if d]
+
+
+def normalize_dates(
+    start: Optional[str], end: Optional[str], today: Optional[date] = None
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    ISO forms of two free-form dates ("September 12th" -> "2025-09-12"), None
+    for any that can't be parsed. An end before the start without an explicit
+    year rolls over to the next year (Dec 28 -> Jan 3); an end that can't roll
+    over (Feb 29) comes back as None.
+    """
+    today = today or date.today()
+    s = _to_date(start, today) if start else None
+    e = _to_date(end, today) if end else None
+    if s and e and e < s and not re.search(r"\d{4}", end):
+        e = _next_year(e)
+    return (s.isoformat() if s else None, e.isoformat() if e else None)
+
+
+def _plausible(start: date, end: Optional[date], today: date) -> bool:
+    if start < today:
+        return False
+    return end is None or 0 <= (end - start).days <= MAX_TRIP_DAYS
+
+
+# -----------------------------------------------------------------------------
+# Places, budget, preferences
+# -----------------------------------------------------------------------------
+def _place(words: str) -> Optional[Tuple[str, str]]:
+    """Longest leading run of `words` the location index knows -> (name, city code)."""
+    index = get_location_index()
+    parts = words.split()
+    for n in range(len(parts), 0, -1):
+        candidate = " ".join(parts[:n]).strip(".,'")
+        if _MONTH_WORDS.match(candidate):
+            return None
+        if len(candidate) == 3 and not candidate.isupper():
+            # "and", "for", "the" are airport codes somewhere; only accept "FCO"
+            codes = index.peek(candidate, exact=True) if candidate.istitle() else None
+        else:
+            # prefix/fuzzy only for Capitalized words, so "anime" never becomes a city
+            codes = index.peek(candidate, exact=not candidate[:1].isupper())
+        if codes:
+            return candidate, codes["city"]
+    return None
+
+
+def _find_budget(text: str) -> Tuple[Optional[float], Optional[str]]:
+    for i, rx in enumerate(_BUDGET_RES):
+        m = rx.search(text)
+        if not m:
+            continue
+        if i == 1:
+            amount, k, cur = m.groups()
+            currency = _CURRENCY_WORDS[cur.lower()]
+        else:
+            cur, amount, k = m.groups()
+            currency = _SYMBOLS.get(cur)
+        value = float(amount.replace(",", ""))
+        return (value * 1000 if k else value), currency
+    return None, None
+
+
+def _find_preferences(text: str) -> List[str]:
+    prefs: List[str] = []
+    for m in _PREF_CLAUSE_RE.finditer(text):
+        for item in _PREF_SPLIT_RE.split(m.group(1)):
+            item = _PREF_ARTICLES.sub("", item.strip()).lower()
+            if item and len(item.split()) <= 4 and item not in prefs:
+                prefs.append(item)
+    # keywords outside such a clause, in the order they appear
+    lowered = text.lower()
+    covered = " ".join(prefs)
+    found = []
+    for pref, words in PREFERENCE_KEYWORDS.items():
+        if pref in prefs or any(re.search(rf"\b{re.escape(w)}\b", covered) for w in words):
+            continue
+        hits = [m.start() for w in words for m in re.finditer(rf"\b{re.escape(w)}\b", lowered)]
+        if hits:
+            found.append((min(hits), pref))
+    return prefs + [pref for _, pref in sorted(found)]
+
+
+# -----------------------------------------------------------------------------
+# Entry point
+# -----------------------------------------------------------------------------
+def extract_trip(text: str, today: Optional[date] = None) -> ExtractedTrip:
+    """Everything the rules can find in `text`, with a 0..1 confidence."""
+    today = today or date.today()
+    trip = ExtractedTrip()
+    if not text or not text.strip():
+        return trip
+
+    destinations: List[Tuple[str, str]] = []
+    for m in _PLACE_RE.finditer(text):
+        hit = _place(m.group(2))
+        if not hit:
+            continue
+        if m.group(1).lower() == "from":
+            trip.origin = trip.origin or hit[0]
+        else:
+            destinations.append(hit)
+    if destinations:
+        trip.destination = destinations[0][0]
+
+    dates = _find_dates(text, today)
+    if dates:
+        start = dates[0]
+        end = dates[1] if len(dates) > 1 else None
+        if end is None:
+            m = _DURATION_RE.search(text)
+            if m:
+                n = int(m.group(1))
+                end = start + timedelta(days=n if m.group(2).lower().startswith("night") else n - 1)
+        elif end < start:
+            # "Dec 28 to Jan 3" crosses a new year; anything else stays implausible
+            rolled = _next_year(end)
+            if rolled and (rolled - start).days <= MAX_TRIP_DAYS:
+                end = rolled
+        trip.start_date = start.isoformat()
+        trip.end_date = end.isoformat() if end else None
+
+    trip.budget, trip.currency = _find_budget(text)
+    trip.preferences = _find_preferences(text)
+
+    score = sum(w for name, w in WEIGHTS.items() if getattr(trip, name))
+    if len({code for _, code in destinations}) > 1:
+        score -= AMBIGUITY_PENALTY
+    if dates and not _plausible(start, end, today):
+        score -= IMPLAUSIBLE_PENALTY
+    trip.confidence = round(max(score, 0.0), 2)
+    return trip
@@ -0,0 +1,401 @@
+"""
+cache.py
+--------
+Small response cache used in front of slow upstream calls (Amadeus, LLMs).
+
+  - ResponseCache: TTL + LRU eviction with an entry cap AND a byte budget,
+    hit/miss metrics, JSON-serialized values (callers get fresh copies).
+  - MemoryBackend: in-process, built on cachetools.LRUCache.
+  - DiskBackend:   SQLite file, survives restarts and is shared by processes.
+  - cache_from_env("FLIGHT", ttl=...) builds one from FLIGHT_CACHE_* env vars.
+
+Entries keep their store time, so "fresh" is decided at read time from the TTL.
+
+Stale-while-revalidate: with max_stale > 0, an entry up to `max_stale` seconds
+past its TTL is still served by lookup()/get_or_refresh(), and a background
+refresh replaces it; with refresh_ahead > 0, entries within that many seconds
+of expiry are refreshed early, so hot keys rarely go stale at all. get() keeps
+its strict "fresh or nothing" meaning.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cachetools import LRUCache
+
+# (stored_at, encoded value)
+Entry = Tuple[float, bytes]
+
+# Background refreshes of every cache share one small pool, created on first use
+_REFRESH_POOL: Optional[ThreadPoolExecutor] = None
+_REFRESH_POOL_LOCK = threading.Lock()
+
+
+def _refresh_pool() -> ThreadPoolExecutor:
+    global _REFRESH_POOL
+    if _REFRESH_POOL is None:
+        with _REFRESH_POOL_LOCK:
+            if _REFRESH_POOL is None:
+                _REFRESH_POOL = ThreadPoolExecutor(
+                    max_workers=4, thread_name_prefix="cache-refresh"
+                )
+    return _REFRESH_POOL
+
+
+def make_key(*parts: Any) -> str:
+    """Stable hash of JSON-serializable parts (dict order does not matter)."""
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def default_cache_dir() -> Path:
+    """TRAVEL_BUDDY_CACHE_DIR, else <repo>/data/cache."""
+    env = os.getenv("TRAVEL_BUDDY_CACHE_DIR")
+    if env:
+        return Path(env)
+    return Path(__file__).resolve().parents[2] / "data" / "cache"
+
+
+class MemoryBackend:
+    """LRU by bytes (cachetools) plus an entry-count cap."""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        self.max_entries = max_entries
+        self._data: LRUCache = LRUCache(
+            maxsize=max_bytes, getsizeof=lambda e: len(e[1]) or 1
+        )
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            return self._data.get(key)
+
+    def put(self, key: str, entry: Entry) -> None:
+        with self._lock:
+            if len(entry[1]) > self._data.maxsize:
+                return  # larger than the whole budget: never cache
+            before = len(self._data) + (0 if key in self._data else 1)
+            self._data[key] = entry
+            self.evictions += max(before - len(self._data), 0)
+            while len(self._data) > self.max_entries:
+                self._data.popitem()
+                self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def size_bytes(self) -> int:
+        return int(self._data.currsize)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DiskBackend:
+    """
+    SQLite-backed store. WAL mode lets several worker processes read/write the
+    same file; eviction is least-recently-accessed once a cap is exceeded.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 4096,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), timeout=10, check_same_thread=False
+        )
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, stored_at REAL, accessed_at REAL,"
+                " size INTEGER, value BLOB)"
+            )
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT stored_at, value FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+            return float(row[0]), bytes(row[1])
+
+    def put(self, key: str, entry: Entry) -> None:
+        stored_at, blob = entry
+        if len(blob) > self.max_bytes:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (key, stored_at, time.time(), len(blob), sqlite3.Binary(blob)),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()
+        while count > self.max_entries or total > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            count, total = count - 1, total - row[1]
+            self.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return int(
+                self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()[0]
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0])
+
+
+class ResponseCache:
+    """
+    TTL cache for JSON-serializable responses.
+
+    Args:
+        name:     label used in stats/logs (e.g., "flight")
+        ttl:      seconds an entry counts as fresh
+        backend:  MemoryBackend (default) or DiskBackend
+        compress: zlib-compress stored values (big, rarely-read payloads)
+        max_stale:     seconds past the TTL an entry may still be served while
+                       it is refreshed in the background (0 = never stale)
+        refresh_ahead: seconds before expiry a fresh hit triggers a background
+                       refresh (0 = only refresh once stale)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        backend: Any = None,
+        compress: bool = False,
+        max_stale: float = 0.0,
+        refresh_ahead: float = 0.0,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.compress = compress
+        self.max_stale = max_stale
+        self.refresh_ahead = refresh_ahead
+        self._lock = threading.Lock()
+        self._refreshing: set = set()  # keys with a background refresh queued
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    # -- core --------------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        """Fresh value for `key`, or None (counts a hit/miss)."""
+        entry = self.backend.get(key)
+        if entry is not None and time.time() - entry[0] <= self.ttl:
+            self._count(hit=True)
+            return self._decode(entry[1])
+        self._count(hit=False)
+        return None
+
+    def put(self, key: str, value: Any) -> None:
+        self.backend.put(key, (time.time(), self._encode(value)))
+
+    def _encode(self, value: Any) -> bytes:
+        blob = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        return zlib.compress(blob) if self.compress else blob
+
+    def _decode(self, blob: bytes) -> Any:
+        return json.loads(zlib.decompress(blob) if self.compress else blob)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        """Return the cached value, or call loader(), store and return it."""
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    # -- stale-while-revalidate --------------------------------------------
+    def lookup(self, key: str) -> Optional[Tuple[Any, float, bool]]:
+        """
+        (value, age_s, needs_refresh) for an entry that may be served, i.e. at
+        most ttl + max_stale old, else None. needs_refresh is True once the
+        entry is stale or inside the refresh-ahead window.
+        """
+        entry = self.backend.get(key)
+        age = time.time() - entry[0] if entry is not None else None
+        if age is None or age > self.ttl + self.max_stale:
+            self._count(hit=False)
+            return None
+        stale = age > self.ttl
+        self._count(hit=True, stale=stale)
+        needs_refresh = stale or (
+            self.refresh_ahead > 0 and age > self.ttl - self.refresh_ahead
+        )
+        return self._decode(entry[1]), age, needs_refresh
+
+    def refresh_in_background(self, key: str, loader: Callable[[], Any]) -> bool:
+        """
+        Queue loader() on the shared refresh pool and store its result. At most
+        one refresh per key is queued; a failing loader keeps the old entry.
+        Returns False when a refresh for `key` is already pending.
+        """
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def run() -> None:
+            try:
+                self.put(key, loader())
+                with self._lock:
+                    self.refreshes += 1
+            except Exception as e:
+                with self._lock:
+                    self.refresh_errors += 1
+                print(f"Background refresh of {self.name} cache failed:", e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        _refresh_pool().submit(run)
+        return True
+
+    def get_or_refresh(
+        self, key: str, loader: Callable[[], Any]
+    ) -> Tuple[Any, float]:
+        """
+        (value, age_s): the cached value, even a stale one (refreshed in the
+        background), or, on a miss, loader()'s value stored with age 0.
+        """
+        hit = self.lookup(key)
+        if hit is not None:
+            value, age, needs_refresh = hit
+            if needs_refresh:
+                self.refresh_in_background(key, loader)
+            return value, age
+        value = loader()
+        self.put(key, value)
+        return value, 0.0
+
+    # -- metrics -----------------------------------------------------------
+    def _count(self, hit: bool, stale: bool = False) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.stale_hits += stale
+            else:
+                self.misses += 1
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 4),
+            "stale_hits": self.stale_hits,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "entries": len(self.backend),
+            "bytes": self.backend.size_bytes(),
+            "evictions": self.backend.evictions,
+        }
+
+
+def cache_from_env(
+    prefix: str,
+    ttl: float,
+    max_entries: int = 256,
+    max_bytes: int = 16 * 1024 * 1024,
+    backend: str = "memory",
+    compress: bool = False,
+    max_stale: float = 0.0,
+    refresh_ahead: float = 0.0,
+) -> ResponseCache:
+    """
+    Build a ResponseCache configured by <PREFIX>_CACHE_* env vars:
+
+      - <PREFIX>_CACHE_TTL          seconds (default `ttl`)
+      - <PREFIX>_CACHE_MAX_ENTRIES  entry cap
+      - <PREFIX>_CACHE_MAX_BYTES    byte budget
+      - <PREFIX>_CACHE_BACKEND      "memory" or "disk" (default `backend`)
+      - <PREFIX>_CACHE_PATH         SQLite file for the disk backend
+                                    (default: <cache dir>/<prefix>.sqlite)
+      - <PREFIX>_CACHE_MAX_STALE    seconds past TTL served while refreshing
+      - <PREFIX>_CACHE_REFRESH_AHEAD  seconds before expiry to refresh early
+    """
+    p = prefix.upper()
+    ttl = float(os.getenv(f"{p}_CACHE_TTL", ttl))
+    max_entries = int(os.getenv(f"{p}_CACHE_MAX_ENTRIES", max_entries))
+    max_bytes = int(os.getenv(f"{p}_CACHE_MAX_BYTES", max_bytes))
+    max_stale = float(os.getenv(f"{p}_CACHE_MAX_STALE", max_stale))
+    refresh_ahead = float(os.getenv(f"{p}_CACHE_REFRESH_AHEAD", refresh_ahead))
+    path = os.getenv(f"{p}_CACHE_PATH")
+    kind = os.getenv(f"{p}_CACHE_BACKEND", "disk" if path else backend).lower()
+
+    if kind == "disk":
+        path = path or default_cache_dir() / f"{prefix.lower()}.sqlite"
+        store: Any = DiskBackend(path, max_entries=max_entries, max_bytes=max_bytes)
+    else:
+        store = MemoryBackend(max_entries=max_entries, max_bytes=max_bytes)
+    return ResponseCache(
+        prefix.lower(),
+        ttl=ttl,
+        backend=store,
+        compress=compress,
+        max_stale=max_stale,
+        refresh_ahead=refresh_ahead,
+    )
@@ -0,0 +1,82 @@
+"""
+json_stream.py
+--------------
+Incremental parser for a JSON array arriving in pieces (e.g. LLM token deltas).
+
+    parser = JsonArrayStream()
+    for delta in llm.stream_complete(prompt):
+        for day in parser.feed(delta):
+            render(day)          # each element as soon as it is complete
+    parser.items                 # everything parsed so far
+
+Text before the first "[" (chatty preambles, ```json fences) is skipped, and
+so is anything after the matching "]". Only top-level elements are emitted;
+nested arrays/objects come out whole. An element that is not valid JSON is
+skipped (counted in `skipped`) instead of failing the whole stream.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, List
+
+
+class JsonArrayStream:
+    """Feed text chunks, get back the top-level array elements they complete."""
+
+    def __init__(self):
+        self.items: List[Any] = []
+        self.started = False  # saw the opening "["
+        self.done = False  # saw the matching "]"
+        self.skipped = 0
+        self._buf: List[str] = []  # characters of the current element
+        self._depth = 0  # nesting inside the current element
+        self._in_string = False
+        self._escape = False
+
+    def feed(self, text: str) -> List[Any]:
+        """Consume `text`; returns the elements completed by it, in order."""
+        out: List[Any] = []
+        for ch in text:
+            if self.done:
+                break
+            if not self.started:
+                self.started = ch == "["
+                continue
+            if self._in_string:
+                self._buf.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+            if ch == '"':
+                self._in_string = True
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                if self._depth == 0:  # the array's own "]"
+                    self._flush(out)
+                    self.done = True
+                    continue
+                self._depth -= 1
+            elif ch == "," and self._depth == 0:
+                self._flush(out)
+                continue
+            self._buf.append(ch)
+        return out
+
+    def _flush(self, out: List[Any]) -> None:
+        raw = "".join(self._buf).strip()
+        self._buf = []
+        if not raw:
+            return  # "[]" or a trailing comma
+        try:
+            item = json.loads(raw)
+        except ValueError:
+            self.skipped += 1
+            return
+        self.items.append(item)
+        out.append(item)
@@ -0,0 +1,219 @@
+"""
+rate_limit.py
+-------------
+Token-bucket rate limiting for upstream APIs (Amadeus quotas are per second).
+
+  - RateLimit(rate, burst): refill `rate` tokens/s, hold at most `burst`.
+  - RateLimiter: named buckets (e.g. one per endpoint). Bucket state lives in
+    memory (threads of one process) or in a SQLite file (every worker process
+    that opens the same file shares the quota).
+  - reserve() books tokens and returns how long the caller must wait; acquire()
+    does the sleeping. Async callers await asyncio.sleep(reserve(...)) instead,
+    and call reserve()/penalize() in a worker thread when `blocking` is set
+    (SQLite backend: BEGIN IMMEDIATE may wait on another process's lock).
+  - penalize() blocks a bucket for a while, e.g. when the server says
+    Retry-After, so everyone backs off, not only the request that got the 429.
+  - stats() exports queue-wait metrics per bucket.
+
+Reservations may drive a bucket negative: the caller simply waits until its
+tokens have been refilled, so waiters are served in arrival order without
+polling.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# (tokens, refill_from): tokens may be negative (booked ahead) and refill_from
+# may lie in the future (bucket closed by penalize()). Wall-clock times, so
+# processes sharing a SQLite file agree.
+_State = Tuple[float, float]
+# old state (None for a new bucket) -> (new state, result)
+_Updater = Callable[[Optional[_State]], Tuple[_State, float]]
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float  # tokens per second
+    burst: float  # bucket capacity (max tokens)
+
+    @classmethod
+    def parse(cls, spec: str) -> "RateLimit":
+        """'10' -> 10/s burst 10; '5:2' -> 5/s burst 2."""
+        rate, _, burst = spec.strip().partition(":")
+        return cls(float(rate), float(burst or rate))
+
+
+class _MemoryBuckets:
+    def __init__(self):
+        self._rows: Dict[str, _State] = {}
+        self._lock = threading.Lock()
+
+    def update(self, name: str, fn: _Updater) -> float:
+        with self._lock:
+            state, result = fn(self._rows.get(name))
+            self._rows[name] = state
+            return result
+
+
+class _SqliteBuckets:
+    """Bucket rows in SQLite; BEGIN IMMEDIATE makes each update atomic across processes."""
+
+    def __init__(self, path: str | Path):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(path), timeout=10, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                " name TEXT PRIMARY KEY, tokens REAL, refill_from REAL)"
+            )
+
+    def update(self, name: str, fn: _Updater) -> float:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    "SELECT tokens, refill_from FROM buckets WHERE name = ?",
+                    (name,),
+                ).fetchone()
+                state, result = fn(tuple(row) if row else None)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO buckets VALUES (?, ?, ?)", (name, *state)
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return result
+
+
+class RateLimiter:
+    """
+    Named token buckets.
+
+    Args:
+        default: limit for any bucket not listed in `limits`
+        limits:  {bucket name: RateLimit}
+        path:    SQLite file to share buckets across processes (None = in-process)
+    """
+
+    def __init__(
+        self,
+        default: RateLimit,
+        limits: Optional[Dict[str, RateLimit]] = None,
+        path: Optional[str | Path] = None,
+    ):
+        self.default = default
+        self.limits = dict(limits or {})
+        self._buckets = _SqliteBuckets(path) if path else _MemoryBuckets()
+        # Cross-process SQLite buckets can block on the file lock (up to the busy timeout)
+        self.blocking = path is not None
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def limit_for(self, name: str) -> RateLimit:
+        return self.limits.get(name, self.default)
+
+    # -- core --------------------------------------------------------------
+    @staticmethod
+    def _refill(state: Optional[_State], limit: RateLimit, now: float) -> _State:
+        tokens, start = state or (limit.burst, now)
+        if now > start:
+            tokens = min(limit.burst, tokens + (now - start) * limit.rate)
+            start = now
+        return tokens, start
+
+    def reserve(self, name: str, tokens: float = 1.0) -> float:
+        """Book `tokens` from bucket `name`; returns seconds to wait before using them."""
+        limit = self.limit_for(name)
+
+        def book(state: Optional[_State]) -> Tuple[_State, float]:
+            now = time.time()
+            avail, start = self._refill(state, limit, now)
+            avail -= tokens
+            deficit = -avail / limit.rate if avail < 0 and limit.rate > 0 else 0.0
+            return (avail, start), (start - now) + deficit
+
+        wait = self._buckets.update(name, book)
+        self._record(name, wait)
+        return wait
+
+    def acquire(self, name: str, tokens: float = 1.0) -> float:
+        """Blocking reserve(): sleeps until the tokens are available. Returns the wait."""
+        wait = self.reserve(name, tokens)
+        if wait > 0:
+            with self._lock:
+                self._metrics[name]["waiting"] += 1
+            try:
+                time.sleep(wait)
+            finally:
+                with self._lock:
+                    self._metrics[name]["waiting"] -= 1
+        return wait
+
+    def penalize(self, name: str, seconds: float) -> None:
+        """
+        Close bucket `name` for `seconds` (e.g. from a Retry-After header):
+        it is drained to one token and refills only from then on, so callers
+        queue up behind the penalty instead of bursting when it ends.
+        """
+        limit = self.limit_for(name)
+
+        def block(state: Optional[_State]) -> Tuple[_State, float]:
+            now = time.time()
+            avail, start = self._refill(state, limit, now)
+            return (min(avail, 1.0), max(start, now + seconds)), 0.0
+
+        self._buckets.update(name, block)
+        with self._lock:
+            self._bucket_metrics(name)["penalties"] += 1
+
+    # -- metrics -----------------------------------------------------------
+    def _bucket_metrics(self, name: str) -> Dict[str, float]:
+        return self._metrics.setdefault(
+            name,
+            {
+                "acquired": 0,
+                "delayed": 0,
+                "wait_total_s": 0.0,
+                "wait_max_s": 0.0,
+                "waiting": 0,
+                "penalties": 0,
+            },
+        )
+
+    def _record(self, name: str, wait: float) -> None:
+        with self._lock:
+            m = self._bucket_metrics(name)
+            m["acquired"] += 1
+            if wait > 0:
+                m["delayed"] += 1
+                m["wait_total_s"] += wait
+                m["wait_max_s"] = max(m["wait_max_s"], wait)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Queue-wait metrics per bucket: acquired, delayed (had to wait),
+        wait_total_s / wait_avg_s / wait_max_s, waiting (sleeping right now),
+        penalties (Retry-After blocks).
+        """
+        with self._lock:
+            out: Dict[str, Dict[str, Any]] = {}
+            for name, m in self._metrics.items():
+                avg = m["wait_total_s"] / m["acquired"] if m["acquired"] else 0.0
+                out[name] = {
+                    **m,
+                    "wait_total_s": round(m["wait_total_s"], 4),
+                    "wait_max_s": round(m["wait_max_s"], 4),
+                    "wait_avg_s": round(avg, 4),
+                }
+            return out
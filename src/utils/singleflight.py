@@ -0,0 +1,127 @@
+"""
+singleflight.py
+---------------
+Request coalescing ("single-flight") for identical concurrent calls.
+
+When several sessions ask for the same thing at once (same city, same dates),
+only the first caller (the leader) runs the upstream request; everyone who
+arrives while it is in flight waits and gets the SAME result, or the same
+exception. Nothing is remembered afterwards: that is the caches' job.
+
+    _FLIGHTS = SingleFlight("flights")
+    offers = _FLIGHTS.do(key, fetch, q)            # threads
+    offers = await _FLIGHTS.do_async(key, afetch, q)  # asyncio (per event loop)
+
+Followers share the leader's result object: treat it as read-only.
+stats() reports calls / coalesced per group.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+_GROUPS: Dict[str, "SingleFlight"] = {}
+_GROUPS_LOCK = threading.Lock()
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    A group of keyed in-flight calls.
+
+      - calls:     calls that actually ran (leaders)
+      - coalesced: calls that piggybacked on a leader instead of running
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._tasks: Dict[Tuple[int, Hashable], asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+        with _GROUPS_LOCK:
+            _GROUPS[name] = self
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run fn(*args, **kwargs) unless a call for `key` is already in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    async def do_async(
+        self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any, **kwargs: Any
+    ) -> Any:
+        """Async twin of do(); coalesces callers on the same event loop."""
+        loop_key = (id(asyncio.get_running_loop()), key)
+        with self._lock:
+            fut = self._tasks.get(loop_key)
+            if fut is not None:
+                self.coalesced += 1
+            else:
+                fut = self._tasks[loop_key] = asyncio.ensure_future(fn(*args, **kwargs))
+                fut.add_done_callback(lambda _f: self._forget(loop_key))
+                self.calls += 1
+        # shield: a cancelled follower must not cancel the shared call
+        return await asyncio.shield(fut)
+
+    def _forget(self, loop_key: Tuple[int, Hashable]) -> None:
+        with self._lock:
+            self._tasks.pop(loop_key, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.coalesced = 0
+
+
+def stats() -> Dict[str, Dict[str, int]]:
+    """{group name: {"calls", "coalesced", "in_flight"}} for every group."""
+    with _GROUPS_LOCK:
+        groups = list(_GROUPS.values())
+    return {g.name: g.stats() for g in groups}
@@ -0,0 +1,79 @@
+"""
+tests/bench_airline_batch.py
+----------------------------
+Benchmark: /v1/reference-data/airlines calls per batch of flight offers.
+
+Compares summarizing offers one-by-one (a lookup per offer) against the
+two-pass batch summarizer (one chunked lookup per batch). Uses a cold, empty
+airline store and a counting stub client, so no keys or network are needed.
+
+USAGE:
+    python tests/bench_airline_batch.py [offers]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.integrations.travel_scraper import airlines, amadeus_client
+from src.integrations.travel_scraper.parsing import (
+    summarize_offer_airports_and_carriers,
+    summarize_offers_airports_and_carriers,
+)
+
+
+class CountingClient:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, path, params):
+        self.calls += 1
+        codes = params["airlineCodes"].split(",")
+        return {"data": [{"iataCode": c, "businessName": f"Airline {c}"} for c in codes]}
+
+
+def synthetic_offers(n):
+    offers = []
+    for i in range(n):
+        out_code, in_code = f"A{i % 10}", f"B{i % 10}"
+        seg = lambda frm, to, code: {
+            "departure": {"iataCode": frm, "at": "2025-09-12T10:00:00"},
+            "arrival": {"iataCode": to, "at": "2025-09-12T18:00:00"},
+            "carrierCode": code,
+        }
+        offers.append(
+            {
+                "id": str(i),
+                "price": {"grandTotal": f"{500 + i}.00", "currency": "USD"},
+                "itineraries": [
+                    {"segments": [seg("LHE", "DOH", out_code), seg("DOH", "FCO", out_code)]},
+                    {"segments": [seg("FCO", "LHE", in_code)]},
+                ],
+            }
+        )
+    return offers
+
+
+def run(label, fn, offers):
+    cli = CountingClient()
+    amadeus_client._SHARED_CLIENT = cli
+    airlines._STORE = airlines.AirlineNameStore(":memory:", snapshot=None)
+    t0 = time.perf_counter()
+    fn(offers)
+    ms = (time.perf_counter() - t0) * 1000
+    print(f"{label:<28} API calls: {cli.calls:3d}   time: {ms:7.2f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    offers = synthetic_offers(n)
+    print(f"=== Airline lookups for {n} offers (cold cache, 20 distinct carriers) ===")
+    run("per-offer lookups", lambda os_: [summarize_offer_airports_and_carriers(o) for o in os_], offers)
+    run("batch (two-pass)", summarize_offers_airports_and_carriers, offers)
+
+
+if __name__ == "__main__":
+    main()
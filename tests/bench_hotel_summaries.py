@@ -0,0 +1,111 @@
+"""
+tests/bench_hotel_summaries.py
+------------------------------
+Benchmark: summarize_hotels_offers() over synthetic v3 payloads.
+
+Compares the previous approach (cheapest offer found by building + sorting a
+list of pairs, once in the sort key and again per summary) against the
+single-pass summarizer (linear min once per hotel, decorate-sort). Pure CPU,
+no keys or network needed.
+
+USAGE:
+    python tests/bench_hotel_summaries.py [offers_per_hotel]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.integrations.travel_scraper.parsing_hotels import (
+    index_hotel_list,
+    summarize_hotel_offer,
+    summarize_hotels_offers,
+)
+
+
+def synthetic_payload(n_hotels, offers_per_hotel, seed=7):
+    rnd = random.Random(seed)
+    items, hotel_list = [], []
+    for i in range(n_hotels):
+        hid = f"HT{i:06d}"
+        offers = [
+            {
+                "id": f"{hid}-{j}",
+                "checkInDate": "2025-09-12",
+                "checkOutDate": "2025-09-17",
+                "price": {"total": f"{rnd.uniform(60, 900):.2f}", "currency": "USD"},
+                "room": {"boardType": "ROOM_ONLY"},
+            }
+            for j in range(offers_per_hotel)
+        ]
+        items.append({"hotel": {"hotelId": hid, "cityCode": "ROM"}, "offers": offers})
+        hotel_list.append(
+            {
+                "hotelId": hid,
+                "name": f"Hotel {i}",
+                "address": {"lines": [f"Via {i}"], "cityName": "ROME", "countryCode": "IT"},
+                "latitude": 41.9,
+                "longitude": 12.5,
+            }
+        )
+    return items, hotel_list
+
+
+# ---- previous implementation, kept here only as the baseline ----
+def _legacy_cheapest(item):
+    pairs = []
+    for o in item.get("offers", []):
+        total = o.get("price", {}).get("total")
+        if total:
+            try:
+                pairs.append((float(total), o))
+            except Exception:
+                pass
+    if not pairs:
+        return None
+    pairs.sort(key=lambda p: p[0])
+    return pairs[0][1]
+
+
+def legacy_summarize(items, hotel_list):
+    idx = index_hotel_list(hotel_list)
+
+    def price_as_float(item):
+        o = _legacy_cheapest(item)
+        return float(o["price"]["total"]) if o else float("inf")
+
+    return [
+        summarize_hotel_offer(x, idx, cheapest=_legacy_cheapest(x))
+        for x in sorted(items, key=price_as_float)
+    ]
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return min(times), out
+
+
+def main():
+    per_hotel = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    for n in (1_000, 10_000):
+        items, hotel_list = synthetic_payload(n, per_hotel)
+        legacy_ms, legacy = best_of(lambda: legacy_summarize(items, hotel_list))
+        new_ms, new = best_of(lambda: summarize_hotels_offers(items, hotel_list))
+        assert [h["hotel_id"] for h in new] == [h["hotel_id"] for h in legacy]
+        print(
+            f"{n:>6} hotels x {per_hotel} offers   "
+            f"sort+sort twice: {legacy_ms:8.2f} ms   "
+            f"single pass: {new_ms:8.2f} ms   ({legacy_ms / new_ms:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+tests/bench_supervisor_startup.py
+---------------------------------
+Benchmark: per-request supervisor construction vs. the shared compiled graph.
+
+Agents are stubbed with no-ops so we only measure graph build/compile/invoke
+overhead (no Amadeus/Groq calls, no keys needed).
+
+USAGE:
+    python tests/bench_supervisor_startup.py [requests]
+"""
+
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+from src.agents import supervisor as sup
+
+
+def _stub_agents():
+    sup.DestinationParserAgent.run = lambda self, s: {"trip_request": s.trip_request}
+    sup.FlightHotelScraperAgent.run = lambda self, s: {"flight_options": []}
+    sup.ItineraryAgent.run = lambda self, s: {"itinerary": []}
+    sup.PackingListAgent.run = lambda self, s: {"packing_list": []}
+    sup.ReminderAgent.run = lambda self, s: {"reminders": []}
+
+
+def _state():
+    return {
+        "user_input": "",
+        "trip_request": {
+            "destination": "Rome",
+            "start_date": "2025-09-12",
+            "end_date": "2025-09-17",
+        },
+    }
+
+
+def _timed(fn, n):
+    out = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        out.append((time.perf_counter() - t0) * 1000)
+    return out
+
+
+def _quiet_run(supervisor):
+    # supervisor.run() prints a debug line; keep the benchmark output readable
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        supervisor.run(_state())
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    _stub_agents()
+
+    per_request = _timed(lambda: _quiet_run(sup.TravelBuddySupervisor()), n)
+
+    first = _timed(lambda: _quiet_run(sup.get_supervisor()), 1)[0]
+    steady = _timed(lambda: _quiet_run(sup.get_supervisor()), n)
+
+    print(f"=== Supervisor startup benchmark ({n} requests) ===")
+    print(f"build+compile every request : median {statistics.median(per_request):7.2f} ms")
+    print(f"shared graph, first request : {first:7.2f} ms")
+    print(f"shared graph, steady state  : median {statistics.median(steady):7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
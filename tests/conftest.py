@@ -0,0 +1,172 @@
+"""
+tests/conftest.py
+-----------------
+Shared fixtures for the OFFLINE tests.
+
+`fake_amadeus` starts a tiny local HTTP/1.1 server that speaks just enough of
+the Amadeus API (OAuth token + whatever GET routes a test registers) so we can
+exercise AmadeusClient end-to-end without keys or network access. JSON POST
+routes (Groq chat completions) receive the decoded body as their params, and a
+route may return a generator of strings to stream a chunked response (SSE).
+"""
+
+import json
+import sys
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+repo_root = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(repo_root))
+
+
+class FakeAmadeus:
+    """
+    Holds the routes and counters for one fake server.
+
+      - routes: {path: callable(params) -> (status, payload[, headers])}
+      - calls:  {path: number of requests seen}
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.calls = {}
+        self.lock = threading.Lock()
+        self.base_url = ""
+
+    def route(self, path, handler):
+        self.routes[path] = handler
+
+    def count(self, path):
+        with self.lock:
+            return self.calls.get(path, 0)
+
+    def _hit(self, path):
+        with self.lock:
+            self.calls[path] = self.calls.get(path, 0) + 1
+
+
+def _make_handler(fake: FakeAmadeus):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, so pooling is observable
+
+        def log_message(self, *args):  # keep pytest output clean
+            pass
+
+        def _reply(self, status, payload, headers=None):
+            if isinstance(payload, Iterator):
+                return self._stream(status, payload, headers)
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _stream(self, status, chunks, headers=None):
+            # Chunked text/event-stream, one write per chunk (the generator may
+            # sleep between chunks to simulate a slow producer)
+            self.send_response(status)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            for chunk in chunks:
+                data = chunk.encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+
+        def _dispatch(self, params):
+            path = urlparse(self.path).path
+            fake._hit(path)
+            handler = fake.routes.get(path)
+            if handler is None:
+                return self._reply(404, {"errors": [{"detail": "no route"}]})
+            result = handler(params)
+            self._reply(*result)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length).decode()
+            if "json" in (self.headers.get("Content-Type") or ""):
+                return self._dispatch(json.loads(body or "{}"))  # e.g. Groq chat calls
+            form = parse_qs(body)
+            self._dispatch({k: v[0] for k, v in form.items()})
+
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query)
+            self._dispatch({k: v[0] for k, v in query.items()})
+
+    return Handler
+
+
+@pytest.fixture
+def fake_amadeus():
+    fake = FakeAmadeus()
+    fake.route(
+        "/v1/security/oauth2/token",
+        lambda _p: (200, {"access_token": "tok", "expires_in": 1799}),
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(fake))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    fake.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    try:
+        yield fake
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def shared_client(fake_amadeus, monkeypatch):
+    """
+    Points the process-wide AmadeusClient (get_client()) at `fake_amadeus`
+    with a fresh session + token, so module-level search functions hit the fake.
+    """
+    from src.integrations.travel_scraper import amadeus_client
+
+    cli = amadeus_client.AmadeusClient(
+        "key",
+        "secret",
+        base_url=fake_amadeus.base_url,
+        session=amadeus_client._build_session(amadeus_client.PoolConfig()),
+    )
+    monkeypatch.setattr(amadeus_client, "_SHARED_CLIENT", cli)
+    return cli
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches(monkeypatch, tmp_path):
+    """Module-level caches/stores must not leak entries between tests (or to disk)."""
+    from src.integrations import llm_cache
+    from src.integrations.travel_scraper import (
+        airlines,
+        amadeus_client,
+        flights,
+        hotels,
+        locations,
+    )
+
+    monkeypatch.setenv("TRAVEL_BUDDY_CACHE_DIR", str(tmp_path / "cache"))
+    # Quota/backoff tuned for a local fake server; rate-limit tests pass their own
+    monkeypatch.setenv("AMADEUS_RATE_LIMIT", "1000")
+    monkeypatch.setenv("AMADEUS_RETRY_BACKOFF", "0.01")
+    monkeypatch.setattr(amadeus_client, "_LIMITER", None)
+    flights._FLIGHT_CACHE.clear()
+    monkeypatch.setattr(hotels, "_HOTEL_LIST_CACHE", None)
+    hotels._CATALOGUES.clear()
+    hotels._HOTEL_OFFERS_CACHE.clear()
+    monkeypatch.setattr(airlines, "_STORE", airlines.AirlineNameStore(":memory:"))
+    monkeypatch.setattr(locations, "_INDEX", None)
+    monkeypatch.setattr(llm_cache, "_CACHE", None)
+    yield
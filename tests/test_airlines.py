@@ -0,0 +1,96 @@
+"""
+tests/test_airlines.py
+----------------------
+OFFLINE tests for the persistent airline-name store.
+"""
+
+import time
+
+from src.integrations.travel_scraper import airlines
+from src.integrations.travel_scraper.airlines import (
+    AirlineNameStore,
+    map_airline_codes_to_names,
+)
+
+PATH = "/v1/reference-data/airlines"
+
+
+def _airline_route(fake, known):
+    def handler(p):
+        codes = p["airlineCodes"].split(",")
+        return 200, {
+            "data": [{"iataCode": c, "businessName": known[c]} for c in codes if c in known]
+        }
+
+    fake.route(PATH, handler)
+
+
+def test_snapshot_answers_common_codes_without_network(fake_amadeus, shared_client):
+    _airline_route(fake_amadeus, {})
+    assert map_airline_codes_to_names(["QR", "TK", "QR"]) == {
+        "QR": "Qatar Airways",
+        "TK": "Turkish Airlines",
+    }
+    assert fake_amadeus.count(PATH) == 0
+
+
+def test_unknown_codes_are_negatively_cached(fake_amadeus, shared_client):
+    _airline_route(fake_amadeus, {"XX": "EXAMPLE AIR"})
+
+    first = map_airline_codes_to_names(["XX", "ZZ"])
+    second = map_airline_codes_to_names(["XX", "ZZ"])
+
+    assert first == second == {"XX": "Example Air", "ZZ": "Unknown Airline"}
+    assert fake_amadeus.count(PATH) == 1
+
+
+def test_negative_entries_expire():
+    store = AirlineNameStore(":memory:", negative_ttl=0.05, snapshot=None)
+    store.remember({}, unknown=["ZZ"])
+    assert store.lookup(["ZZ"]) == ({"ZZ": "Unknown Airline"}, [])
+    time.sleep(0.06)
+    assert store.lookup(["ZZ"]) == ({}, ["ZZ"])
+
+
+def test_store_is_shared_through_the_file(tmp_path):
+    path = tmp_path / "airlines.sqlite"
+    worker_a = AirlineNameStore(path)
+    worker_a.remember({"XX": "Example Air"})
+
+    worker_b = AirlineNameStore(path)  # e.g. another process after a restart
+    assert worker_b.lookup(["XX", "QR"])[0] == {
+        "XX": "Example Air",
+        "QR": "Qatar Airways",
+    }
+    assert len(worker_b) == len(AirlineNameStore(":memory:")) + 1
+
+
+def test_batch_summary_resolves_all_carriers_in_one_call(
+    fake_amadeus, shared_client, monkeypatch
+):
+    from src.integrations.travel_scraper.parsing import (
+        summarize_offers_airports_and_carriers,
+    )
+
+    monkeypatch.setattr(airlines, "_STORE", AirlineNameStore(":memory:", snapshot=None))
+    _airline_route(fake_amadeus, {f"C{i}": f"CARRIER {i}" for i in range(6)})
+
+    def offer(i):
+        seg = {"departure": {"iataCode": "LHE"}, "arrival": {"iataCode": "FCO"}}
+        return {
+            "id": str(i),
+            "price": {"grandTotal": str(100 + i)},
+            "itineraries": [{"segments": [{**seg, "carrierCode": f"C{i}"}]}],
+        }
+
+    summaries = summarize_offers_airports_and_carriers([offer(i) for i in range(6)])
+
+    assert fake_amadeus.count(PATH) == 1
+    assert summaries[3]["outbound"]["carrier_names"] == ["C3 — Carrier 3"]
+
+
+def test_lookup_is_chunked(fake_amadeus, shared_client, monkeypatch):
+    monkeypatch.setenv("AIRLINE_LOOKUP_CHUNK", "2")
+    _airline_route(fake_amadeus, {})
+    map_airline_codes_to_names(["X1", "X2", "X3", "X4", "X5"])
+    assert fake_amadeus.count(PATH) == 3
@@ -0,0 +1,100 @@
+"""
+tests/test_amadeus_client.py
+----------------------------
+OFFLINE tests for AmadeusClient plumbing (pooling) against the local fake server.
+"""
+
+from src.integrations.travel_scraper.amadeus_client import (
+    AmadeusClient,
+    AmadeusError,
+    PoolConfig,
+    _build_session,
+)
+
+
+def _client(fake, config=None):
+    session = _build_session(config or PoolConfig())
+    return AmadeusClient("key", "secret", base_url=fake.base_url, session=session)
+
+
+def test_keep_alive_reuses_one_connection(fake_amadeus):
+    fake_amadeus.route("/v1/ping", lambda p: (200, {"data": [p]}))
+    cli = _client(fake_amadeus)
+
+    for i in range(3):
+        assert cli.get("/v1/ping", {"n": i})["data"] == [{"n": str(i)}]
+
+    stats = cli.pool_stats()
+    # 1 OAuth POST + 3 GETs over a single socket
+    assert stats["requests"] == 4
+    assert stats["misses"] == 1
+    assert stats["hits"] == 3
+
+
+def test_keep_alive_disabled_opens_new_connections(fake_amadeus):
+    fake_amadeus.route("/v1/ping", lambda p: (200, {"data": []}))
+    cli = _client(fake_amadeus, PoolConfig(keep_alive=False))
+
+    cli.get("/v1/ping", {})
+    cli.get("/v1/ping", {})
+
+    assert cli.pool_stats()["misses"] == 3
+
+
+def test_http_errors_raise_amadeus_error(fake_amadeus):
+    fake_amadeus.route("/v1/broken", lambda p: (400, {"errors": ["bad"]}))
+    cli = _client(fake_amadeus)
+    try:
+        cli.get("/v1/broken", {})
+    except AmadeusError as e:
+        assert "400" in str(e)
+    else:
+        raise AssertionError("expected AmadeusError")
+
+
+def test_concurrent_expired_token_refreshes_once(fake_amadeus):
+    import threading
+    import time
+
+    def slow_token(_p):
+        time.sleep(0.05)  # widen the race window
+        return 200, {"access_token": "tok", "expires_in": 1799}
+
+    fake_amadeus.route("/v1/security/oauth2/token", slow_token)
+    fake_amadeus.route("/v1/ping", lambda p: (200, {"data": []}))
+    cli = _client(fake_amadeus)
+
+    threads = [
+        threading.Thread(target=cli.get, args=("/v1/ping", {})) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert cli.token_refreshes == 1
+    assert fake_amadeus.count("/v1/security/oauth2/token") == 1
+    assert fake_amadeus.count("/v1/ping") == 8
+
+
+def test_travel_scraper_modules_share_one_token(fake_amadeus, shared_client):
+    from src.integrations.travel_scraper.airlines import map_airline_codes_to_names
+    from src.integrations.travel_scraper.flights import FlightQuery, search_flights
+    from src.integrations.travel_scraper.hotels import list_hotels_by_city
+    from src.integrations.travel_scraper.reference import search_airports_and_cities
+
+    empty = lambda p: (200, {"data": []})
+    for path in (
+        "/v2/shopping/flight-offers",
+        "/v1/reference-data/locations/hotels/by-city",
+        "/v1/reference-data/locations",
+        "/v1/reference-data/airlines",
+    ):
+        fake_amadeus.route(path, empty)
+
+    search_flights(FlightQuery("LHE", "ROM", "2025-09-12"))
+    list_hotels_by_city("ROM")
+    search_airports_and_cities("Rome")
+    map_airline_codes_to_names(["ZZ"])
+
+    assert shared_client.token_refreshes == 1
@@ -0,0 +1,115 @@
+"""
+tests/test_async_client.py
+--------------------------
+OFFLINE tests for the asyncio travel_scraper layer (fake local Amadeus server).
+"""
+
+import asyncio
+
+from src.integrations.travel_scraper import async_client
+from src.integrations.travel_scraper.flights import FlightQuery, search_flights_async
+from src.integrations.travel_scraper.hotels import HotelQuery, search_hotels_async
+from src.integrations.travel_scraper.reference import city_to_codes_async
+
+
+def _run_with_fake(fake, coro_fn):
+    async def main():
+        cli = async_client.AsyncAmadeusClient("key", "secret", base_url=fake.base_url)
+        async_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = cli
+        try:
+            return cli, await coro_fn()
+        finally:
+            await cli.aclose()
+
+    return asyncio.run(main())
+
+
+def test_many_concurrent_searches_share_one_loop_and_token(fake_amadeus):
+    fake_amadeus.route(
+        "/v2/shopping/flight-offers",
+        lambda p: (200, {"data": [{"id": p["departureDate"]}]}),
+    )
+
+    async def many():
+        qs = [FlightQuery("LHE", "ROM", f"2025-09-{d:02d}") for d in range(1, 31)]
+        return await asyncio.gather(*(search_flights_async(q) for q in qs))
+
+    cli, results = _run_with_fake(fake_amadeus, many)
+
+    assert [r[0]["id"] for r in results] == [f"2025-09-{d:02d}" for d in range(1, 31)]
+    assert cli.token_refreshes == 1
+
+
+def test_async_hotels_and_reference(fake_amadeus):
+    fake_amadeus.route(
+        "/v1/reference-data/locations",
+        lambda p: (200, {"data": [{"subType": "CITY", "iataCode": "ROM"}]}),
+    )
+    fake_amadeus.route(
+        "/v1/reference-data/locations/hotels/by-city",
+        lambda p: (200, {"data": [{"hotelId": "H1"}, {"hotelId": "H2"}]}),
+    )
+    fake_amadeus.route(
+        "/v3/shopping/hotel-offers",
+        lambda p: (200, {"data": [{"hotel": {"hotelId": h}} for h in p["hotelIds"].split(",")]}),
+    )
+
+    async def flow():
+        codes = await city_to_codes_async("Gotham")  # not in the offline index
+        offers, hotel_list = await search_hotels_async(
+            HotelQuery(codes["city"], "2025-09-12", "2025-09-17")
+        )
+        return codes, offers, hotel_list
+
+    _cli, (codes, offers, hotel_list) = _run_with_fake(fake_amadeus, flow)
+
+    assert codes == {"city": "ROM", "airport": "ROM"}
+    assert fake_amadeus.count("/v1/reference-data/locations") == 1
+    assert [o["hotel"]["hotelId"] for o in offers] == ["H1", "H2"]
+    assert len(hotel_list) == 2
+
+
+def test_sqlite_limiter_is_called_off_the_event_loop(fake_amadeus, tmp_path):
+    import threading
+
+    from src.utils.rate_limit import RateLimit, RateLimiter
+
+    fake_amadeus.route("/v1/reference-data/locations", lambda p: (200, {"data": []}))
+    limiter = RateLimiter(RateLimit.parse("100"), path=tmp_path / "buckets.sqlite")
+    threads = []
+    reserve = limiter.reserve
+
+    def recording_reserve(*args):
+        threads.append(threading.get_ident())
+        return reserve(*args)
+
+    limiter.reserve = recording_reserve
+
+    async def main():
+        cli = async_client.AsyncAmadeusClient(
+            "key", "secret", base_url=fake_amadeus.base_url, rate_limiter=limiter
+        )
+        try:
+            await cli.get("/v1/reference-data/locations", {"keyword": "Rome"})
+        finally:
+            await cli.aclose()
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert threads and loop_thread not in threads
+
+
+def test_run_closes_the_loops_shared_client(fake_amadeus):
+    made = []
+
+    async def main():
+        cli = async_client.AsyncAmadeusClient("key", "secret", base_url=fake_amadeus.base_url)
+        async_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = cli
+        made.append((asyncio.get_running_loop(), cli))
+        assert async_client.get_async_client() is cli
+        return "done"
+
+    assert async_client.run(main()) == "done"
+    loop, cli = made[0]
+    assert cli.http.is_closed
+    assert loop not in async_client._ASYNC_CLIENTS
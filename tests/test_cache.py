@@ -0,0 +1,139 @@
+"""
+tests/test_cache.py
+-------------------
+OFFLINE tests for src/utils/cache.py and the flight-offer cache.
+"""
+
+import time
+
+from src.utils.cache import DiskBackend, MemoryBackend, ResponseCache, cache_from_env
+
+
+def test_ttl_expiry_and_hit_rate():
+    cache = ResponseCache("t", ttl=0.1)
+    cache.put("k", {"v": 1})
+
+    assert cache.get("k") == {"v": 1}
+    time.sleep(0.15)
+    assert cache.get("k") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_memory_lru_entry_cap_and_byte_budget():
+    cache = ResponseCache("t", ttl=60, backend=MemoryBackend(max_entries=2))
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")  # "b" becomes least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+    small = ResponseCache("t", ttl=60, backend=MemoryBackend(max_bytes=20))
+    small.put("x", "x" * 8)  # 10 bytes encoded
+    small.put("y", "y" * 8)
+    small.put("z", "z" * 8)  # over budget -> oldest evicted
+    assert small.get("x") is None
+    assert small.backend.size_bytes() <= 20
+    assert small.stats()["evictions"] == 1
+
+
+def test_disk_backend_persists_and_evicts(tmp_path):
+    path = tmp_path / "c.sqlite"
+    first = ResponseCache("d", ttl=60, backend=DiskBackend(path, max_entries=2))
+    first.put("a", [1, 2])
+    first.put("b", [3])
+    first.get("a")
+    first.put("c", [4])  # evicts "b" (least recently accessed)
+
+    second = ResponseCache("d", ttl=60, backend=DiskBackend(path))
+    assert second.get("a") == [1, 2]
+    assert second.get("b") is None
+    assert second.get("c") == [4]
+
+
+def test_cache_from_env_disk(monkeypatch, tmp_path):
+    monkeypatch.setenv("DEMO_CACHE_PATH", str(tmp_path / "demo.sqlite"))
+    monkeypatch.setenv("DEMO_CACHE_TTL", "5")
+    cache = cache_from_env("DEMO", ttl=60)
+    assert isinstance(cache.backend, DiskBackend)
+    assert cache.ttl == 5
+
+
+def test_identical_flight_queries_hit_the_cache(fake_amadeus, shared_client):
+    from src.integrations.travel_scraper.flights import (
+        FlightQuery,
+        flight_cache_stats,
+        search_flights,
+    )
+
+    path = "/v2/shopping/flight-offers"
+    fake_amadeus.route(path, lambda p: (200, {"data": [{"id": "1"}]}))
+
+    q = FlightQuery("LHE", "ROM", "2025-09-12", travel_class="ECONOMY")
+    same = FlightQuery("lhe", "rom ", "2025-09-12", travel_class="economy")
+
+    assert search_flights(q) == [{"id": "1"}]
+    assert search_flights(same) == [{"id": "1"}]
+    assert fake_amadeus.count(path) == 1
+    assert flight_cache_stats()["hits"] >= 1
+
+    search_flights(q, use_cache=False)
+    assert fake_amadeus.count(path) == 2
+
+
+def _wait_for(cond, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not cond() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return cond()
+
+
+def _put_aged(cache, key, value, age):
+    cache.backend.put(key, (time.time() - age, cache._encode(value)))
+
+
+def test_stale_entry_is_served_and_refreshed_in_background():
+    cache = ResponseCache("swr", ttl=10, max_stale=100)
+    _put_aged(cache, "k", "old", age=30)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        time.sleep(0.05)
+        return "new"
+
+    value, age = cache.get_or_refresh("k", loader)
+    assert value == "old" and 29 < age < 31  # no waiting on the loader
+    cache.get_or_refresh("k", loader)  # refresh already pending: not queued again
+
+    assert _wait_for(lambda: cache.stats()["refreshes"] == 1)
+    value, age = cache.get_or_refresh("k", loader)
+    assert value == "new" and age < 1
+    assert len(loads) == 1
+    assert cache.stats()["stale_hits"] == 2
+    assert cache.get("k") == "new"
+
+
+def test_refresh_ahead_and_max_stale_limits():
+    cache = ResponseCache("swr", ttl=10, max_stale=5, refresh_ahead=3)
+    _put_aged(cache, "fresh", 1, age=2)
+    _put_aged(cache, "expiring", 2, age=8)
+    _put_aged(cache, "too-old", 3, age=16)
+
+    assert cache.lookup("fresh")[2] is False
+    assert cache.lookup("expiring")[2] is True  # fresh, but inside refresh-ahead
+    assert cache.lookup("too-old") is None
+    assert cache.get_or_refresh("too-old", lambda: 4) == (4, 0.0)  # blocking load
+
+
+def test_failed_background_refresh_keeps_the_stale_entry():
+    cache = ResponseCache("swr", ttl=10, max_stale=100)
+    _put_aged(cache, "k", "old", age=30)
+
+    def boom():
+        raise RuntimeError("upstream down")
+
+    assert cache.get_or_refresh("k", boom)[0] == "old"
+    assert _wait_for(lambda: cache.stats()["refresh_errors"] == 1)
+    assert cache.lookup("k")[0] == "old"
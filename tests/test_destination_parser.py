@@ -0,0 +1,97 @@
+"""
+tests/test_destination_parser.py
+--------------------------------
+OFFLINE tests for DestinationParserAgent: pass-through, rule fast path, LLM fallback.
+"""
+
+import json
+
+from src.agents.destination_parser import DestinationParserAgent
+
+
+class FakeLLM:
+    model = "fake-model"
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def complete(self, prompt, **kw):
+        self.prompts.append(prompt)
+        return self.reply
+
+
+def test_confident_rules_skip_the_llm():
+    llm = FakeLLM("{}")
+    agent = DestinationParserAgent(llm=llm)
+    out = agent.run(
+        {"user_input": "Visit Tokyo 2099-09-12 to 2099-09-17, budget 2000 euros, love food"}
+    )
+
+    assert out["trip_request"]["destination"] == "Tokyo"
+    assert out["trip_request"]["end_date"] == "2099-09-17"
+    assert out["trip_request"]["budget"] == 2000.0
+    assert out["currency"] == "EUR"
+    assert llm.prompts == []
+    assert agent.stats() == {"rule_hits": 1, "llm_calls": 0, "llm_avoided_rate": 1.0}
+
+
+def test_low_confidence_goes_to_the_llm():
+    reply = {"destination": "Paris", "start_date": "2025-12-01", "end_date": "2025-12-04"}
+    llm = FakeLLM("Sure! " + json.dumps(reply))
+    agent = DestinationParserAgent(llm=llm)
+    out = agent.run({"user_input": "Somewhere romantic in December, maybe Paris?"})
+
+    assert out["trip_request"]["destination"] == "Paris"
+    assert len(llm.prompts) == 1
+    assert agent.stats()["llm_calls"] == 1 and agent.stats()["llm_avoided_rate"] == 0.0
+
+
+def test_threshold_is_configurable(monkeypatch):
+    monkeypatch.setenv("PARSER_MIN_CONFIDENCE", "1.01")
+    llm = FakeLLM('{"destination": "Rome", "start_date": "2025-09-12", "end_date": "2025-09-13"}')
+    DestinationParserAgent(llm=llm).run({"user_input": "to Rome 2099-09-12 to 2099-09-13"})
+    assert len(llm.prompts) == 1
+
+
+def test_pass_through_normalizes_dates_without_the_llm():
+    llm = FakeLLM("{}")
+    out = DestinationParserAgent(llm=llm).run(
+        {
+            "user_input": "",
+            "trip_request": {
+                "destination": "Tokyo",
+                "start_date": "September 12th 2025",
+                "end_date": "September 17th 2025",
+                "preferences": "anime",
+            },
+        }
+    )
+    assert out["trip_request"]["start_date"] == "2025-09-12"
+    assert out["trip_request"]["end_date"] == "2025-09-17"
+    assert out["trip_request"]["preferences"] == ["anime"]
+    assert llm.prompts == []
+
+
+def test_unreadable_pass_through_dates_are_kept_not_sent_to_the_llm():
+    llm = FakeLLM("{}")
+    out = DestinationParserAgent(llm=llm).run(
+        {
+            "user_input": "",
+            "trip_request": {
+                "destination": "Rome",
+                "start_date": "next Friday",
+                "end_date": "2099-09-17",
+            },
+        }
+    )
+    assert out["trip_request"]["start_date"] == "next Friday"
+    assert out["trip_request"]["end_date"] == "2099-09-17"
+    assert llm.prompts == []
+
+
+def test_implausible_rule_dates_go_to_the_llm():
+    llm = FakeLLM('{"destination": "Rome", "start_date": "2099-01-01", "end_date": "2099-01-05"}')
+    agent = DestinationParserAgent(llm=llm)
+    agent.run({"user_input": "to Rome 2020-01-01 to 2020-01-05"})
+    assert len(llm.prompts) == 1
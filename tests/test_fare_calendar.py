@@ -0,0 +1,95 @@
+"""
+tests/test_fare_calendar.py
+---------------------------
+OFFLINE tests for the flexible-date price calendar against the fake Amadeus server.
+"""
+
+import threading
+import time
+from datetime import date
+
+import numpy as np
+
+from src.integrations.travel_scraper.fare_calendar import search_price_calendar
+from src.integrations.travel_scraper.flights import FlightQuery
+
+PATH = "/v2/shopping/flight-offers"
+
+
+def _fare_routes(fake, delay=0.0, in_flight=None, fail_depart=None):
+    lock = threading.Lock()
+
+    def handler(p):
+        if in_flight is not None:
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(delay)
+        if in_flight is not None:
+            with lock:
+                in_flight["now"] -= 1
+        if p["departureDate"] == fail_depart:
+            return 400, {"errors": ["boom"]}
+        # price = 100 * depart day-of-month + return day-of-month
+        d = date.fromisoformat(p["departureDate"]).day
+        r = date.fromisoformat(p["returnDate"]).day if "returnDate" in p else 0
+        price = 100 * d + r
+        return 200, {
+            "data": [
+                {"id": "a", "price": {"grandTotal": f"{price + 50}.00"}},
+                {"id": "b", "price": {"grandTotal": f"{price}.00"}},
+            ]
+        }
+
+    fake.route(PATH, handler)
+
+
+def test_calendar_grid_prices_and_highlights(fake_amadeus, shared_client):
+    _fare_routes(fake_amadeus)
+    q = FlightQuery("LHE", "ROM", "2025-09-12", "2025-09-14")
+
+    cal = search_price_calendar(q, depart_days=2, return_days=1)
+
+    assert cal.depart_dates[0] == "2025-09-10" and cal.depart_dates[-1] == "2025-09-14"
+    assert cal.return_dates == ["2025-09-13", "2025-09-14", "2025-09-15"]
+    assert cal.prices.shape == (5, 3)
+    assert cal.prices[2, 1] == 1214.0  # the requested dates
+    assert np.isnan(cal.prices[4, 0])  # return before departure: never searched
+    assert fake_amadeus.count(PATH) == 14
+    assert cal.cheapest(2) == [
+        ("2025-09-10", "2025-09-13", 1013.0),
+        ("2025-09-10", "2025-09-14", 1014.0),
+    ]
+    assert cal.cheapest_mask(2).sum() == 2
+    assert "1,013*" in cal.render(highlight=2)
+
+
+def test_calendar_reuses_cached_cells(fake_amadeus, shared_client):
+    from src.integrations.travel_scraper.flights import search_flights
+
+    _fare_routes(fake_amadeus)
+    q = FlightQuery("LHE", "ROM", "2025-09-12", "2025-09-14")
+    search_flights(q)  # the user's normal search warms the centre cell
+
+    first = search_price_calendar(q, depart_days=1, return_days=1)
+    assert (first.cached_cells, first.fetched_cells) == (1, 8)
+
+    again = search_price_calendar(q, depart_days=1, return_days=1)
+    assert (again.cached_cells, again.fetched_cells) == (9, 0)
+    assert fake_amadeus.count(PATH) == 9
+    np.testing.assert_array_equal(first.prices, again.prices)
+
+
+def test_calendar_runs_concurrently_within_limits(fake_amadeus, shared_client):
+    in_flight = {"now": 0, "max": 0}
+    _fare_routes(fake_amadeus, delay=0.05, in_flight=in_flight, fail_depart="2025-09-13")
+    q = FlightQuery("LHE", "ROM", "2025-09-12")  # one-way: a single column
+
+    t0 = time.monotonic()
+    cal = search_price_calendar(q, depart_days=3, max_parallel=3)
+    elapsed = time.monotonic() - t0
+
+    assert cal.return_dates == [None] and cal.prices.shape == (7, 1)
+    assert cal.failed == [("2025-09-13", None)] and np.isnan(cal.prices[4, 0])
+    assert 1 < in_flight["max"] <= 3
+    assert elapsed < 7 * 0.05
@@ -0,0 +1,81 @@
+"""
+tests/test_flight_hotel_agent.py
+--------------------------------
+OFFLINE tests for FlightHotelScraperAgent's concurrent fan-out.
+The Amadeus-facing functions are swapped for slow fakes so timing is observable.
+"""
+
+import time
+from types import SimpleNamespace
+
+from src.agents import flight_hotel_scraper as fhs
+
+
+def _state():
+    return SimpleNamespace(
+        trip_request={
+            "origin": "LHE",
+            "destination": "Rome",
+            "start_date": "2025-09-12",
+            "end_date": "2025-09-17",
+            "budget": None,
+        },
+        home_iata=None,
+        currency="USD",
+    )
+
+
+def _patch_slow(monkeypatch, delay, flights_delay=None):
+    def codes(name):
+        time.sleep(delay)
+        return {"city": name[:3].upper(), "airport": name[:3].upper()}
+
+    def flights(q):
+        time.sleep(delay if flights_delay is None else flights_delay)
+        return [{"id": "F1", "price": {"grandTotal": "500.00"}}], 0.0
+
+    def hotels(q):
+        time.sleep(delay)
+        yield [{"hotel_id": "H1", "cheapest": None}], 0.0
+
+    monkeypatch.setattr(fhs, "city_to_codes", codes)
+    monkeypatch.setattr(fhs, "search_flights_with_age", flights)
+    monkeypatch.setattr(fhs, "iter_hotel_summaries_with_age", hotels)
+    monkeypatch.setattr(fhs, "summarize_offers_airports_and_carriers", lambda o: o)
+
+
+def test_branches_run_concurrently(monkeypatch):
+    _patch_slow(monkeypatch, delay=0.3)
+    agent = fhs.FlightHotelScraperAgent()
+
+    t0 = time.monotonic()
+    out = agent.run(_state())
+    elapsed = time.monotonic() - t0
+
+    # Sequential would be 4 x 0.3s = 1.2s; fan-out is ~2 x 0.3s
+    assert elapsed < 0.9
+    assert [f["id"] for f in out["flight_options"]] == ["F1"]
+    assert [h["hotel_id"] for h in out["hotel_options"]] == ["H1"]
+
+
+def test_slow_branch_times_out_without_blocking_the_other(monkeypatch):
+    _patch_slow(monkeypatch, delay=0.05, flights_delay=2.0)
+    agent = fhs.FlightHotelScraperAgent(flights_timeout=0.2)
+
+    t0 = time.monotonic()
+    out = agent.run(_state())
+
+    assert time.monotonic() - t0 < 1.0
+    assert out["flight_options"] == []
+    assert len(out["hotel_options"]) == 1
+
+
+def test_results_are_stamped_with_freshness_age(monkeypatch):
+    _patch_slow(monkeypatch, delay=0.0)
+    monkeypatch.setattr(
+        fhs, "search_flights_with_age", lambda q: ([{"id": "F1"}], 754.321)
+    )
+    out = fhs.FlightHotelScraperAgent().run(_state())
+
+    assert out["flight_options"][0]["freshness_age_s"] == 754.3
+    assert out["hotel_options"][0]["freshness_age_s"] == 0.0
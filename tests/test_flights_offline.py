@@ -0,0 +1,94 @@
+"""
+tests/test_flights_offline.py
+-----------------------------
+OFFLINE tests for flight filter pushdown + the client-side fallback filter,
+against the fake Amadeus server. The live-API smoke test is tests/test_flights.py.
+"""
+
+from src.integrations.travel_scraper.flights import FlightQuery, search_flights
+
+PATH = "/v2/shopping/flight-offers"
+
+
+def _offer(oid, total, *carriers):
+    segs = [
+        {"departure": {"iataCode": "LHE"}, "arrival": {"iataCode": "FCO"}, "carrierCode": c}
+        for c in carriers
+    ]
+    return {"id": oid, "price": {"grandTotal": total}, "itineraries": [{"segments": segs}]}
+
+
+OFFERS = [
+    _offer("cheap-direct", "400.00", "QR"),
+    _offer("cheap-1stop", "450.00", "QR", "AZ"),
+    _offer("pricey", "900.00", "EK"),
+    _offer("no-price", None, "PK"),
+]
+
+
+def _route(fake, seen):
+    def handler(p):
+        seen.append(p)
+        return 200, {"data": OFFERS}  # a server that IGNORES every filter
+
+    fake.route(PATH, handler)
+
+
+def _ids(offers):
+    return [o["id"] for o in offers]
+
+
+def test_filters_are_pushed_down_as_api_params(fake_amadeus, shared_client):
+    seen = []
+    _route(fake_amadeus, seen)
+
+    search_flights(
+        FlightQuery(
+            "LHE", "ROM", "2025-09-12", adults=2, max_price=901.5, non_stop=True,
+            included_airlines=["qr", " AZ", "QR"],
+        )
+    )
+
+    (params,) = seen
+    assert params["maxPrice"] == "451"  # per traveler, rounded up
+    assert params["nonStop"] == "true"
+    assert params["includedAirlineCodes"] == "AZ,QR"
+    assert "excludedAirlineCodes" not in params
+
+
+def test_client_side_filter_covers_what_the_api_ignored(fake_amadeus, shared_client):
+    _route(fake_amadeus, [])
+
+    q = lambda **kw: FlightQuery("LHE", "ROM", "2025-09-12", **kw)
+    assert _ids(search_flights(q(max_price=500))) == ["cheap-direct", "cheap-1stop", "no-price"]
+    assert _ids(search_flights(q(non_stop=True))) == ["cheap-direct", "pricey", "no-price"]
+    assert _ids(search_flights(q(included_airlines=["QR"]))) == ["cheap-direct"]
+    assert _ids(search_flights(q(excluded_airlines=["qr"]))) == ["pricey", "no-price"]
+    assert _ids(search_flights(q())) == _ids(OFFERS)
+
+
+def test_both_airline_lists_push_only_the_inclusions(fake_amadeus, shared_client):
+    seen = []
+    _route(fake_amadeus, seen)
+
+    offers = search_flights(
+        FlightQuery(
+            "LHE", "ROM", "2025-09-12",
+            included_airlines=["QR", "AZ"], excluded_airlines=["AZ"],
+        )
+    )
+
+    assert seen[0]["includedAirlineCodes"] == "AZ,QR"
+    assert "excludedAirlineCodes" not in seen[0]
+    assert _ids(offers) == ["cheap-direct"]
+
+
+def test_pushdown_can_be_disabled(fake_amadeus, shared_client, monkeypatch):
+    monkeypatch.setenv("FLIGHT_FILTER_PUSHDOWN", "0")
+    seen = []
+    _route(fake_amadeus, seen)
+
+    offers = search_flights(FlightQuery("LHE", "ROM", "2025-09-12", max_price=500))
+
+    assert "maxPrice" not in seen[0]
+    assert _ids(offers) == ["cheap-direct", "cheap-1stop", "no-price"]
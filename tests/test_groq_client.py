@@ -0,0 +1,217 @@
+"""
+tests/test_groq_client.py
+-------------------------
+OFFLINE tests for the shared Groq client (timeouts, retries, metrics) against
+the fake server from conftest.py.
+"""
+
+import time
+
+import pytest
+
+from src.agents.packing_list_agent import PackingListAgent
+from src.integrations.groq_client import GroqClient, GroqError
+from src.integrations.travel_scraper.amadeus_client import (
+    PoolConfig,
+    RetryPolicy,
+    _build_session,
+)
+
+PATH = "/chat/completions"
+
+
+def _reply(text, prompt_tokens=10, completion_tokens=5):
+    return {
+        "choices": [{"message": {"content": text}}],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def _client(fake, **kw):
+    kw.setdefault("retry_policy", RetryPolicy(max_retries=2, backoff_base=0.01))
+    return GroqClient(
+        "key",
+        base_url=fake.base_url,
+        session=_build_session(PoolConfig()),
+        **kw,
+    )
+
+
+def test_complete_sends_payload_and_records_usage(fake_amadeus):
+    seen = []
+    fake_amadeus.route(PATH, lambda body: seen.append(body) or (200, _reply("hi")))
+    cli = _client(fake_amadeus, model="m1")
+
+    assert cli.complete("hello", max_tokens=20, temperature=0.0) == "hi"
+    assert seen[0]["model"] == "m1" and seen[0]["max_tokens"] == 20
+    assert seen[0]["messages"] == [{"role": "user", "content": "hello"}]
+
+    stats = cli.stats()
+    assert stats["calls"] == 1 and stats["errors"] == 0
+    assert stats["total_tokens"] == 15
+    assert stats["last_call"]["attempts"] == 1 and stats["last_call"]["ok"]
+
+
+def test_retries_429_and_5xx_then_succeeds(fake_amadeus):
+    statuses = iter([(429, {"error": "slow down"}, {"Retry-After": "0"}), (503, {})])
+
+    def handler(_body):
+        return next(statuses, (200, _reply("ok")))
+
+    fake_amadeus.route(PATH, handler)
+    cli = _client(fake_amadeus)
+
+    assert cli.complete("x") == "ok"
+    assert fake_amadeus.count(PATH) == 3
+    assert cli.stats()["retries"] == 2
+
+
+def test_gives_up_after_max_retries(fake_amadeus):
+    fake_amadeus.route(PATH, lambda _b: (500, {"error": "down"}))
+    cli = _client(fake_amadeus)
+
+    with pytest.raises(GroqError, match="500"):
+        cli.complete("x")
+    assert fake_amadeus.count(PATH) == 3
+    assert cli.stats()["errors"] == 1
+
+
+def test_read_timeout_is_enforced_and_retried(fake_amadeus):
+    calls = []
+
+    def handler(_body):
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.5)  # hung first call
+        return 200, _reply("late but fine")
+
+    fake_amadeus.route(PATH, handler)
+    cli = _client(fake_amadeus, timeout=(1, 0.2))
+
+    t0 = time.monotonic()
+    assert cli.complete("x") == "late but fine"
+    assert time.monotonic() - t0 < 0.5 + 0.2
+    assert cli.stats()["retries"] == 1
+
+
+def test_missing_key_fails_fast():
+    with pytest.raises(GroqError, match="GROQ_API_KEY"):
+        GroqClient(api_key="").complete("x")
+
+
+def test_agents_use_the_injected_client(fake_amadeus):
+    fake_amadeus.route(PATH, lambda _b: (200, _reply('["Passport", " Charger "]')))
+    cli = _client(fake_amadeus)
+    state = type("S", (), {"trip_request": {"destination": "Rome"}})()
+
+    out = PackingListAgent(llm=cli).run(state)
+    assert out == {"packing_list": ["Passport", "Charger"]}
+    assert cli.stats()["calls"] == 1
+
+
+def _sse(deltas, pause=0.0, usage=None):
+    """Generator route body: one SSE event per delta, then usage + [DONE]."""
+    import json
+
+    for i, d in enumerate(deltas):
+        if i and pause:
+            time.sleep(pause)
+        # raw UTF-8 (no \u escapes), like Groq sends it
+        delta = {"choices": [{"delta": {"content": d}}]}
+        yield "data: " + json.dumps(delta, ensure_ascii=False) + "\n\n"
+    if usage:
+        yield "data: " + json.dumps({"choices": [], "x_groq": {"usage": usage}}) + "\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def test_stream_complete_yields_deltas_and_records_usage(fake_amadeus):
+    seen = []
+
+    def handler(body):
+        seen.append(body)
+        usage = {"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10}
+        return 200, _sse(["Hel", "lo", "!"], usage=usage)
+
+    fake_amadeus.route(PATH, handler)
+    cli = _client(fake_amadeus)
+
+    assert list(cli.stream_complete("hi")) == ["Hel", "lo", "!"]
+    assert seen[0]["stream"] is True
+    stats = cli.stats()
+    assert stats["total_tokens"] == 10
+    assert stats["last_call"]["ok"] and stats["last_call"]["first_token_s"] is not None
+
+
+def test_stream_decodes_utf8_without_a_charset(fake_amadeus):
+    # text/event-stream without "; charset=" would default to ISO-8859-1
+    fake_amadeus.route(PATH, lambda _b: (200, _sse(["Day 1: Caf", "é — Colosseum"])))
+    cli = _client(fake_amadeus)
+
+    assert "".join(cli.stream_complete("x")) == "Day 1: Café — Colosseum"
+
+
+def test_stream_retries_before_the_first_byte(fake_amadeus):
+    statuses = iter([(503, {})])
+    fake_amadeus.route(PATH, lambda _b: next(statuses, (200, _sse(["ok"]))))
+    cli = _client(fake_amadeus)
+
+    assert "".join(cli.stream_complete("x")) == "ok"
+    assert cli.stats()["retries"] == 1
+
+
+def test_itinerary_days_are_emitted_before_the_stream_ends(fake_amadeus):
+    from src.agents.itinerary_agent import ItineraryAgent
+
+    deltas = ['Here you go: ["Day 1: Colos', 'seum", ', '"Day 2: Vatican"', "]"]
+    fake_amadeus.route(PATH, lambda _b: (200, _sse(deltas, pause=0.3)))
+    agent = ItineraryAgent(llm=_client(fake_amadeus), use_cache=False, stream=True)
+
+    t0 = time.monotonic()
+    events = []
+    parser, _text = agent._stream_days(
+        {"destination": "Rome"}, lambda e: events.append((time.monotonic() - t0, e))
+    )
+    total = time.monotonic() - t0
+
+    assert [e["day"] for _t, e in events] == ["Day 1: Colosseum", "Day 2: Vatican"]
+    assert [e["index"] for _t, e in events] == [0, 1]
+    first_day_at = events[0][0]
+    assert first_day_at < total - 0.3  # day 1 was out well before the end
+    assert parser.done and parser.items == ["Day 1: Colosseum", "Day 2: Vatican"]
+
+
+def test_streamed_itinerary_run_returns_days_and_caches_them(fake_amadeus):
+    from src.agents.itinerary_agent import ItineraryAgent
+
+    fake_amadeus.route(PATH, lambda _b: (200, _sse(['["Day 1: A", "Day 2: B"]'])))
+    agent = ItineraryAgent(llm=_client(fake_amadeus), stream=True)
+    trip = {"destination": "Rome", "start_date": "2025-09-12", "end_date": "2025-09-13"}
+    state = type("S", (), {"trip_request": trip})()
+
+    assert agent.run(state) == {"itinerary": ["Day 1: A", "Day 2: B"]}
+    assert agent.run(state) == {"itinerary": ["Day 1: A", "Day 2: B"]}
+    assert fake_amadeus.count(PATH) == 1
+
+
+def test_days_recovered_after_a_stalled_stream_are_still_emitted(fake_amadeus, monkeypatch):
+    from src.agents import itinerary_agent
+    from src.utils.json_stream import JsonArrayStream
+
+    class StallingParser(JsonArrayStream):
+        # gives up after the first element, so run() has to fall back
+        def feed(self, text):
+            return [] if self.items else super().feed(text)
+
+    events = []
+    monkeypatch.setattr(itinerary_agent, "JsonArrayStream", StallingParser)
+    monkeypatch.setattr(itinerary_agent, "stream_writer", lambda: events.append)
+    fake_amadeus.route(PATH, lambda _b: (200, _sse(['["Day 1: A", ', '"Day 2: B"]'])))
+    agent = itinerary_agent.ItineraryAgent(llm=_client(fake_amadeus), use_cache=False, stream=True)
+    state = type("S", (), {"trip_request": {"destination": "Rome"}})()
+
+    assert agent.run(state) == {"itinerary": ["Day 1: A", "Day 2: B"]}
+    assert [(e["index"], e["day"]) for e in events] == [(0, "Day 1: A"), (1, "Day 2: B")]
@@ -0,0 +1,256 @@
+"""
+tests/test_hotels_offline.py
+----------------------------
+OFFLINE tests for the hotel flow (chunked offers) against the fake Amadeus server.
+The live-API smoke test stays in tests/test_hotels.py.
+"""
+
+import asyncio
+import threading
+import time
+
+from src.integrations.travel_scraper import async_client
+from src.integrations.travel_scraper.hotels import (
+    HotelQuery,
+    search_hotels,
+    search_hotels_async,
+)
+
+LIST = "/v1/reference-data/locations/hotels/by-city"
+OFFERS = "/v3/shopping/hotel-offers"
+
+
+def _hotel_routes(fake, n_hotels, fail_ids=(), delay=0.0, in_flight=None):
+    fake.route(
+        LIST, lambda p: (200, {"data": [{"hotelId": f"H{i:03d}"} for i in range(n_hotels)]})
+    )
+    lock = threading.Lock()
+
+    def offers(p):
+        ids = p["hotelIds"].split(",")
+        if in_flight is not None:
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(delay)
+        if in_flight is not None:
+            with lock:
+                in_flight["now"] -= 1
+        if any(h in fail_ids for h in ids):
+            return 500, {"errors": ["boom"]}
+        return 200, {"data": [{"hotel": {"hotelId": h}, "offers": []} for h in ids]}
+
+    fake.route(OFFERS, offers)
+
+
+def _query(**kw):
+    return HotelQuery("ROM", "2025-09-12", "2025-09-17", **kw)
+
+
+def test_offers_are_fetched_in_bounded_parallel_chunks(fake_amadeus, shared_client):
+    in_flight = {"now": 0, "max": 0}
+    _hotel_routes(fake_amadeus, 100, delay=0.05, in_flight=in_flight)
+
+    offers, hotel_list = search_hotels(_query(max_hotels=100, chunk_size=10, max_parallel=3))
+
+    assert len(hotel_list) == 100
+    assert sorted(o["hotel"]["hotelId"] for o in offers) == [f"H{i:03d}" for i in range(100)]
+    assert fake_amadeus.count(OFFERS) == 10
+    assert 1 < in_flight["max"] <= 3
+
+
+def test_failed_chunk_only_drops_its_own_hotels(fake_amadeus, shared_client):
+    _hotel_routes(fake_amadeus, 30, fail_ids={"H015"})
+
+    offers, _ = search_hotels(_query(max_hotels=30, chunk_size=10))
+
+    got = {o["hotel"]["hotelId"] for o in offers}
+    assert len(got) == 20
+    assert not any(f"H{i:03d}" in got for i in range(10, 20))
+
+
+def test_async_chunks(fake_amadeus):
+    _hotel_routes(fake_amadeus, 25, fail_ids={"H000"})
+
+    async def main():
+        cli = async_client.AsyncAmadeusClient("k", "s", base_url=fake_amadeus.base_url)
+        async_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = cli
+        try:
+            return await search_hotels_async(_query(max_hotels=25, chunk_size=10))
+        finally:
+            await cli.aclose()
+
+    offers, _ = asyncio.run(main())
+    assert len(offers) == 15
+
+
+def test_hotel_list_catalogue_is_cached_compact_and_indexed(fake_amadeus, shared_client):
+    from src.integrations.travel_scraper import hotels
+    from src.integrations.travel_scraper.parsing_hotels import summarize_hotels_offers
+
+    raw = {
+        "hotelId": "H000",
+        "name": "Hotel Roma",
+        "chainCode": "XX",
+        "dupeId": 123,
+        "geoCode": {"latitude": 41.9, "longitude": 12.5},
+        "address": {"lines": ["Via Roma 1"], "cityName": "ROME", "countryCode": "IT"},
+    }
+    fake_amadeus.route(LIST, lambda p: (200, {"data": [raw]}))
+    fake_amadeus.route(
+        OFFERS,
+        lambda p: (200, {"data": [{"hotel": {"hotelId": "H000"}, "offers": []}]}),
+    )
+
+    search_hotels(_query())
+    search_hotels(_query())
+    cat = hotels.get_city_catalogue("rom")
+    assert fake_amadeus.count(LIST) == 1
+    assert cat.hotels == [
+        {
+            "hotelId": "H000",
+            "name": "Hotel Roma",
+            "address": {"lines": ["Via Roma 1"], "cityName": "ROME", "countryCode": "IT"},
+            "latitude": 41.9,
+            "longitude": 12.5,
+        }
+    ]
+
+    # A fresh process (empty memo) loads the catalogue from disk, not the API
+    hotels._CATALOGUES.clear()
+    offers, hotel_list = search_hotels(_query())
+    assert fake_amadeus.count(LIST) == 1
+
+    index = hotels.catalogue_index("ROM", hotel_list)
+    assert index is hotels.get_city_catalogue("ROM").index
+    (summary,) = summarize_hotels_offers(offers, list_index=index)
+    assert summary["address"] == "Via Roma 1, ROME, IT"
+    assert summary["geo"] == {"lat": 41.9, "lng": 12.5}
+
+
+def test_empty_hotel_list_is_not_cached(fake_amadeus, shared_client):
+    fake_amadeus.route(LIST, lambda p: (200, {"data": []}))
+
+    assert search_hotels(_query()) == ([], [])
+    search_hotels(_query())
+
+    assert fake_amadeus.count(LIST) == 2
+
+
+def _priced_offers(p):
+    # price = numeric part of the id, so H005 costs 5.00
+    return 200, {
+        "data": [
+            {"hotel": {"hotelId": h}, "offers": [{"price": {"total": f"{int(h[1:])}.00"}}]}
+            for h in p["hotelIds"].split(",")
+        ]
+    }
+
+
+def test_cheapest_hotels_keeps_top_k():
+    from src.integrations.travel_scraper.parsing_hotels import CheapestHotels
+
+    top = CheapestHotels(k=3)
+    for price in [50, None, 10, 40, 10, 30, 5]:
+        cheapest = {"total": str(price)} if price is not None else None
+        top.add({"id": f"{price}-{top.seen}", "cheapest": cheapest})
+
+    assert [h["id"] for h in top.top()] == ["5-6", "10-2", "10-4"]
+    assert top.seen == 7 and len(top) == 3
+
+
+def test_iter_hotel_summaries_yields_each_chunk(fake_amadeus, shared_client):
+    from src.integrations.travel_scraper.hotels import iter_hotel_summaries
+
+    fake_amadeus.route(
+        LIST, lambda p: (200, {"data": [{"hotelId": f"H{i:03d}"} for i in range(30, 0, -1)]})
+    )
+    fake_amadeus.route(OFFERS, _priced_offers)
+
+    batches = list(iter_hotel_summaries(_query(max_hotels=30, chunk_size=10)))
+
+    assert len(batches) == 3
+    for batch in batches:
+        prices = [float(s["cheapest"]["total"]) for s in batch]
+        assert len(prices) == 10 and prices == sorted(prices)
+
+
+def test_aiter_hotel_summaries(fake_amadeus):
+    from src.integrations.travel_scraper.hotels import aiter_hotel_summaries
+
+    fake_amadeus.route(
+        LIST, lambda p: (200, {"data": [{"hotelId": f"H{i:03d}"} for i in range(1, 16)]})
+    )
+    fake_amadeus.route(OFFERS, _priced_offers)
+
+    async def main():
+        cli = async_client.AsyncAmadeusClient("k", "s", base_url=fake_amadeus.base_url)
+        async_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = cli
+        try:
+            return [b async for b in aiter_hotel_summaries(_query(chunk_size=10))]
+        finally:
+            await cli.aclose()
+
+    batches = asyncio.run(main())
+    assert sorted(len(b) for b in batches) == [5, 10]
+
+
+def test_summaries_compute_each_cheapest_offer_once(monkeypatch):
+    from src.integrations.travel_scraper import parsing_hotels as ph
+
+    items = [
+        {"hotel": {"hotelId": "A"}, "offers": [{"price": {"total": "90"}}, {"price": {"total": "70"}}]},
+        {"hotel": {"hotelId": "B"}, "offers": [{"price": {}}, {"price": {"total": "x"}}]},
+        {"hotel": {"hotelId": "C"}, "offers": [{"price": {"total": "70"}}, {"price": {"total": "50"}}]},
+        {"hotel": {"hotelId": "D"}, "offers": [{"id": 1, "price": {"total": "50"}}, {"id": 2, "price": {"total": "50"}}]},
+    ]
+    calls = []
+    real = ph._cheapest_with_total
+    monkeypatch.setattr(ph, "_cheapest_with_total", lambda x: calls.append(1) or real(x))
+
+    out = ph.summarize_hotels_offers(items)
+
+    assert len(calls) == len(items)
+    assert [h["hotel_id"] for h in out] == ["C", "D", "A", "B"]
+    assert [h["cheapest"] and h["cheapest"]["total"] for h in out] == ["50", "50", "70", None]
+    assert ph._cheapest_offer(items[3])["id"] == 1  # ties keep the first offer
+
+
+def _backdate(cache, key, seconds):
+    stored_at, blob = cache.backend.get(key)
+    cache.backend.put(key, (stored_at - seconds, blob))
+
+
+def test_offers_are_cached_and_served_stale_while_refreshing(fake_amadeus, shared_client):
+    from src.integrations.travel_scraper import hotels
+
+    _hotel_routes(fake_amadeus, 20)
+    q = _query(max_hotels=20, chunk_size=10)
+
+    offers, _, age = hotels.search_hotels_with_age(q)
+    assert len(offers) == 20 and age == 0.0
+    # Same search, different chunking: one cached answer, no API call
+    assert len(search_hotels(_query(max_hotels=20, chunk_size=5))[0]) == 20
+    assert fake_amadeus.count(OFFERS) == 2
+
+    cache = hotels._HOTEL_OFFERS_CACHE
+    _backdate(cache, hotels.hotel_query_key(q), cache.ttl + 60)
+    offers, _, age = hotels.search_hotels_with_age(q)
+    assert len(offers) == 20 and age > cache.ttl  # stale answer, instantly
+
+    deadline = time.monotonic() + 2
+    while cache.stats()["refreshes"] < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert fake_amadeus.count(OFFERS) == 4  # background refresh re-fetched
+    assert hotels.search_hotels_with_age(q)[2] < 5
+
+
+def test_incomplete_offers_are_not_cached(fake_amadeus, shared_client):
+    from src.integrations.travel_scraper import hotels
+
+    _hotel_routes(fake_amadeus, 20, fail_ids={"H015"})
+    q = _query(max_hotels=20, chunk_size=10)
+
+    assert len(search_hotels(q)[0]) == 10
+    assert len(search_hotels(q)[0]) == 10
+    assert hotels.hotel_offers_cache_stats()["entries"] == 0
@@ -0,0 +1,42 @@
+"""
+tests/test_json_stream.py
+-------------------------
+Tests for the incremental JSON-array parser (src/utils/json_stream.py).
+"""
+
+import json
+
+from src.utils.json_stream import JsonArrayStream
+
+DAYS = ["Day 1: Colosseum, \"Forum\"", "Day 2: Vatican [museums]", "Day 3: Trastevere, food, {tour}"]
+
+
+def test_elements_are_emitted_as_soon_as_complete_in_any_chunking():
+    text = 'Sure! Here it is:\n```json\n' + json.dumps(DAYS) + "\n```"
+    for size in (1, 3, 7, len(text)):
+        parser = JsonArrayStream()
+        emitted = []
+        for i in range(0, len(text), size):
+            emitted.extend(parser.feed(text[i : i + size]))
+        assert emitted == parser.items == DAYS
+        assert parser.done and parser.skipped == 0
+
+
+def test_first_element_is_available_before_the_array_ends():
+    parser = JsonArrayStream()
+    assert parser.feed('["Day 1: a", "Day 2') == ["Day 1: a"]
+    assert parser.feed(': b"') == []  # not complete until "," or "]"
+    assert parser.feed("]") == ["Day 2: b"]
+
+
+def test_nested_values_and_bad_elements():
+    parser = JsonArrayStream()
+    out = parser.feed('[{"day": 1, "items": [1, 2]}, nonsense, [3], ] trailing [9]')
+    assert out == [{"day": 1, "items": [1, 2]}, [3]]
+    assert parser.skipped == 1 and parser.done
+
+
+def test_unterminated_array_is_not_done():
+    parser = JsonArrayStream()
+    parser.feed('["Day 1", "Day 2"')
+    assert parser.items == ["Day 1"] and not parser.done
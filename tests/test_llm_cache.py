@@ -0,0 +1,128 @@
+"""
+tests/test_llm_cache.py
+-----------------------
+OFFLINE tests for the LLM generation cache (src/integrations/llm_cache.py) and
+its use by ItineraryAgent / PackingListAgent, with a fake LLM client.
+"""
+
+import time
+from types import SimpleNamespace
+
+from src.agents.itinerary_agent import ItineraryAgent
+from src.agents.packing_list_agent import PackingListAgent
+from src.integrations.llm_cache import generation_key, llm_cache_stats, trip_days
+
+
+class FakeLLM:
+    model = "fake-model"
+
+    def __init__(self, reply):
+        self.reply = reply
+        self.calls = 0
+
+    def complete(self, prompt, **kw):
+        self.calls += 1
+        return self.reply
+
+    def stream_complete(self, prompt, **kw):
+        self.calls += 1
+        yield from (self.reply[i : i + 7] for i in range(0, len(self.reply), 7))
+
+
+def _trip(**kw):
+    trip = {
+        "destination": "Rome",
+        "start_date": "2025-09-12",
+        "end_date": "2025-09-16",
+        "preferences": ["history", "food"],
+    }
+    trip.update(kw)
+    return SimpleNamespace(trip_request=trip)
+
+
+def test_signature_normalizes_destination_length_and_preferences():
+    base = _trip().trip_request
+    same = _trip(
+        destination="  rome ",
+        start_date="2026-01-01",
+        end_date="2026-01-05",  # other dates, same 5 days
+        preferences=["Food", "history", "food"],
+    ).trip_request
+
+    assert trip_days("2025-09-12", "2025-09-16") == 5
+    assert generation_key("itinerary", base, "m", 0.7) == generation_key("itinerary", same, "m", 0.8)
+    assert generation_key("itinerary", base, "m", 0.7) != generation_key("itinerary", base, "m", 0.2)
+    assert generation_key("itinerary", base, "m", 0.7) != generation_key("packing_list", base, "m", 0.7)
+    assert generation_key("itinerary", base, "m", 0.7) != generation_key("itinerary", base, "other", 0.7)
+    longer = _trip(end_date="2025-09-18").trip_request
+    assert generation_key("itinerary", base, "m", 0.7) != generation_key("itinerary", longer, "m", 0.7)
+
+
+def test_repeated_itinerary_is_served_from_cache():
+    llm = FakeLLM('["Day 1: Colosseum", "Day 2: Trastevere"]')
+    agent = ItineraryAgent(llm=llm)
+
+    first = agent.run(_trip())
+    t0 = time.perf_counter()
+    second = agent.run(_trip(destination="rome", preferences=["food", "history"]))
+    elapsed = time.perf_counter() - t0
+
+    assert first == second == {"itinerary": ["Day 1: Colosseum", "Day 2: Trastevere"]}
+    assert llm.calls == 1
+    assert elapsed < 0.05  # no LLM round trip
+    stats = llm_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1) and stats["hit_rate"] == 0.5
+
+
+def test_trips_of_unknown_length_are_not_cached():
+    llm = FakeLLM('["Day 1: Colosseum"]')
+    agent = ItineraryAgent(llm=llm)
+    short = _trip(start_date="September 12th", end_date="September 14th")
+    long = _trip(start_date="September 12th", end_date="September 21st")
+
+    assert generation_key("itinerary", short.trip_request, "m", 0.7) is None
+    agent.run(short)
+    agent.run(long)
+    assert llm.calls == 2
+    stats = llm_cache_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (0, 0, 0)
+
+
+def test_unparseable_generation_is_not_cached():
+    llm = FakeLLM("Sorry, I can't do that.")
+    agent = PackingListAgent(llm=llm)
+
+    assert agent.run(_trip())["packing_list"] == []
+    agent.run(_trip())
+    assert llm.calls == 2
+
+
+def test_cache_can_be_disabled_per_agent():
+    llm = FakeLLM('["Passport"]')
+    agent = PackingListAgent(llm=llm, use_cache=False)
+    agent.run(_trip())
+    agent.run(_trip())
+    assert llm.calls == 2
+
+
+def test_opted_out_agent_does_not_overwrite_shared_entries():
+    shared = PackingListAgent(llm=FakeLLM('["Passport"]'))
+    shared.run(_trip())
+    PackingListAgent(llm=FakeLLM('["Sunscreen"]'), use_cache=False).run(_trip())
+
+    fresh = FakeLLM('["unused"]')
+    assert PackingListAgent(llm=fresh).run(_trip())["packing_list"] == ["Passport"]
+    assert fresh.calls == 0
+
+
+def test_disk_store_survives_a_new_process(monkeypatch, tmp_path):
+    from src.integrations import llm_cache
+
+    monkeypatch.setenv("LLM_CACHE_BACKEND", "disk")
+    llm = FakeLLM('["Passport"]')
+    PackingListAgent(llm=llm).run(_trip())
+
+    monkeypatch.setattr(llm_cache, "_CACHE", None)  # as if restarted
+    assert PackingListAgent(llm=llm).run(_trip()) == {"packing_list": ["Passport"]}
+    assert llm.calls == 1
+    assert (tmp_path / "cache" / "llm.sqlite").exists()
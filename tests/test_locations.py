@@ -0,0 +1,97 @@
+"""
+tests/test_locations.py
+-----------------------
+OFFLINE tests for the IATA LocationIndex and city_to_codes() fallbacks.
+"""
+
+from src.integrations.travel_scraper.locations import LocationIndex, get_location_index
+from src.integrations.travel_scraper.reference import city_to_codes
+
+PATH = "/v1/reference-data/locations"
+
+
+def test_names_aliases_codes_and_airports():
+    idx = LocationIndex()
+    assert idx.resolve("Rome") == {"city": "ROM", "airport": "FCO"}
+    assert idx.resolve("  roma ") == {"city": "ROM", "airport": "FCO"}
+    assert idx.resolve("ROM") == {"city": "ROM", "airport": "FCO"}
+    assert idx.resolve("CIA") == {"city": "ROM", "airport": "CIA"}
+    assert idx.resolve("london") == {"city": "LON", "airport": "LHR"}
+    assert idx.resolve("Sao Paulo") == idx.resolve("São Paulo")
+    assert idx.resolve("lhe") == {"city": "LHE", "airport": "LHE"}
+
+
+def test_prefix_and_fuzzy_only_for_longer_inputs():
+    idx = LocationIndex()
+    assert idx.resolve("Barcel")["city"] == "BCN"
+    assert idx.resolve("Barcelonna")["city"] == "BCN"
+    assert idx.resolve("Bar") is None  # Montenegro's Bar must not become BCN/BAR
+
+
+def test_offline_hits_skip_the_api(fake_amadeus, shared_client):
+    fake_amadeus.route(PATH, lambda p: (200, {"data": []}))
+    assert city_to_codes("Tokyo") == {"city": "TYO", "airport": "HND"}
+    assert city_to_codes("XYZ") == {"city": "XYZ", "airport": "XYZ"}
+    assert fake_amadeus.count(PATH) == 0
+
+
+def test_misses_go_to_api_and_are_written_back(fake_amadeus, shared_client, tmp_path):
+    fake_amadeus.route(
+        PATH,
+        lambda p: (
+            200,
+            {
+                "data": [
+                    {"subType": "AIRPORT", "iataCode": "TGD"},
+                    {"subType": "CITY", "iataCode": "TGD"},
+                ]
+            },
+        ),
+    )
+    assert city_to_codes("Bar") == {"city": "TGD", "airport": "TGD"}
+    assert city_to_codes("Bar") == {"city": "TGD", "airport": "TGD"}
+    assert fake_amadeus.count(PATH) == 1
+
+    # learned entries survive a restart (new index, same cache dir)
+    learned = get_location_index()._learned_path
+    assert LocationIndex(learned_path=learned).resolve("Bar")["city"] == "TGD"
+
+
+def test_concurrent_learn_and_fuzzy_lookups():
+    import sys
+    import threading
+
+    idx = LocationIndex()
+    errors = []
+
+    def learner():
+        try:
+            for i in range(1000):
+                idx.learn(f"Newtown {i}", {"city": f"N{i % 100:02d}"})
+        except Exception as e:  # pragma: no cover - the failure being tested
+            errors.append(e)
+
+    def reader():
+        try:
+            for _ in range(60):
+                assert idx.resolve("Barcelonna")["city"] == "BCN"  # fuzzy path
+                idx.resolve("Zzyzx Springs")  # miss: full fuzzy scan
+        except Exception as e:  # pragma: no cover
+            errors.append(e)
+
+    threads = [threading.Thread(target=learner)] + [
+        threading.Thread(target=reader) for _ in range(4)
+    ]
+    # switch threads often so a lookup overlaps a learn() mid-iteration
+    old = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        sys.setswitchinterval(old)
+
+    assert errors == []
+    assert idx.resolve("Newtown 999")["city"] == "N99"
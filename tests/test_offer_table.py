@@ -0,0 +1,104 @@
+"""
+tests/test_offer_table.py
+-------------------------
+OFFLINE tests for FlightOfferTable (pure NumPy, no network).
+"""
+
+import numpy as np
+
+from src.integrations.travel_scraper import parsing
+from src.integrations.travel_scraper.offer_table import FlightOfferTable
+from src.integrations.travel_scraper.parsing import summarize_offers_airports_and_carriers
+
+
+def _seg(frm, to, dep, arr, code):
+    return {
+        "departure": {"iataCode": frm, "at": dep},
+        "arrival": {"iataCode": to, "at": arr},
+        "carrierCode": code,
+    }
+
+
+def _offer(oid, price, carriers=("QR",), duration="PT10H", dep="2025-09-12T10:00:00"):
+    segs = [
+        _seg("LHE", "DOH" if len(carriers) > 1 else "FCO", dep, "2025-09-12T14:00:00", carriers[0])
+    ]
+    if len(carriers) > 1:
+        segs.append(_seg("DOH", "FCO", "2025-09-12T16:00:00", "2025-09-12T20:00:00", carriers[1]))
+    return {
+        "id": oid,
+        "price": {"grandTotal": price, "currency": "USD"},
+        "itineraries": [{"duration": duration, "segments": segs}],
+    }
+
+
+OFFERS = [
+    _offer("a", "700.00", ("QR", "QR")),
+    _offer("b", "450.00", ("EK",), duration="P1DT2H"),
+    _offer("c", None),
+    _offer("d", "450.00", ("EK",), duration="P1DT2H"),  # same itinerary as b
+    _offer("e", "300.00", ("PK", "AZ")),
+]
+
+
+def test_columns_are_flattened_once_into_typed_arrays():
+    t = FlightOfferTable.from_offers(OFFERS)
+
+    assert len(t) == 5
+    assert np.isnan(t["price"][2]) and t["price"][0] == 700.0
+    assert t["stops"].tolist() == [1, 0, 0, 0, 1]
+    assert t["duration_min"].tolist()[:2] == [600.0, 1560.0]
+    assert t["depart"][0] == np.datetime64("2025-09-12T10:00")
+    assert t["destination"].tolist() == ["FCO"] * 5
+    assert t["carriers"][4] == ("PK", "AZ")
+
+
+def test_filter_sort_top_k_and_dedupe():
+    t = FlightOfferTable.from_offers(OFFERS)
+
+    ids = lambda tbl: [o["id"] for o in tbl.to_offers()]
+    assert ids(t.filter(max_price=500)) == ["b", "d", "e"]
+    assert ids(t.filter(max_stops=0)) == ["b", "c", "d"]
+    assert ids(t.filter(include_carriers=["az", "QR"])) == ["a", "c", "e"]
+    assert ids(t.filter(exclude_carriers=["QR"], max_duration_min=900)) == ["e"]
+    assert ids(t.sort_by("price")) == ["e", "b", "d", "a", "c"]
+    assert ids(t.sort_by("price", descending=True)) == ["a", "b", "d", "e", "c"]
+    assert ids(t.top_k(2)) == ["e", "b"]
+    assert ids(t.filter(max_price=1000).top_k(3)) == ["e", "b", "d"]
+    assert ids(t.dedupe()) == ["a", "b", "c", "e"]
+
+
+def test_to_summaries_matches_existing_summary_format(monkeypatch):
+    priced = [o for o in OFFERS if o["price"]["grandTotal"]]
+    names = {c: f"Air {c}" for c in ("QR", "EK", "PK", "AZ")}
+
+    got = FlightOfferTable.from_offers(priced).sort_by("price").to_summaries(names)
+
+    monkeypatch.setattr(parsing, "map_airline_codes_to_names", lambda codes: names)
+    assert got == summarize_offers_airports_and_carriers(priced)
+
+
+def test_only_carriers_keeps_codeshares_marketed_by_an_allowed_airline():
+    # QR-marketed flight operated by AZ: Amadeus' includedAirlineCodes=QR returns it
+    codeshare = _offer("cs", "500.00", ("QR",))
+    codeshare["itineraries"][0]["segments"][0]["operating"] = {"carrierCode": "AZ"}
+    # and the reverse: QR-operated flight sold by another airline (EK)
+    operated = _offer("op", "520.00", ("EK",))
+    operated["itineraries"][0]["segments"][0]["operating"] = {"carrierCode": "QR"}
+    t = FlightOfferTable.from_offers(OFFERS + [codeshare, operated])
+
+    ids = lambda tbl: [o["id"] for o in tbl.to_offers()]
+    assert t["carriers"][5] == ("AZ",)  # display still shows who flies it
+    assert ids(t.filter(only_carriers=["QR"])) == ["a", "c", "cs", "op"]
+    assert ids(t.filter(only_carriers=["AZ"])) == ["cs"]
+
+
+def test_exclude_carriers_drops_codeshares_marketed_by_an_excluded_airline():
+    # QR-marketed flight operated by AZ: excludedAirlineCodes=QR would drop it
+    codeshare = _offer("cs", "500.00", ("QR",))
+    codeshare["itineraries"][0]["segments"][0]["operating"] = {"carrierCode": "AZ"}
+    t = FlightOfferTable.from_offers(OFFERS + [codeshare])
+
+    ids = lambda tbl: [o["id"] for o in tbl.to_offers()]
+    assert ids(t.filter(exclude_carriers=["QR"])) == ["b", "d", "e"]
+    assert ids(t.filter(exclude_carriers=["AZ"])) == ["a", "b", "c", "d"]
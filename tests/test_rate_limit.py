@@ -0,0 +1,134 @@
+"""
+tests/test_rate_limit.py
+------------------------
+OFFLINE tests for the token-bucket limiter and AmadeusClient's 429/5xx retries.
+"""
+
+import multiprocessing
+import threading
+import time
+
+from src.integrations.travel_scraper.amadeus_client import (
+    AmadeusClient,
+    AmadeusError,
+    PoolConfig,
+    RetryPolicy,
+    _build_session,
+    _retry_after,
+    buckets_for,
+)
+from src.utils.rate_limit import RateLimit, RateLimiter
+
+
+def _client(fake, limiter, retries=3):
+    return AmadeusClient(
+        "key",
+        "secret",
+        base_url=fake.base_url,
+        session=_build_session(PoolConfig()),
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_retries=retries, backoff_base=0.01),
+    )
+
+
+def test_token_bucket_allows_burst_then_paces():
+    limiter = RateLimiter(RateLimit(rate=20, burst=2))
+
+    waits = [limiter.reserve("x") for _ in range(5)]
+
+    assert waits[:2] == [0.0, 0.0]
+    # booked ahead: the 3rd..5th caller wait 1, 2, 3 refill intervals (50 ms)
+    for n, w in enumerate(waits[2:], start=1):
+        assert abs(w - n * 0.05) < 0.01
+    stats = limiter.stats()["x"]
+    assert stats["acquired"] == 5 and stats["delayed"] == 3
+    assert abs(stats["wait_max_s"] - 0.15) < 0.01
+
+
+def test_threads_share_the_quota():
+    limiter = RateLimiter(RateLimit(rate=50, burst=1))
+    t0 = time.monotonic()
+    threads = [threading.Thread(target=limiter.acquire, args=("x",)) for _ in range(11)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 1 immediate + 10 paced at 20 ms
+    assert time.monotonic() - t0 >= 0.18
+
+
+def _book(path, out):
+    limiter = RateLimiter(RateLimit(rate=10, burst=1), path=path)
+    out.put(limiter.reserve("x"))
+
+
+def test_processes_share_a_sqlite_bucket(tmp_path):
+    path = tmp_path / "rate.sqlite"
+    out = multiprocessing.get_context("spawn").Queue()
+    procs = [
+        multiprocessing.get_context("spawn").Process(target=_book, args=(path, out))
+        for _ in range(3)
+    ]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+    waits = sorted(out.get(timeout=5) for _ in procs)
+    # one token in the bucket: the other processes were booked behind it
+    assert waits[0] == 0.0 and waits[1] > 0.05 and waits[2] > waits[1]
+
+
+def test_penalty_closes_the_bucket_and_paces_after():
+    limiter = RateLimiter(RateLimit(rate=100, burst=5))
+    limiter.penalize("x", 0.2)
+
+    first, second = limiter.reserve("x"), limiter.reserve("x")
+
+    assert 0.18 < first <= 0.2
+    assert abs(second - first - 0.01) < 0.005  # drained: no burst at reopen
+    assert limiter.stats()["x"]["penalties"] == 1
+
+
+def test_retry_after_parsing():
+    assert _retry_after({"Retry-After": "2"}) == 2.0
+    assert _retry_after({"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0.0
+    assert _retry_after({}) is None
+
+
+def test_endpoint_buckets():
+    limiter = RateLimiter(
+        RateLimit(10, 10),
+        {"/v2/shopping": RateLimit(1, 1), "/v2/shopping/flight-offers": RateLimit(2, 2)},
+    )
+    assert buckets_for(limiter, "/v2/shopping/flight-offers") == ["*", "/v2/shopping/flight-offers"]
+    assert buckets_for(limiter, "/v1/reference-data/airlines") == ["*"]
+
+
+def test_429_and_5xx_are_retried_honoring_retry_after(fake_amadeus):
+    replies = iter(
+        [(429, {"errors": ["slow down"]}, {"Retry-After": "0.2"}), (503, {}), (200, {"data": [1]})]
+    )
+    fake_amadeus.route("/v1/ping", lambda p: next(replies))
+    limiter = RateLimiter(RateLimit(100, 100))
+    cli = _client(fake_amadeus, limiter)
+
+    t0 = time.monotonic()
+    assert cli.get("/v1/ping", {}) == {"data": [1]}
+
+    assert time.monotonic() - t0 >= 0.2
+    assert cli.retries == 2
+    assert fake_amadeus.count("/v1/ping") == 3
+    assert limiter.stats()["*"]["penalties"] == 1
+
+
+def test_retries_give_up_with_amadeus_error(fake_amadeus):
+    fake_amadeus.route("/v1/ping", lambda p: (500, {"errors": ["down"]}))
+    cli = _client(fake_amadeus, RateLimiter(RateLimit(100, 100)), retries=2)
+
+    try:
+        cli.get("/v1/ping", {})
+    except AmadeusError as e:
+        assert "500" in str(e)
+    else:
+        raise AssertionError("expected AmadeusError")
+    assert fake_amadeus.count("/v1/ping") == 3
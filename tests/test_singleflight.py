@@ -0,0 +1,200 @@
+"""
+tests/test_singleflight.py
+--------------------------
+OFFLINE tests for request coalescing: the SingleFlight primitive itself, and
+identical concurrent searches (flights, hotel list, city lookup) reaching the
+fake Amadeus server only once.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.integrations.travel_scraper import async_client, hotels, reference
+from src.integrations.travel_scraper.flights import (
+    FlightQuery,
+    flight_cache_stats,
+    search_flights,
+    search_flights_async,
+)
+from src.utils.singleflight import SingleFlight, stats
+
+
+def _slow(seconds, value, calls):
+    def fn():
+        calls.append(1)
+        time.sleep(seconds)
+        return value
+
+    return fn
+
+
+def _together(n, fn):
+    """Run fn() from n threads released at the same moment."""
+    start = threading.Barrier(n)
+
+    def run():
+        start.wait()
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        return [f.result() for f in [pool.submit(run) for _ in range(n)]]
+
+
+def test_concurrent_calls_share_one_execution():
+    sf = SingleFlight("test-share")
+    calls = []
+    results = _together(8, lambda: sf.do("k", _slow(0.2, {"v": 1}, calls)))
+
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)  # the SAME object
+    assert (sf.calls, sf.coalesced) == (1, 7)
+    assert stats()["test-share"]["in_flight"] == 0
+
+
+def test_errors_are_shared_and_not_remembered():
+    sf = SingleFlight("test-error")
+    calls = []
+
+    def boom():
+        calls.append(1)
+        time.sleep(0.2)
+        raise ValueError("upstream down")
+
+    def call():
+        try:
+            return sf.do("k", boom)
+        except ValueError as e:
+            return str(e)
+
+    assert _together(4, call) == ["upstream down"] * 4
+    assert len(calls) == 1
+    # Nothing is cached: the next call runs again
+    assert sf.do("k", lambda: "ok") == "ok"
+
+
+def test_different_keys_do_not_coalesce():
+    sf = SingleFlight("test-keys")
+    keys = iter(range(4))
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            k = next(keys)
+        return sf.do(k, lambda: time.sleep(0.05) or k)
+
+    assert sorted(_together(4, call)) == [0, 1, 2, 3]
+    assert sf.coalesced == 0
+
+
+def test_do_async_coalesces_on_one_loop():
+    sf = SingleFlight("test-async")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return [1, 2]
+
+    async def main():
+        return await asyncio.gather(*(sf.do_async("k", fetch) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1 and all(r is results[0] for r in results)
+    assert sf.coalesced == 4
+
+
+# -- wired into the searches ---------------------------------------------------
+def _slow_route(fake, path, payload, delay=0.2):
+    def handler(_p):
+        time.sleep(delay)
+        return 200, payload
+
+    fake.route(path, handler)
+
+
+def test_identical_flight_searches_hit_the_api_once(fake_amadeus, shared_client):
+    path = "/v2/shopping/flight-offers"
+    _slow_route(fake_amadeus, path, {"data": [{"id": "1", "price": {"grandTotal": "1"}}]})
+    before = flight_cache_stats()["coalesced"]
+
+    # "rom" / "ROM " normalize to the same key; use_cache=False still coalesces
+    queries = iter([FlightQuery("LHE", "ROM", "2025-09-12"), FlightQuery("lhe", "rom ", "2025-09-12")] * 3)
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            q = next(queries)
+        return search_flights(q, use_cache=False)
+
+    results = _together(6, call)
+    assert fake_amadeus.count(path) == 1
+    assert all(r == results[0] for r in results)
+    assert flight_cache_stats()["coalesced"] - before == 5
+
+
+def test_identical_async_flight_searches_hit_the_api_once(fake_amadeus):
+    path = "/v2/shopping/flight-offers"
+    _slow_route(fake_amadeus, path, {"data": []}, delay=0.1)
+
+    async def main():
+        cli = async_client.AsyncAmadeusClient("k", "s", base_url=fake_amadeus.base_url)
+        async_client._ASYNC_CLIENTS[asyncio.get_running_loop()] = cli
+        try:
+            q = FlightQuery("LHE", "ROM", "2025-09-12")
+            await asyncio.gather(*(search_flights_async(q) for _ in range(4)))
+        finally:
+            await cli.aclose()
+
+    asyncio.run(main())
+    assert fake_amadeus.count(path) == 1
+
+
+def test_identical_hotel_list_lookups_hit_the_api_once(fake_amadeus, shared_client):
+    path = "/v1/reference-data/locations/hotels/by-city"
+    _slow_route(fake_amadeus, path, {"data": [{"hotelId": "H1", "name": "A"}]})
+    before = hotels.hotel_catalogue_stats()["coalesced"]
+
+    results = _together(5, lambda: hotels.list_hotels_by_city("par"))
+    assert fake_amadeus.count(path) == 1
+    assert all(r is results[0] for r in results)
+    assert hotels.hotel_catalogue_stats()["coalesced"] - before == 4
+
+
+def test_identical_city_lookups_hit_the_api_once(fake_amadeus, shared_client):
+    path = "/v1/reference-data/locations"
+    _slow_route(
+        fake_amadeus,
+        path,
+        {"data": [{"subType": "CITY", "iataCode": "TBU"}, {"subType": "AIRPORT", "iataCode": "TBX"}]},
+    )
+    before = reference.coalesced_lookups()
+
+    names = iter(["Timbuktu", "timbuktu ", "TIMBUKTU"])
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            name = next(names)
+        return reference.city_to_codes(name)
+
+    results = _together(3, call)
+    assert fake_amadeus.count(path) == 1
+    assert results == [{"city": "TBU", "airport": "TBX"}] * 3
+    assert results[0] is not results[1]  # callers get their own dict
+    assert reference.coalesced_lookups() - before == 2
+
+
+def test_failed_lookup_propagates_to_every_waiter(fake_amadeus, shared_client):
+    path = "/v1/reference-data/locations"
+    _slow_route(fake_amadeus, path, {"data": []})
+
+    def call():
+        with pytest.raises(Exception, match="No IATA match"):
+            reference.city_to_codes("Nowhere")
+
+    _together(3, call)
+    assert fake_amadeus.count(path) == 1
@@ -0,0 +1,121 @@
+"""
+tests/test_supervisor_graph.py
+------------------------------
+OFFLINE test of the supervisor's fan-out/fan-in topology.
+Each agent's run() is replaced with a slow fake so parallelism is measurable.
+"""
+
+import time
+
+import pytest
+
+from src.agents import supervisor as sup
+
+DELAY = 0.3
+
+
+def _slow(result_fn):
+    def run(self, state):
+        time.sleep(DELAY)
+        return result_fn(state)
+
+    return run
+
+
+def _patch_agents(monkeypatch):
+    monkeypatch.setattr(
+        sup.DestinationParserAgent,
+        "run",
+        lambda self, s: {"trip_request": s.trip_request},
+    )
+    monkeypatch.setattr(
+        sup.FlightHotelScraperAgent,
+        "run",
+        _slow(lambda s: {"flight_options": [{"id": "F"}], "hotel_options": []}),
+    )
+    monkeypatch.setattr(
+        sup.ItineraryAgent, "run", _slow(lambda s: {"itinerary": ["Day 1: Colosseum"]})
+    )
+    monkeypatch.setattr(
+        sup.PackingListAgent, "run", _slow(lambda s: {"packing_list": ["Passport"]})
+    )
+    # Reminders must see the itinerary written by the parallel branch
+    monkeypatch.setattr(
+        sup.ReminderAgent,
+        "run",
+        lambda self, s: {"reminders": [{"message": m} for m in s.itinerary or []]},
+    )
+
+
+def test_branches_run_in_parallel_and_reminders_join_itinerary(monkeypatch):
+    _patch_agents(monkeypatch)
+    supervisor = sup.TravelBuddySupervisor()
+    state = {
+        "user_input": "",
+        "trip_request": {
+            "destination": "Rome",
+            "start_date": "2025-09-12",
+            "end_date": "2025-09-14",
+        },
+    }
+
+    t0 = time.monotonic()
+    out = supervisor.run(state)
+    elapsed = time.monotonic() - t0
+
+    # Sequential chain would take 3 x DELAY
+    assert elapsed < 2 * DELAY
+    assert out["flight_options"] == [{"id": "F"}]
+    assert out["packing_list"] == ["Passport"]
+    assert out["reminders"] == [{"message": "Day 1: Colosseum"}]
+
+
+def test_run_forwards_custom_stream_events(monkeypatch):
+    from src.agents import flight_hotel_scraper as fhs
+
+    _patch_agents(monkeypatch)
+
+    def scraper(self, state):
+        emit = fhs._stream_writer()
+        # written from a worker thread, like the agent's hotel branch does
+        fhs._EXECUTOR.submit(emit, {"event": "hotels", "top": [], "received": 1}).result()
+        return {"flight_options": [], "hotel_options": [{"hotel_id": "H1"}]}
+
+    monkeypatch.setattr(sup.FlightHotelScraperAgent, "run", scraper)
+    events = []
+    out = sup.TravelBuddySupervisor().run(
+        {"user_input": "", "trip_request": {"destination": "Rome"}},
+        on_event=events.append,
+    )
+
+    assert events == [{"event": "hotels", "top": [], "received": 1}]
+    assert out["hotel_options"] == [{"hotel_id": "H1"}]
+    assert out["reminders"] == [{"message": "Day 1: Colosseum"}]
+
+
+def test_fused_mode_runs_one_llm_node_for_both_artifacts(monkeypatch):
+    _patch_agents(monkeypatch)
+    calls = []
+
+    def plan(self, state):
+        calls.append(1)
+        return {"itinerary": ["Day 1: Forum"], "packing_list": ["Hat"]}
+
+    monkeypatch.setattr(sup.TripPlanAgent, "run", plan)
+    monkeypatch.setattr(sup.ItineraryAgent, "run", lambda self, s: 1 / 0)
+    monkeypatch.setattr(sup.PackingListAgent, "run", lambda self, s: 1 / 0)
+
+    supervisor = sup.TravelBuddySupervisor(llm_mode="fused")
+    out = supervisor.run({"user_input": "", "trip_request": {"destination": "Rome"}})
+
+    assert calls == [1]
+    assert out["packing_list"] == ["Hat"]
+    assert out["reminders"] == [{"message": "Day 1: Forum"}]
+
+
+def test_llm_mode_comes_from_env_and_is_validated(monkeypatch):
+    monkeypatch.setenv("LLM_MODE", "fused")
+    assert sup.TravelBuddySupervisor().llm_mode == "fused"
+
+    with pytest.raises(ValueError):
+        sup.TravelBuddySupervisor(llm_mode="both")
@@ -0,0 +1,90 @@
+"""
+tests/test_trip_extractor.py
+----------------------------
+OFFLINE tests for the rule-based trip request extractor.
+"""
+
+from datetime import date
+
+from src.integrations.trip_extractor import extract_trip, normalize_dates
+
+TODAY = date(2025, 8, 1)
+
+
+def test_typical_request_is_fully_extracted():
+    trip = extract_trip(
+        "I'd like to visit Tokyo from September 12th to September 17th. "
+        "My budget is around $2000 and I'm interested in anime and traditional food.",
+        today=TODAY,
+    )
+    assert trip.destination == "Tokyo" and trip.origin is None
+    assert (trip.start_date, trip.end_date) == ("2025-09-12", "2025-09-17")
+    assert (trip.budget, trip.currency) == (2000.0, "USD")
+    assert trip.preferences == ["anime", "traditional food"]
+    assert trip.confidence == 1.0
+
+
+def test_origin_ranges_and_currency_words():
+    trip = extract_trip(
+        "Flying from London to Rome Sep 12-16 2025, 1.5k EUR, love history, museums and wine",
+        today=TODAY,
+    )
+    assert (trip.origin, trip.destination) == ("London", "Rome")
+    assert (trip.start_date, trip.end_date) == ("2025-09-12", "2025-09-16")
+    assert (trip.budget, trip.currency) == (1500.0, "EUR")
+    assert trip.preferences == ["history", "museums", "wine"]
+
+
+def test_duration_keywords_and_year_rollover():
+    trip = extract_trip("trip to barcelona for 5 days starting 2025-10-03, beaches and nightlife")
+    assert trip.destination == "barcelona"
+    assert (trip.start_date, trip.end_date) == ("2025-10-03", "2025-10-07")
+    assert trip.preferences == ["beaches", "nightlife"]
+
+    trip = extract_trip("New year in Lisbon, Dec 28 to Jan 3, budget of 900", today=TODAY)
+    assert (trip.start_date, trip.end_date) == ("2025-12-28", "2026-01-03")
+    assert (trip.budget, trip.currency) == (900.0, None)
+
+
+def test_missing_or_ambiguous_fields_lower_confidence():
+    assert extract_trip("Paris or Rome in December?").confidence < 0.5
+    # no word after a cue is mistaken for a city ("in anime", "from September")
+    assert extract_trip("into anime, from September 12").destination is None
+    ambiguous = extract_trip("to Paris and then to Rome, 2025-10-01 to 2025-10-04")
+    assert ambiguous.destination == "Paris" and ambiguous.confidence < 0.9
+    assert extract_trip("").confidence == 0
+
+
+def test_normalize_dates():
+    assert normalize_dates("September 12th", "Sep 17", today=TODAY) == ("2025-09-12", "2025-09-17")
+    assert normalize_dates("2025-12-30", "Jan 2", today=TODAY) == ("2025-12-30", "2026-01-02")
+    assert normalize_dates("soon", "2025-09-17") == (None, "2025-09-17")
+
+
+def test_amounts_after_a_date_are_not_years():
+    trip = extract_trip("Trip to Rome, Sep 3-9, 1500 euros", today=TODAY)
+    assert (trip.start_date, trip.end_date) == ("2025-09-03", "2025-09-09")
+    assert (trip.budget, trip.currency) == (1500.0, "EUR")
+
+    trip = extract_trip("Going to Rome on May 3, 2000 USD budget, back May 10", today=TODAY)
+    assert (trip.start_date, trip.end_date) == ("2026-05-03", "2026-05-10")
+    assert (trip.budget, trip.currency) == (2000.0, "USD")
+
+
+def test_implausible_dates_fall_below_the_threshold():
+    for text in (
+        "to Rome 2020-01-01 to 2020-01-05",  # in the past
+        "to Rome 2025-09-01 to 2025-12-01",  # 3 months
+        "to Rome 2025-09-09 to 2025-09-03",  # ends before it starts
+    ):
+        assert extract_trip(text, today=TODAY).confidence < 0.9, text
+
+
+def test_past_leap_day_does_not_crash_the_year_rollover():
+    after_leap_day = date(2028, 3, 10)  # next Feb 29 is in 2032
+
+    trip = extract_trip("Visit Rome from Feb 29 to March 5", today=after_leap_day)
+    assert trip.start_date != "2029-02-29" and trip.confidence < 0.9
+    assert normalize_dates("Feb 29", "Mar 5", today=after_leap_day) == (None, "2029-03-05")
+    # an end on Feb 29 before the start can't roll over either
+    assert normalize_dates("2028-03-05", "Feb 29", today=date(2028, 1, 1)) == ("2028-03-05", None)
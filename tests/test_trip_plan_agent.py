@@ -0,0 +1,109 @@
+"""
+tests/test_trip_plan_agent.py
+-----------------------------
+OFFLINE tests for the fused itinerary + packing list agent, with a fake LLM.
+"""
+
+import json
+import time
+from types import SimpleNamespace
+
+from src.agents.trip_plan_agent import TripPlanAgent, _parse_plan
+from src.integrations.groq_client import GroqError
+
+PLAN = {"itinerary": ["Day 1: Colosseum", "Day 2: Vatican"], "packing_list": ["Passport", " Hat "]}
+
+
+class FakeLLM:
+    """Replies per prompt kind, since the fallback calls run concurrently."""
+
+    model = "fake-model"
+
+    def __init__(self, fused, itinerary=None, packing=None, delay=0.0):
+        self.replies = {"fused": fused, "itinerary": itinerary, "packing": packing}
+        self.delay = delay
+        self.calls = []
+
+    def complete(self, prompt, **kw):
+        if "JSON schema" in prompt:
+            kind = "fused"
+        elif "day-by-day" in prompt:
+            kind = "itinerary"
+        else:
+            kind = "packing"
+        self.calls.append((kind, kw))
+        time.sleep(self.delay)
+        reply = self.replies[kind]
+        if isinstance(reply, Exception):
+            raise reply
+        return reply
+
+
+def _state():
+    return SimpleNamespace(
+        trip_request={
+            "destination": "Rome",
+            "start_date": "2025-09-12",
+            "end_date": "2025-09-13",
+            "preferences": ["history"],
+        }
+    )
+
+
+def test_one_structured_call_returns_both_artifacts():
+    llm = FakeLLM(json.dumps(PLAN))
+    out = TripPlanAgent(llm=llm).run(_state())
+
+    assert out == {"itinerary": PLAN["itinerary"], "packing_list": ["Passport", "Hat"]}
+    assert len(llm.calls) == 1
+    assert llm.calls[0][1]["response_format"] == {"type": "json_object"}
+
+
+def test_plan_is_cached_by_trip_signature():
+    llm = FakeLLM(json.dumps(PLAN))
+    agent = TripPlanAgent(llm=llm)
+    agent.run(_state())
+    assert agent.run(_state())["packing_list"] == ["Passport", "Hat"]
+    assert len(llm.calls) == 1
+
+
+def test_unparseable_reply_falls_back_to_two_calls():
+    llm = FakeLLM(
+        '{"itinerary": "Day 1 only"}',  # fused reply off-schema
+        itinerary='["Day 1: Colosseum"]',
+        packing='["Passport"]',
+    )
+    agent = TripPlanAgent(llm=llm)
+    out = agent.run(_state())
+
+    assert out == {"itinerary": ["Day 1: Colosseum"], "packing_list": ["Passport"]}
+    assert sorted(kind for kind, _kw in llm.calls) == ["fused", "itinerary", "packing"]
+    assert agent.fallbacks == 1
+    assert all("response_format" not in kw for kind, kw in llm.calls if kind != "fused")
+
+
+def test_fallback_calls_run_in_parallel():
+    llm = FakeLLM("not json", itinerary='["Day 1"]', packing='["Hat"]', delay=0.3)
+    t0 = time.monotonic()
+    out = TripPlanAgent(llm=llm, use_cache=False).run(_state())
+    elapsed = time.monotonic() - t0
+
+    assert out == {"itinerary": ["Day 1"], "packing_list": ["Hat"]}
+    assert elapsed < 0.85  # fused + ONE round trip, not fused + two (0.9s)
+
+
+def test_rejected_call_falls_back_too():
+    llm = FakeLLM(
+        GroqError("400 response_format unsupported"), itinerary='["Day 1"]', packing='["Hat"]'
+    )
+    out = TripPlanAgent(llm=llm).run(_state())
+    assert out == {"itinerary": ["Day 1"], "packing_list": ["Hat"]}
+
+
+def test_parse_plan_schema_checks():
+    assert _parse_plan(json.dumps(PLAN))["packing_list"] == ["Passport", "Hat"]
+    assert _parse_plan("not json") is None
+    assert _parse_plan("[]") is None
+    assert _parse_plan(json.dumps({"itinerary": ["a"], "packing_list": []})) is None
+    assert _parse_plan(json.dumps({"itinerary": ["a"], "packing_list": [1]})) is None
+    assert _parse_plan(json.dumps({"itinerary": ["  "], "packing_list": ["a"]})) is None